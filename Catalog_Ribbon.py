@@ -0,0 +1,394 @@
+# *************************************************************************
+# *                                                                       *
+# * Copyright (c) 2019-2024 Hakan Seven, Geolta, Paul Ebbers              *
+# *                                                                       *
+# * This program is free software; you can redistribute it and/or modify  *
+# * it under the terms of the GNU Lesser General Public License (LGPL)    *
+# * as published by the Free Software Foundation; either version 3 of     *
+# * the License, or (at your option) any later version.                   *
+# * for detail see the LICENCE text file.                                 *
+# *                                                                       *
+# * This program is distributed in the hope that it will be useful,       *
+# * but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# * GNU Library General Public License for more details.                  *
+# *                                                                       *
+# * You should have received a copy of the GNU Library General Public     *
+# * License along with this program; if not, write to the Free Software   *
+# * Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# * USA                                                                   *
+# *                                                                       *
+# *************************************************************************
+
+# Catalog with the commands, workbenches, toolbars and icons from the data files.
+# The catalog is loaded once per session and shared by the ribbon, the layout dialog and the scripts.
+#
+# Layout of the items (same as in the data files):
+#   command   : [CommandName, IconName, MenuText, WorkBenchName, MenuTextTranslated]
+#   workbench : [WorkBenchName, IconName, MenuText, ToolbarItems, MenuTextTranslated]
+#   toolbar   : [Toolbar, WorkBenchTitle, WorkBenchName, ToolbarTranslated]
+#
+# This module does not import FreeCAD or Qt at module level, so the scripts can use it as well.
+
+import os
+import json
+from collections import OrderedDict
+
+import IconStore_Ribbon
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), "RibbonDataFile.dat")
+DATA_FILE_2 = os.path.join(os.path.dirname(__file__), "RibbonDataFile2.dat")
+
+# The maximum number of decoded icons that are kept in memory
+ICON_CACHE_SIZE = 256
+
+# The catalog that is shared within this FreeCAD session
+_SharedCatalog = None
+
+
+def ReturnTimeStamp(FileName: str):
+    if os.path.exists(FileName) is True:
+        return os.path.getmtime(FileName)
+    return None
+
+
+class IconCache:
+    """A small LRU cache for decoded icons"""
+
+    def __init__(self, MaxSize: int = ICON_CACHE_SIZE):
+        self.MaxSize = MaxSize
+        self.Items = OrderedDict()
+        return
+
+    def get(self, Key):
+        Item = self.Items.get(Key)
+        if Item is not None:
+            self.Items.move_to_end(Key)
+        return Item
+
+    def add(self, Key, Item):
+        self.Items[Key] = Item
+        self.Items.move_to_end(Key)
+        while len(self.Items) > self.MaxSize:
+            self.Items.popitem(last=False)
+        return
+
+    def clear(self):
+        self.Items.clear()
+        return
+
+    def __len__(self):
+        return len(self.Items)
+
+
+class CommandCatalog:
+    """Commands, workbenches, toolbars and icons from the data files with dict-indexed lookups."""
+
+    def __init__(self, DataFile: str = DATA_FILE, DataFile2: str = DATA_FILE_2):
+        self.DataFile = DataFile
+        self.DataFile2 = DataFile2
+
+        # The data as read from the data files (without icons)
+        self.Data = {}
+        self.IsFullyLoaded = False
+        self.TimeStamps = {}
+
+        self.List_Commands = []
+        self.List_Workbenches = []
+        self.StringList_Toolbars = []
+
+        # The indexes
+        self.Commands = {}  # CommandName -> list of command items (one per workbench)
+        self.CommandsPerWorkbench = {}  # WorkBenchName -> list of command items
+        # menu text (translated and untranslated) -> list of command items
+        self.MenuTexts = {}
+        self.Workbenches = {}  # WorkBenchName -> workbench item
+        self.WorkbenchTitles = {}  # workbench title -> WorkBenchName
+        self.ToolbarsPerWorkbench = {}  # WorkBenchName -> list of toolbar items
+
+        # Icons that were added by the reload of the data, these are already deserialized
+        self.CommandIcons = {}
+        self.WorkbenchIcons = {}
+        # Icons decoded from the icon store. Only the most recently used ones are kept
+        self.DecodedIcons = IconCache(ICON_CACHE_SIZE)
+        # Serialized icons from data files created before the icon store existed
+        self.SerializedCommandIcons = {}
+        self.SerializedWorkbenchIcons = {}
+
+        # Only the small data file is read on creation. The full data file is read when needed.
+        self.LoadCommands()
+        return
+
+    # region - Loading
+    def LoadCommands(self):
+        """Read the list of commands from the second (small) data file"""
+        if os.path.exists(self.DataFile2) is True:
+            Data = {}
+            with open(self.DataFile2, "r") as file:
+                Data.update(json.load(file))
+            file.close()
+            self.TimeStamps[self.DataFile2] = ReturnTimeStamp(self.DataFile2)
+
+            self.Data.update(Data)
+            self.SetCommands(Data.get("List_Commands", []))
+        return
+
+    def LoadAll(self):
+        """Read the full data file with the workbenches, toolbars and commands"""
+        if os.path.exists(self.DataFile) is True:
+            Data = {}
+            with open(self.DataFile, "r") as file:
+                Data.update(json.load(file))
+            file.close()
+            self.TimeStamps[self.DataFile] = ReturnTimeStamp(self.DataFile)
+
+            # Data files created by older versions contain the icons
+            for IconItem in Data.pop("WorkBench_Icons", []):
+                self.SerializedWorkbenchIcons[IconItem[0]] = IconItem[1]
+            for IconItem in Data.pop("Command_Icons", []):
+                self.SerializedCommandIcons[IconItem[0]] = IconItem[1]
+
+            self.Data.update(Data)
+            self.SetWorkbenches(Data.get("List_Workbenches", []))
+            self.SetToolbars(Data.get("StringList_Toolbars", []))
+            self.SetCommands(Data.get("List_Commands", []))
+        self.IsFullyLoaded = True
+        return
+
+    def IsOutdated(self):
+        """Returns True if one of the data files has changed since it was read"""
+        for FileName, TimeStamp in self.TimeStamps.items():
+            if ReturnTimeStamp(FileName) != TimeStamp:
+                return True
+        if self.TimeStamps.get(self.DataFile2) is None and os.path.exists(
+            self.DataFile2
+        ):
+            return True
+        return False
+
+    # endregion
+
+    # region - Indexes
+    def SetCommands(self, List_Commands: list):
+        self.List_Commands = List_Commands
+        self.Commands.clear()
+        self.CommandsPerWorkbench.clear()
+        self.MenuTexts.clear()
+        for CommandItem in List_Commands:
+            self.IndexCommand(CommandItem)
+        return
+
+    def IndexCommand(self, CommandItem: list):
+        self.Commands.setdefault(CommandItem[0], []).append(CommandItem)
+        if len(CommandItem) > 3:
+            self.CommandsPerWorkbench.setdefault(CommandItem[3], []).append(CommandItem)
+        MenuTexts = [CommandItem[2]]
+        if len(CommandItem) > 4 and CommandItem[4] != CommandItem[2]:
+            MenuTexts.append(CommandItem[4])
+        for MenuText in MenuTexts:
+            self.MenuTexts.setdefault(MenuText, []).append(CommandItem)
+        return
+
+    def AddCommand(self, CommandItem: list):
+        """Add a command (e.g. a dropdown button) to the catalog"""
+        self.List_Commands.append(CommandItem)
+        self.IndexCommand(CommandItem)
+        return
+
+    def SetWorkbenches(self, List_Workbenches: list):
+        self.List_Workbenches = List_Workbenches
+        self.Workbenches.clear()
+        self.WorkbenchTitles.clear()
+        for WorkBenchItem in List_Workbenches:
+            self.Workbenches[WorkBenchItem[0]] = WorkBenchItem
+            self.WorkbenchTitles[WorkBenchItem[2]] = WorkBenchItem[0]
+        return
+
+    def SetToolbars(self, StringList_Toolbars: list):
+        self.StringList_Toolbars = StringList_Toolbars
+        self.ToolbarsPerWorkbench.clear()
+        for ToolbarItem in StringList_Toolbars:
+            # Custom toolbars have a list of commands instead of the workbench name
+            if isinstance(ToolbarItem[2], str):
+                self.ToolbarsPerWorkbench.setdefault(ToolbarItem[2], []).append(
+                    ToolbarItem
+                )
+        return
+
+    # endregion
+
+    # region - Lookups
+    def ReturnCommand(self, CommandName: str, WorkBenchName: str = ""):
+        """Returns the command item for a command name or None.
+        If a workbench name is given, the item of that workbench is preferred."""
+        CommandItems = self.Commands.get(CommandName)
+        if CommandItems is None:
+            return None
+        if WorkBenchName != "":
+            for CommandItem in CommandItems:
+                if CommandItem[3] == WorkBenchName:
+                    return CommandItem
+        return CommandItems[0]
+
+    def ReturnCommandsByMenuText(self, MenuText: str) -> list:
+        """Returns all command items with this menu text (translated or untranslated)"""
+        return self.MenuTexts.get(MenuText, [])
+
+    def ReturnCommandsByWorkbench(self, WorkBenchName: str) -> list:
+        return self.CommandsPerWorkbench.get(WorkBenchName, [])
+
+    def ReturnWorkbench(self, WorkBenchName: str):
+        return self.Workbenches.get(WorkBenchName)
+
+    def ReturnWorkbenchName(self, WorkBenchTitle: str) -> str:
+        return self.WorkbenchTitles.get(WorkBenchTitle, "")
+
+    def ReturnToolbarsByWorkbench(self, WorkBenchName: str) -> list:
+        return self.ToolbarsPerWorkbench.get(WorkBenchName, [])
+
+    def ReturnCommandIcon(self, CommandName: str, Lazy: bool = False):
+        """Returns the stored icon of a command or None.
+
+        Args:
+            CommandName (str): Name of the command
+            Lazy (bool, optional): Return an icon that is decoded when it is painted. Defaults to False.
+        """
+        return self.ReturnIcon(
+            CommandName,
+            IconStore_Ribbon.SECTION_COMMANDS,
+            self.CommandIcons,
+            self.SerializedCommandIcons,
+            Lazy,
+        )
+
+    def ReturnWorkbenchIcon(self, WorkBenchName: str, Lazy: bool = False):
+        """Returns the stored icon of a workbench or None.
+
+        Args:
+            WorkBenchName (str): Name of the workbench
+            Lazy (bool, optional): Return an icon that is decoded when it is painted. Defaults to False.
+        """
+        return self.ReturnIcon(
+            WorkBenchName,
+            IconStore_Ribbon.SECTION_WORKBENCHES,
+            self.WorkbenchIcons,
+            self.SerializedWorkbenchIcons,
+            Lazy,
+        )
+
+    def AddCommandIcon(self, CommandName: str, Icon):
+        self.CommandIcons[CommandName] = Icon
+        return
+
+    def AddWorkbenchIcon(self, WorkBenchName: str, Icon):
+        self.WorkbenchIcons[WorkBenchName] = Icon
+        return
+
+    def ReturnIcon(
+        self,
+        Name: str,
+        Section: str,
+        Icons: dict,
+        SerializedIcons: dict,
+        Lazy: bool = False,
+    ):
+        # Icons that were added are already deserialized
+        Icon = Icons.get(Name)
+        if Icon is not None:
+            return Icon
+
+        if self.HasStoredIcon(Name, Section, SerializedIcons) is False:
+            return None
+
+        # A placeholder icon, which is decoded when it is painted. Decoding goes through the LRU cache.
+        if Lazy is True:
+            import Serialize_Ribbon
+
+            return Serialize_Ribbon.ReturnLazyIcon(
+                lambda: self.DecodeIcon(Name, Section, SerializedIcons)
+            )
+        return self.DecodeIcon(Name, Section, SerializedIcons)
+
+    def HasStoredIcon(self, Name: str, Section: str, SerializedIcons: dict) -> bool:
+        IconStore = IconStore_Ribbon.ReturnIconStore()
+        if IconStore is not None and IconStore.contains(Name, Section):
+            return True
+        return Name in SerializedIcons
+
+    def DecodeIcon(self, Name: str, Section: str, SerializedIcons: dict):
+        """Returns the decoded icon. Decoded icons are kept in a small LRU cache."""
+        Icon = self.DecodedIcons.get((Section, Name))
+        if Icon is not None:
+            return Icon
+
+        IconStore = IconStore_Ribbon.ReturnIconStore()
+        if IconStore is not None and IconStore.contains(Name, Section):
+            Icon = IconStore.ReturnIcon(Name, Section)
+        elif Name in SerializedIcons:
+            import Serialize_Ribbon
+
+            Icon = Serialize_Ribbon.deserializeIcon(SerializedIcons[Name])
+
+        if Icon is not None:
+            self.DecodedIcons.add((Section, Name), Icon)
+        return Icon
+
+    def ReturnSerializedIcon(self, Name: str, Section: str, Pixmaps: dict = None):
+        """Returns the serialized icon as stored, without decoding it. Used to copy icons to a new icon store.
+
+        Args:
+            Name (str): Name of the command or workbench
+            Section (str): IconStore_Ribbon.SECTION_COMMANDS or IconStore_Ribbon.SECTION_WORKBENCHES
+            Pixmaps (dict, optional): The shared pixmaps of the compact format, used by the icon are added to this dict.
+
+        Returns:
+            dict: The serialized icon or None
+        """
+        IconStore = IconStore_Ribbon.ReturnIconStore()
+        if IconStore is not None and IconStore.contains(Name, Section):
+            SerializedIcon = IconStore.ReturnSerializedIcon(Name, Section)
+            if "compact" in SerializedIcon and "pixmaps" not in SerializedIcon:
+                if Pixmaps is None:
+                    return None
+                for wPixmaps in SerializedIcon["compact"].values():
+                    for hPixmaps in wPixmaps.values():
+                        for modePixmaps in hPixmaps.values():
+                            for Hash in modePixmaps.values():
+                                Data = IconStore.Pixmaps.get(Hash)
+                                if Data is None:
+                                    return None
+                                Pixmaps[Hash] = Data
+            return SerializedIcon
+
+        if Section == IconStore_Ribbon.SECTION_WORKBENCHES:
+            return self.SerializedWorkbenchIcons.get(Name)
+        return self.SerializedCommandIcons.get(Name)
+
+    # endregion
+
+
+def ReturnCatalog(LoadAll: bool = False) -> CommandCatalog:
+    """Returns the catalog shared within this session.
+    The catalog is read again when a data file has changed on disk.
+
+    Args:
+        LoadAll (bool, optional): Read also the full data file. Defaults to False.
+
+    Returns:
+        CommandCatalog: the shared catalog
+    """
+    global _SharedCatalog
+
+    if _SharedCatalog is None or _SharedCatalog.IsOutdated() is True:
+        _SharedCatalog = CommandCatalog()
+    if LoadAll is True and _SharedCatalog.IsFullyLoaded is False:
+        _SharedCatalog.LoadAll()
+    return _SharedCatalog
+
+
+def ResetCatalog():
+    """Drop the shared catalog. The next call to ReturnCatalog will read the data files again."""
+    global _SharedCatalog
+
+    _SharedCatalog = None
+    return
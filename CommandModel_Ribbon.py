@@ -0,0 +1,277 @@
+# *************************************************************************
+# *                                                                       *
+# * Copyright (c) 2019-2024 Hakan Seven, Geolta, Paul Ebbers              *
+# *                                                                       *
+# * This program is free software; you can redistribute it and/or modify  *
+# * it under the terms of the GNU Lesser General Public License (LGPL)    *
+# * as published by the Free Software Foundation; either version 3 of     *
+# * the License, or (at your option) any later version.                   *
+# * for detail see the LICENCE text file.                                 *
+# *                                                                       *
+# * This program is distributed in the hope that it will be useful,       *
+# * but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# * GNU Library General Public License for more details.                  *
+# *                                                                       *
+# * You should have received a copy of the GNU Library General Public     *
+# * License along with this program; if not, write to the Free Software   *
+# * Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# * USA                                                                   *
+# *                                                                       *
+# *************************************************************************
+
+# Model with the commands for the command lists of the layout dialog.
+# The commands are stored once in a CommandListModel. Every tab shows them through its own CommandFilterModel,
+# which filters on the category, the text in the searchbar and the commands that are already selected.
+# The search uses the index of CommandSearch_Ribbon and starts shortly after the last keystroke.
+# While searching, the best matches are shown first.
+#
+# Layout of the rows:
+#   row : [CommandName, Text, WorkBenchName, Icon]
+
+from PySide.QtCore import (
+    Qt,
+    QAbstractListModel,
+    QModelIndex,
+    QSortFilterProxyModel,
+    QTimer,
+)
+
+import CommandSearch_Ribbon
+
+# Index of the columns in a row
+ROW_COMMAND = 0
+ROW_TEXT = 1
+ROW_WORKBENCH = 2
+ROW_ICON = 3
+
+# Keyword for the category with all commands
+CATEGORY_ALL = "All"
+
+# Time in milliseconds between the last keystroke in the searchbar and the search
+SEARCH_DELAY = 150
+
+
+def CreateRow(CommandName: str, Text: str, WorkBenchName: str, Icon=None) -> list:
+    return [CommandName, Text, WorkBenchName, Icon]
+
+
+class CommandListModel(QAbstractListModel):
+    """The commands of the layout dialog, shared by the command lists of all tabs"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.Rows = []
+        self.RowIndex = {}  # CommandName -> row number
+        self.SearchIndex = CommandSearch_Ribbon.SearchIndex()
+        return
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.Rows)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if index.isValid() is False:
+            return None
+        Row = self.Rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return Row[ROW_TEXT]
+        if role == Qt.ItemDataRole.DecorationRole:
+            return Row[ROW_ICON]
+        # Use the tooltip to show the actual command.
+        if role == Qt.ItemDataRole.ToolTipRole or role == Qt.ItemDataRole.UserRole:
+            return Row[ROW_COMMAND]
+        return None
+
+    def setRows(self, Rows: list):
+        """Replace all rows at once
+
+        Args:
+            Rows (list): rows created with CreateRow
+        """
+        self.beginResetModel()
+        self.Rows = Rows
+        self.RowIndex = {}
+        for i in range(len(Rows)):
+            self.RowIndex[Rows[i][ROW_COMMAND]] = i
+        self.SearchIndex.setItems([self.ReturnSearchItem(Row) for Row in Rows])
+        self.endResetModel()
+        return
+
+    def addRow(self, Row: list):
+        """Add a row, e.g. for a new dropdown button. If the command is already in the model, its row is replaced."""
+        if Row[ROW_COMMAND] in self.RowIndex:
+            i = self.RowIndex[Row[ROW_COMMAND]]
+            self.Rows[i] = Row
+            self.SearchIndex.replaceItem(i, self.ReturnSearchItem(Row))
+            self.dataChanged.emit(self.index(i), self.index(i))
+            return
+
+        i = len(self.Rows)
+        self.beginInsertRows(QModelIndex(), i, i)
+        self.Rows.append(Row)
+        self.RowIndex[Row[ROW_COMMAND]] = i
+        self.SearchIndex.addItem(self.ReturnSearchItem(Row))
+        self.endInsertRows()
+        return
+
+    def clear(self):
+        self.setRows([])
+        return
+
+    def ReturnSearchItem(self, Row: list) -> list:
+        return [Row[ROW_COMMAND], Row[ROW_TEXT], Row[ROW_WORKBENCH]]
+
+    def ReturnScores(self, SearchText: str) -> dict:
+        """Returns the score per row number of the commands that match the search text"""
+        return self.SearchIndex.ReturnScores(SearchText)
+
+    def ReturnRow(self, CommandName: str):
+        """Returns the row of a command or None"""
+        i = self.RowIndex.get(CommandName)
+        if i is None:
+            return None
+        return self.Rows[i]
+
+
+class CommandFilterModel(QSortFilterProxyModel):
+    """The commands for the command list of one tab.
+
+    Shows the commands of one category, which match the text in the searchbar. The best matches are shown first.
+    Commands that are in the list with selected commands are hidden.
+    """
+
+    def __init__(self, Model: CommandListModel, parent=None):
+        super().__init__(parent)
+        self.Category = CATEGORY_ALL
+        self.SearchText = ""
+        self.PendingSearchText = ""
+        self.Scores = {}  # row -> score of the rows that match the search text
+        self.ExcludedCommands = set()
+        self.ExcludedListWidget = None
+
+        # Update the excluded commands once, after all changes of the list with selected commands are made
+        self.ExcludedTimer = QTimer(self)
+        self.ExcludedTimer.setSingleShot(True)
+        self.ExcludedTimer.setInterval(0)
+        self.ExcludedTimer.timeout.connect(self.UpdateExcludedCommands)
+
+        # Search after the typing has paused
+        self.SearchTimer = QTimer(self)
+        self.SearchTimer.setSingleShot(True)
+        self.SearchTimer.setInterval(SEARCH_DELAY)
+        self.SearchTimer.timeout.connect(self.ApplySearchText)
+
+        self.setSourceModel(Model)
+
+        # The matches are row numbers. Search again when the rows have changed.
+        # These are connected after the source model is set, so the filter has processed the change already.
+        Model.modelReset.connect(self.RefreshMatches)
+        Model.rowsInserted.connect(lambda *args: self.RefreshMatches())
+        Model.dataChanged.connect(lambda *args: self.RefreshMatches())
+
+        self.setSortCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.setDynamicSortFilter(True)
+        self.sort(0, Qt.SortOrder.AscendingOrder)
+        return
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        Row = self.sourceModel().Rows[source_row]
+        if self.Category != CATEGORY_ALL and Row[ROW_WORKBENCH] != self.Category:
+            return False
+        if self.SearchText != "" and source_row not in self.Scores:
+            return False
+        if Row[ROW_COMMAND] in self.ExcludedCommands:
+            return False
+        return True
+
+    def lessThan(self, source_left, source_right):
+        # Sort the matches on their score, the best matches first
+        if self.SearchText != "":
+            LeftScore = self.Scores.get(source_left.row(), 0)
+            RightScore = self.Scores.get(source_right.row(), 0)
+            if LeftScore != RightScore:
+                return LeftScore > RightScore
+        return super().lessThan(source_left, source_right)
+
+    def setCategory(self, Category: str):
+        """Show only the commands of a workbench
+
+        Args:
+            Category (str): The workbench name or "All"
+        """
+        if Category != self.Category:
+            self.Category = Category
+            self.invalidateFilter()
+        return
+
+    def setSearchText(self, SearchText: str, Delay: bool = True):
+        """Show only the commands that match the search text.
+
+        Args:
+            SearchText (str): The text in the searchbar
+            Delay (bool, optional): Search after SEARCH_DELAY, restarted on every call. Defaults to True.
+        """
+        self.PendingSearchText = SearchText.lower()
+        if Delay is True:
+            self.SearchTimer.start()
+        else:
+            self.SearchTimer.stop()
+            self.ApplySearchText()
+        return
+
+    def ApplySearchText(self):
+        if self.PendingSearchText != self.SearchText:
+            self.SearchText = self.PendingSearchText
+            self.UpdateMatches()
+            # Filter and sort again
+            self.invalidate()
+        return
+
+    def RefreshMatches(self):
+        """Search again after the rows have changed"""
+        if self.SearchText != "":
+            self.UpdateMatches()
+            self.invalidate()
+        return
+
+    def UpdateMatches(self):
+        self.Scores = {}
+        if self.SearchText != "":
+            self.Scores = self.sourceModel().ReturnScores(self.SearchText)
+        return
+
+    def setExcludedListWidget(self, ListWidget):
+        """Hide the commands that are in this list widget. The list widget is followed when its items change.
+
+        Args:
+            ListWidget (QListWidget): The list with selected commands
+        """
+        self.ExcludedListWidget = ListWidget
+        Model = ListWidget.model()
+        Model.rowsInserted.connect(lambda *args: self.ExcludedTimer.start())
+        Model.rowsRemoved.connect(lambda *args: self.ExcludedTimer.start())
+        Model.modelReset.connect(lambda *args: self.ExcludedTimer.start())
+        self.UpdateExcludedCommands()
+        return
+
+    def UpdateExcludedCommands(self):
+        ExcludedCommands = set()
+        if self.ExcludedListWidget is not None:
+            for i in range(self.ExcludedListWidget.count()):
+                ExcludedCommands.add(
+                    self.ExcludedListWidget.item(i).data(Qt.ItemDataRole.UserRole)
+                )
+        if ExcludedCommands != self.ExcludedCommands:
+            self.ExcludedCommands = ExcludedCommands
+            self.invalidateFilter()
+        return
+
+    def ReturnSelectedRows(self, View) -> list:
+        """Returns the rows of the selected commands in a view on this model"""
+        Rows = []
+        for index in View.selectionModel().selectedIndexes():
+            SourceIndex = self.mapToSource(index)
+            Rows.append(self.sourceModel().Rows[SourceIndex.row()])
+        return Rows
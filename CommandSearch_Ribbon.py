@@ -0,0 +1,363 @@
+# *************************************************************************
+# *                                                                       *
+# * Copyright (c) 2019-2024 Hakan Seven, Geolta, Paul Ebbers              *
+# *                                                                       *
+# * This program is free software; you can redistribute it and/or modify  *
+# * it under the terms of the GNU Lesser General Public License (LGPL)    *
+# * as published by the Free Software Foundation; either version 3 of     *
+# * the License, or (at your option) any later version.                   *
+# * for detail see the LICENCE text file.                                 *
+# *                                                                       *
+# * This program is distributed in the hope that it will be useful,       *
+# * but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# * GNU Library General Public License for more details.                  *
+# *                                                                       *
+# * You should have received a copy of the GNU Library General Public     *
+# * License along with this program; if not, write to the Free Software   *
+# * Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# * USA                                                                   *
+# *                                                                       *
+# *************************************************************************
+
+# Search index for the command lists of the layout dialog.
+#
+# The search text is split into words. A row matches when every word matches:
+#   - words of up to SHORT_WORD characters must be part of the row (substring)
+#   - longer words may have typos. They match when at least half of their trigrams are in the row.
+# The menu text and the command name of a row count fully. The extra texts (workbench title, tooltip) count half.
+# Matches are ranked on the score of their words, a bonus for words at the start of a word in the row
+# and on how often and how recently the command was used.
+#
+# This module does not import FreeCAD or Qt, so the scripts can use it as well.
+
+import re
+import math
+import time
+from collections import Counter
+
+_NoRows = frozenset()
+
+# Words up to this length are matched as a substring, longer words are matched fuzzy
+SHORT_WORD = 3
+# The part of the trigrams of a word that must be in a row
+MIN_SIMILARITY = 0.5
+# Bonus for a word that is at the start of a word in the row
+WORD_START_BONUS = 0.25
+# Maximum bonus for the use of a command. Half for the frequency, half for the recency.
+USAGE_BONUS = 0.25
+# Uses after which the frequency bonus is maximal
+USAGE_COUNT_MAX = 20
+# Days after which the recency bonus is halved
+USAGE_HALF_LIFE = 14
+# Time in ms per step when the index is built in the background. See ContinueIndex
+INDEX_STEP_BUDGET = 20
+
+_SplitWords = re.compile(r"[\W_]+")
+
+
+def ReturnWords(Text: str) -> list:
+    """Returns the lowercase words in a text. Everything that is not a letter or digit separates words."""
+    return _SplitWords.sub(" ", Text.lower()).split()
+
+
+def ReturnKey(Texts: list) -> str:
+    """Returns the search key for a list of texts: its words separated by spaces, with a space before and after"""
+    Words = []
+    for Text in Texts:
+        Words.extend(ReturnWords(Text))
+    return f" {' '.join(Words)} "
+
+
+def ReturnTrigrams(Word: str) -> list:
+    """Returns the trigrams of a word. The first one starts with a space, to match the start of a word."""
+    Word = f" {Word}"
+    return [Word[i : i + 3] for i in range(len(Word) - 2)]
+
+
+def ReturnUsageScore(Count: int, LastUsed: float, Now: float) -> float:
+    """Returns the bonus for a command that was used Count times, the last time at LastUsed (seconds since epoch)"""
+    if Count <= 0:
+        return 0
+    Frequency = min(1, math.log1p(Count) / math.log1p(USAGE_COUNT_MAX))
+    Days = max(0, Now - LastUsed) / 86400
+    Recency = 0.5 ** (Days / USAGE_HALF_LIFE)
+    return USAGE_BONUS * (Frequency + Recency) / 2
+
+
+class SearchIndex:
+    """Ranked fuzzy search over the rows of the command lists.
+
+    The index can be built in small steps with ContinueIndex, when the dialog is idle.
+    Rows that are not indexed yet are indexed on the first search.
+    """
+
+    def __init__(self):
+        self.Items = []  # row -> [CommandName, Text, WorkBenchName]
+        # function(CommandName, WorkBenchName) -> list of extra texts, like the workbench title and the tooltip
+        self.ExtraTextSource = None
+        self.Usage = {}  # CommandName -> [Count, LastUsed]
+
+        self.Keys = []  # row -> search key of the menu text and the command name
+        self.ExtraKeys = []  # row -> search key of the extra texts
+        # trigram -> set of rows with the trigram in the key
+        self.Trigrams = {}
+        # trigram -> set of rows with the trigram only in the extra key
+        self.ExtraTrigrams = {}
+        # word -> trigrams of the word. Most words are used by many rows.
+        self.WordTrigrams = {}
+        # The rows before this row are indexed
+        self.IndexedRows = 0
+        self.IsBuilt = False
+
+        self.LastSearch = ""
+        self.LastScores = None
+        return
+
+    def setItems(self, Items: list):
+        """Replace all rows
+
+        Args:
+            Items (list): per row [CommandName, Text, WorkBenchName]
+        """
+        self.Items = [list(Item) for Item in Items]
+        self.ClearIndex()
+        self.ClearLastSearch()
+        return
+
+    def addItem(self, Item: list):
+        self.Items.append(list(Item))
+        if self.IsBuilt is True:
+            self.ContinueIndex()
+        self.ClearLastSearch()
+        return
+
+    def replaceItem(self, Row: int, Item: list):
+        self.Items[Row] = list(Item)
+        # The old trigrams of the row are not known anymore. Build the index again.
+        self.ClearIndex()
+        self.ClearLastSearch()
+        return
+
+    def setUsage(self, Usage: dict):
+        """Set how often and when the commands were used
+
+        Args:
+            Usage (dict): CommandName -> [Count, LastUsed (seconds since epoch)]
+        """
+        self.Usage = Usage
+        self.ClearLastSearch()
+        return
+
+    def addUsage(self, CommandName: str, Count: int = 1, LastUsed: float = None):
+        if LastUsed is None:
+            LastUsed = time.time()
+        Usage = self.Usage.get(CommandName, [0, 0])
+        self.Usage[CommandName] = [Usage[0] + Count, LastUsed]
+        self.ClearLastSearch()
+        return
+
+    def ClearLastSearch(self):
+        self.LastSearch = ""
+        self.LastScores = None
+        return
+
+    # region - Index
+    def BuildIndex(self):
+        self.ClearIndex()
+        self.ContinueIndex()
+        return
+
+    def ClearIndex(self):
+        self.Keys = []
+        self.ExtraKeys = []
+        self.Trigrams = {}
+        self.ExtraTrigrams = {}
+        self.WordTrigrams = {}
+        self.IndexedRows = 0
+        self.IsBuilt = False
+        return
+
+    def ContinueIndex(self, Deadline: float = None) -> bool:
+        """Index the rows that are not indexed yet
+
+        Args:
+            Deadline (float, optional): Stop when time.perf_counter() passes this time. Defaults to None (all rows).
+
+        Returns:
+            bool: True when all rows are indexed
+        """
+        while self.IndexedRows < len(self.Items):
+            self.IndexItem(self.IndexedRows)
+            self.IndexedRows += 1
+            if Deadline is not None and time.perf_counter() >= Deadline:
+                break
+        self.IsBuilt = self.IndexedRows >= len(self.Items)
+        return self.IsBuilt
+
+    def IndexItem(self, Row: int):
+        CommandName, Text, WorkBenchName = self.Items[Row]
+        ExtraTexts = []
+        if self.ExtraTextSource is not None:
+            try:
+                ExtraTexts = self.ExtraTextSource(CommandName, WorkBenchName)
+            except Exception:
+                ExtraTexts = []
+        Key = ReturnKey([Text, CommandName])
+        ExtraKey = ReturnKey(ExtraTexts)
+        self.Keys.append(Key)
+        self.ExtraKeys.append(ExtraKey)
+
+        RowTrigrams = self.ReturnKeyTrigrams(Key)
+        for Trigram in RowTrigrams:
+            Rows = self.Trigrams.get(Trigram)
+            if Rows is None:
+                self.Trigrams[Trigram] = {Row}
+            else:
+                Rows.add(Row)
+        for Trigram in self.ReturnKeyTrigrams(ExtraKey) - RowTrigrams:
+            Rows = self.ExtraTrigrams.get(Trigram)
+            if Rows is None:
+                self.ExtraTrigrams[Trigram] = {Row}
+            else:
+                Rows.add(Row)
+        return
+
+    def ReturnKeyTrigrams(self, Key: str) -> set:
+        KeyTrigrams = set()
+        for Word in Key.split():
+            Trigrams = self.WordTrigrams.get(Word)
+            if Trigrams is None:
+                Trigrams = ReturnTrigrams(Word)
+                self.WordTrigrams[Word] = Trigrams
+            KeyTrigrams.update(Trigrams)
+        return KeyTrigrams
+
+    # endregion
+
+    # region - Search
+    def ReturnScores(self, SearchText: str) -> dict:
+        """Returns the score of the rows that match the search text. The search is not case sensitive.
+
+        Args:
+            SearchText (str): The text in the searchbar
+
+        Returns:
+            dict: row -> score. Higher scores are better matches. Empty search texts match no rows.
+        """
+        if SearchText == self.LastSearch and self.LastScores is not None:
+            return self.LastScores
+        if self.IsBuilt is False:
+            self.ContinueIndex()
+
+        # Start with the words that match the least rows. The other words are only checked for their matches.
+        Words = ReturnWords(SearchText)
+        Words.sort(key=self.ReturnWordCost)
+        Scores = None
+        for Word in Words:
+            WordScores = self.ReturnWordScores(Word, Scores)
+            if Scores is None:
+                Scores = WordScores
+            else:
+                Scores = {
+                    Row: Score + Scores[Row]
+                    for Row, Score in WordScores.items()
+                    if Row in Scores
+                }
+            if len(Scores) == 0:
+                break
+        if Scores is None:
+            Scores = {}
+
+        if len(self.Usage) > 0:
+            Now = time.time()
+            for Row in Scores:
+                Usage = self.Usage.get(self.Items[Row][0])
+                if Usage is not None:
+                    Scores[Row] += ReturnUsageScore(Usage[0], Usage[1], Now)
+
+        self.LastSearch = SearchText
+        self.LastScores = Scores
+        return Scores
+
+    def ReturnWordCost(self, Word: str) -> int:
+        """Returns an estimate of the number of rows to check for a word"""
+        if len(Word) <= SHORT_WORD:
+            return len(self.Items)
+        Trigrams, Minimum = self.ReturnSearchTrigrams(Word)
+        Sizes = sorted(self.ReturnTrigramSize(Trigram) for Trigram in Trigrams)
+        return sum(Sizes[: len(Trigrams) - Minimum + 1])
+
+    def ReturnTrigramSize(self, Trigram: str) -> int:
+        return len(self.Trigrams.get(Trigram, _NoRows)) + len(
+            self.ExtraTrigrams.get(Trigram, _NoRows)
+        )
+
+    def ReturnSearchTrigrams(self, Word: str):
+        """Returns the unique trigrams of a word and the number of them that must be in a row"""
+        Trigrams = list(dict.fromkeys(ReturnTrigrams(Word)))
+        Minimum = max(1, math.ceil(MIN_SIMILARITY * len(Trigrams)))
+        return Trigrams, Minimum
+
+    def ReturnWordScores(self, Word: str, Candidates: dict = None) -> dict:
+        """Returns the score of the rows that match one word of the search text.
+
+        Args:
+            Word (str): lowercase word
+            Candidates (dict, optional): Only these rows are checked. Defaults to all rows.
+        """
+        Keys = self.Keys
+        ExtraKeys = self.ExtraKeys
+        SpacedWord = f" {Word}"
+        Scores = {}
+
+        if len(Word) <= SHORT_WORD:
+            Rows = range(len(Keys)) if Candidates is None else Candidates
+            for Row in [Row for Row in Rows if Word in Keys[Row]]:
+                Scores[Row] = 1
+                if SpacedWord in Keys[Row]:
+                    Scores[Row] += WORD_START_BONUS
+            for Row in [Row for Row in Rows if Word in ExtraKeys[Row]]:
+                if Row not in Scores:
+                    Scores[Row] = 0.5
+            return Scores
+
+        Trigrams, Minimum = self.ReturnSearchTrigrams(Word)
+        if Candidates is None:
+            # A row with at least Minimum of the trigrams has one of the (number of trigrams - Minimum + 1) rarest ones
+            Rows = set()
+            for Trigram in sorted(Trigrams, key=self.ReturnTrigramSize)[
+                : len(Trigrams) - Minimum + 1
+            ]:
+                Rows.update(self.Trigrams.get(Trigram, _NoRows))
+                Rows.update(self.ExtraTrigrams.get(Trigram, _NoRows))
+        else:
+            Rows = set(Candidates)
+
+        # Count the trigrams per row. The intersections and the counters run in C.
+        Counts = Counter()
+        ExtraCounts = Counter()
+        for Trigram in Trigrams:
+            Counts.update(self.Trigrams.get(Trigram, _NoRows) & Rows)
+            ExtraCounts.update(self.ExtraTrigrams.get(Trigram, _NoRows) & Rows)
+
+        # The trigrams count fully in the key and half in the extra key. Both count for the minimum.
+        Total = 2 * len(Trigrams)
+        for Row in Rows:
+            Count = Counts[Row]
+            ExtraCount = ExtraCounts[Row]
+            if Count + ExtraCount < Minimum:
+                continue
+            Key = Keys[Row]
+            if Word in Key:
+                Score = 1
+                if SpacedWord in Key:
+                    Score += WORD_START_BONUS
+            elif Word in ExtraKeys[Row]:
+                Score = 0.5
+            else:
+                Score = (2 * Count + ExtraCount) / Total
+            Scores[Row] = Score
+        return Scores
+
+    # endregion
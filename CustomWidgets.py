@@ -30,12 +30,15 @@ from PySide.QtGui import (
     QFontMetrics,
     QFont,
     QFontDatabase,
-    QTextOption,
     QCursor,
     QPalette,
     QEnterEvent,
+    QPainter,
+    QStaticText,
+    QTransform,
 )
 from PySide.QtWidgets import (
+    QApplication,
     QToolButton,
     QVBoxLayout,
     QHBoxLayout,
@@ -43,12 +46,12 @@ from PySide.QtWidgets import (
     QMenu,
     QSpacerItem,
     QSizePolicy,
-    QTextEdit,
     QStyleOption,
-    QFrame,
+    QStyle,
     QGraphicsEffect,
+    QWidget,
 )
-from PySide.QtCore import Qt, QSize, QRect, QMargins, QEvent, QObject
+from PySide.QtCore import Qt, QSize, QRect, QMargins, QEvent, QObject, QPointF
 
 import os
 import sys
@@ -72,6 +75,244 @@ sys.path.append(pathPackages)
 translate = App.Qt.translate
 
 
+# region - Text measure cache -------------------------------------------------------------------------------
+#
+# The same button texts are wrapped, elided and measured for many workbenches. The results are stored per
+# text, font and width and shared by all tabs. The cache is cleared when the font or the DPI changes.
+TextCache = {}
+TextCacheState = {"Connected": False}
+
+
+def ClearTextCache(*args):
+    TextCache.clear()
+    return
+
+
+def ConnectTextCache():
+    """Connects the signals that clear the cache. Only done once."""
+    if TextCacheState["Connected"] is True:
+        return
+    TextCacheState["Connected"] = True
+    Application = QApplication.instance()
+    if Application is None:
+        return
+    try:
+        for Screen in Application.screens():
+            Screen.logicalDotsPerInchChanged.connect(ClearTextCache)
+        Application.screenAdded.connect(
+            lambda Screen: Screen.logicalDotsPerInchChanged.connect(ClearTextCache)
+        )
+    except Exception as e:
+        if Parameters_Ribbon.DEBUG_MODE is True:
+            StandardFunctions.Print(f"{e.with_traceback(e.__traceback__)}", "Warning")
+    # Not available in all Qt versions
+    try:
+        Application.fontChanged.connect(ClearTextCache)
+    except Exception:
+        pass
+    return
+
+
+def ReturnMaxLength(Text: str, FontMetrics: QFontMetrics, MaxWidth: int) -> int:
+    """Returns the number of characters of the text that fit in the width"""
+    Width = 0
+    MaxLength = 0
+    for c in Text:
+        Width = Width + FontMetrics.horizontalAdvance(c, -1)
+        if Width >= MaxWidth:
+            break
+        MaxLength = MaxLength + 1
+    return MaxLength
+
+
+def ReturnTextSize(Text: str, Font: QFont) -> tuple:
+    """Returns the width and height of the bounding rectangle of the text"""
+    Key = ("size", Text, Font.key())
+    Result = TextCache.get(Key)
+    if Result is None:
+        ConnectTextCache()
+        Rect = QFontMetrics(Font).boundingRect(Text)
+        Result = (Rect.width(), Rect.height())
+        TextCache[Key] = Result
+    return Result
+
+
+def ReturnElidedText(Text: str, Font: QFont, MaxWidth: int) -> str:
+    """Returns the text ending with "..." when it does not fit in the width"""
+    Key = ("elide", Text, Font.key(), MaxWidth)
+    Result = TextCache.get(Key)
+    if Result is None:
+        ConnectTextCache()
+        Result = Text
+        MaxLength = ReturnMaxLength(Text, QFontMetrics(Font), MaxWidth)
+        if MaxLength < len(Text):
+            Result = Text[: MaxLength - 3].strip() + "..."
+        TextCache[Key] = Result
+    return Result
+
+
+def ReturnWrappedLines(
+    Text: str, Font: QFont, MaxWidth: int, MaxNumberOfLines: int, ExtraLength: int = 0
+) -> dict:
+    """_summary_
+    Wraps the text on the number of characters that fit in the width.
+
+    Args:
+        Text (str): The text to wrap.
+        Font (QFont): The font of the text.
+        MaxWidth (int): The width of a line in pixels.
+        MaxNumberOfLines (int): The maximum number of lines.
+        ExtraLength (int, optional): Characters that are added to the length of a line. Defaults to 0.
+
+    Returns:
+        dict: {"Lines": the lines, "Widths": the advance per line, "TightWidths": the tight width per line}
+    """
+    Key = ("wrap", Text, Font.key(), MaxWidth, MaxNumberOfLines, ExtraLength)
+    Result = TextCache.get(Key)
+    if Result is None:
+        ConnectTextCache()
+        FontMetrics = QFontMetrics(Font)
+        MaxLength = ReturnMaxLength(Text, FontMetrics, MaxWidth) + ExtraLength
+        Lines = StandardFunctions.ReturnWrappedText(
+            Text, MaxLength, MaxNumberOfLines, True
+        )
+        Result = {
+            "Lines": tuple(Lines),
+            "Widths": tuple(FontMetrics.horizontalAdvance(Line, -1) for Line in Lines),
+            "TightWidths": tuple(
+                FontMetrics.tightBoundingRect(Line).width() for Line in Lines
+            ),
+        }
+        TextCache[Key] = Result
+    return Result
+
+
+# endregion
+
+
+class RibbonLabel(QWidget):
+    """A light label for the text of the custom buttons.
+
+    The lines are painted as cached QStaticText. Lines that are wider than the label are elided.
+    Clicks on the label are forwarded to the click target.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.Lines = []
+        self.StaticTexts = None
+        self.Alignment = Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignLeft
+        self.ClickTarget = None
+        self.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+
+    def setText(self, Text: str):
+        self.Lines = [Text]
+        self.ClearStaticTexts()
+        return
+
+    def append(self, Text: str):
+        self.Lines.append(Text)
+        self.ClearStaticTexts()
+        return
+
+    def text(self) -> str:
+        return "\n".join(self.Lines)
+
+    def setAlignment(self, Alignment):
+        self.Alignment = Alignment
+        self.update()
+        return
+
+    def setClickTarget(self, Button: QToolButton):
+        self.ClickTarget = Button
+        return
+
+    def ClearStaticTexts(self):
+        self.StaticTexts = None
+        self.updateGeometry()
+        self.update()
+        return
+
+    def ReturnStaticTexts(self) -> list:
+        if self.StaticTexts is None:
+            FontMetrics = self.fontMetrics()
+            Width = self.contentsRect().width()
+            self.StaticTexts = []
+            for Line in self.Lines:
+                if Width > 0 and FontMetrics.horizontalAdvance(Line) > Width:
+                    Line = FontMetrics.elidedText(
+                        Line, Qt.TextElideMode.ElideRight, Width
+                    )
+                StaticText = QStaticText(Line)
+                StaticText.setTextFormat(Qt.TextFormat.PlainText)
+                StaticText.prepare(QTransform(), self.font())
+                self.StaticTexts.append(StaticText)
+        return self.StaticTexts
+
+    def sizeHint(self) -> QSize:
+        FontMetrics = self.fontMetrics()
+        Width = 0
+        for Line in self.Lines:
+            Width = max(Width, FontMetrics.horizontalAdvance(Line))
+        Margins = self.contentsMargins()
+        return QSize(
+            Width + Margins.left() + Margins.right(),
+            FontMetrics.lineSpacing() * max(len(self.Lines), 1)
+            + Margins.top()
+            + Margins.bottom(),
+        )
+
+    def changeEvent(self, event):
+        # The size of the text changes with the font or the stylesheet
+        if event.type() in [QEvent.Type.FontChange, QEvent.Type.StyleChange]:
+            self.StaticTexts = None
+        super().changeEvent(event)
+        return
+
+    def resizeEvent(self, event):
+        # The lines are elided again for the new width
+        self.StaticTexts = None
+        super().resizeEvent(event)
+        return
+
+    def paintEvent(self, event):
+        Painter = QPainter(self)
+        # Draw the background and the border from the stylesheet
+        Option = QStyleOption()
+        Option.initFrom(self)
+        self.style().drawPrimitive(
+            QStyle.PrimitiveElement.PE_Widget, Option, Painter, self
+        )
+
+        Painter.setFont(self.font())
+        Painter.setPen(self.palette().color(self.foregroundRole()))
+        Rect = self.contentsRect()
+        LineHeight = self.fontMetrics().lineSpacing()
+        StaticTexts = self.ReturnStaticTexts()
+
+        y = Rect.top()
+        if self.Alignment & Qt.AlignmentFlag.AlignVCenter:
+            y = Rect.top() + (Rect.height() - LineHeight * len(StaticTexts)) / 2
+        elif self.Alignment & Qt.AlignmentFlag.AlignBottom:
+            y = Rect.bottom() - LineHeight * len(StaticTexts)
+        for StaticText in StaticTexts:
+            x = Rect.left()
+            if self.Alignment & Qt.AlignmentFlag.AlignHCenter:
+                x = Rect.left() + (Rect.width() - StaticText.size().width()) / 2
+            elif self.Alignment & Qt.AlignmentFlag.AlignRight:
+                x = Rect.right() - StaticText.size().width()
+            Painter.drawStaticText(QPointF(x, y), StaticText)
+            y = y + LineHeight
+        Painter.end()
+        return
+
+    def mousePressEvent(self, event):
+        if self.ClickTarget is not None:
+            self.ClickTarget.animateClick()
+        event.accept()
+        return
+
+
 class CustomControls:
 
     def LargeCustomToolButton(
@@ -94,16 +335,8 @@ class CustomControls:
         CommandButton = QToolButton()
         ArrowButton = QToolButton()
         Layout = QVBoxLayout()
-        Label_Text = QTextEdit()
-
-        # Set the default stylesheet
-        StyleSheet_Addition_Button = (
-            "QToolButton, QToolButton:hover {background-color: "
-            + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-            + ";border: none"
-            + ";}"
-        )
-        btn.setStyleSheet(StyleSheet_Addition_Button)
+        Label_Text = RibbonLabel()
+
         # Define the parameters
         CommandButtonHeight = 0
         TextWidth = 0
@@ -141,18 +374,6 @@ class CustomControls:
         # Still create a label to set up the button properly
         if showText is True and Text != "":
             # Create a label with the correct properties
-            # Label_Text = QTextEdit()
-            Label_Text.setReadOnly(True)
-            Label_Text.setFrameShape(QFrame.Shape.NoFrame)
-            Label_Text.setFrameShadow(QFrame.Shadow.Plain)
-            Label_Text.setTextInteractionFlags(Qt.TextInteractionFlag.NoTextInteraction)
-            Label_Text.setHorizontalScrollBarPolicy(
-                Qt.ScrollBarPolicy.ScrollBarAlwaysOff
-            )
-            Label_Text.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-            Label_Text.document().setDocumentMargin(0)
-            Label_Text.viewport().setCursor(Qt.CursorShape.ArrowCursor)
-            Label_Text.setFocusPolicy(Qt.FocusPolicy.NoFocus)
             # Set the font
             Font = QFont()
             Font.setPixelSize(FontSize)
@@ -160,7 +381,7 @@ class CustomControls:
             # change the menubutton space because text is included in the click area
             MenuButtonSpace = 10
             # Determine the height of a single row
-            SingleHeight = QFontMetrics(Font).boundingRect(Text).height() + 3
+            SingleHeight = ReturnTextSize(Text, Font)[1] + 3
             Label_Text.setMinimumHeight(SingleHeight * 1)
             Label_Text.setMaximumHeight(SingleHeight * MaxNumberOfLines)
             # Set the width of the label based on the size of the button
@@ -168,20 +389,9 @@ class CustomControls:
 
             # If there is no WordWrap, set the ElideMode and the max number of lines to 1.
             if setWordWrap is False:
-                # Determine the maximum length per line
-                FontMetrics = QFontMetrics(Text)
-                maxWidth = 0
-                maxLength = 0
-                for c in Text:
-                    maxWidth = maxWidth + FontMetrics.horizontalAdvance(c, -1)
-                    if maxWidth < ButtonSize.width():
-                        maxLength = maxLength + 1
-                    if maxWidth >= ButtonSize.width():
-                        limit = maxLength - 3
-                        Text = Text[:limit].strip() + "..."
-                        break
+                # Shorten the text to the width of the button
+                Text = ReturnElidedText(Text, Font, ButtonSize.width())
                 # Set the text with a placeholder
-                Label_Text.setWordWrapMode(QTextOption.WrapMode.NoWrap)
                 Label_Text.setText(Text)
                 # Set the maximum number of lines to 1
                 MaxNumberOfLines = 1
@@ -195,40 +405,27 @@ class CustomControls:
 
             # If wordwrap is enabled, set the text and height accordingly
             if setWordWrap is True:
-                # Set the wrap mode
-                Label_Text.setWordWrapMode(QTextOption.WrapMode.WordWrap)
-                # Determine the maximum length per line
-                FontMetrics = QFontMetrics(Font)
-                maxWidth = 0
-                maxLength = 0
-                for c in Text:
-                    maxWidth = maxWidth + FontMetrics.horizontalAdvance(c, -1)
-                    if maxWidth < ButtonSize.width():
-                        maxLength = maxLength + 1
-                    if maxWidth >= ButtonSize.width():
-                        break
-                maxLength = maxLength + 3
+                # Wrap the text on the width of the button. Allow 3 extra characters per line
+                TextLayout = ReturnWrappedLines(
+                    Text, Font, ButtonSize.width(), MaxNumberOfLines, 3
+                )
 
                 # Get the first text line
-                line1 = StandardFunctions.ReturnWrappedText(
-                    Text, maxLength, MaxNumberOfLines, True
-                )[0]
+                line1 = TextLayout["Lines"][0]
                 # Set the alignment
                 Label_Text.setAlignment(TextAlignment)
                 # Add the line
                 Label_Text.append(line1)
                 # get the text width
-                TextWidth = FontMetrics.horizontalAdvance(line1, -1)
+                TextWidth = TextLayout["Widths"][0]
                 # Set the correct height. Avoid a too big difference in icon sizes by only decreasing the height when there is a menu.
                 if Menu is not None and len(Menu.actions()) > 1:
                     Label_Text.setFixedHeight(SingleHeight)
                 else:
                     Label_Text.setFixedHeight((SingleHeight * MaxNumberOfLines) - Space)
-                # Try to get the second line if there is one
-                try:
-                    line2 = StandardFunctions.ReturnWrappedText(
-                        Text, maxLength, MaxNumberOfLines, True
-                    )[1]
+                # Get the second line if there is one
+                if len(TextLayout["Lines"]) > 1:
+                    line2 = TextLayout["Lines"][1]
                     # Set the alignment
                     Label_Text.setAlignment(TextAlignment)
                     # Add the line
@@ -236,10 +433,8 @@ class CustomControls:
                     # Set the correct height
                     Label_Text.setFixedHeight((SingleHeight * MaxNumberOfLines) - Space)
                     # Update the text width if neccesary
-                    if FontMetrics.horizontalAdvance(line2, -1) > TextWidth:
-                        TextWidth = TextWidth = FontMetrics.horizontalAdvance(line2, -1)
-                except Exception:
-                    pass
+                    if TextLayout["Widths"][1] > TextWidth:
+                        TextWidth = TextLayout["Widths"][1]
 
             # Add the label with alignment
             Layout.addWidget(Label_Text)
@@ -253,7 +448,8 @@ class CustomControls:
                 + str(Parameters_Ribbon.FONTSIZE_MENUS)
                 + "px;}"
             )
-            Menu.setStyleSheet(StyleSheet_Menu)
+            if Menu.styleSheet() != StyleSheet_Menu:
+                Menu.setStyleSheet(StyleSheet_Menu)
             ArrowButton.setMenu(Menu)
             ArrowButton.setPopupMode(QToolButton.ToolButtonPopupMode.InstantPopup)
             # Set the height according the space for the menubutton
@@ -276,65 +472,14 @@ class CustomControls:
                 def mouseClickevent(event):
                     ArrowButton.animateClick()
 
-                Label_Text.mousePressEvent = lambda mouseClick: mouseClickevent(
-                    mouseClick
-                )
                 ArrowButton.mousePressEvent = lambda mouseClick: mouseClickevent(
                     mouseClick
                 )
+                Label_Text.setClickTarget(ArrowButton)
 
                 # Change the background color for commandbutton and label on hovering (CSS)
                 def enterEventCustom(event):
-                    BorderColor = StyleMapping_Ribbon.ReturnStyleItem("Border_Color")
-                    if Parameters_Ribbon.CUSTOM_COLORS_ENABLED:
-                        BorderColor = Parameters_Ribbon.COLOR_BORDERS
-                    if Parameters_Ribbon.BORDER_TRANSPARANT:
-                        BorderColor = StyleMapping_Ribbon.ReturnStyleItem(
-                            "Background_Color_Hover"
-                        )
-                    StyleSheet_Addition_Arrow = (
-                        "QToolButton, QTextEdit {background-color: "
-                        + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        + ";border: 0.5px solid"
-                        + BorderColor
-                        + ";border-top: 0px solid"
-                        + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        + ";border-top-left-radius: 0px;border-bottom-left-radius: 2px;"
-                        + "border-top-right-radius: 0px;border-bottom-right-radius: 2px"
-                        + ";margin: 0px"
-                        + ";spacing: 0px"
-                        + ";}"
-                        + """QToolButton::menu-indicator {
-                                subcontrol-origin: padding;
-                                subcontrol-position: center top;
-                            }"""
-                    )
-                    StyleSheet_Addition_Label = (
-                        "QToolButton, QTextEdit {background-color: "
-                        + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        + ";border: 0.5px solid"
-                        + BorderColor
-                        + ";border-bottom: 0px solid"
-                        + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        + ";border-top-left-radius: 2px;border-bottom-left-radius: 0px;"
-                        + "border-top-right-radius: 2px;border-bottom-right-radius: 0px"
-                        + ";margin: 0px"
-                        + ";spacing: 0px"
-                        + ";}"
-                    )
-                    StyleSheet_Addition_Button = (
-                        "QToolButton, QTextEdit {background-color: "
-                        + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-                        + ";border: none"
-                        + ";}"
-                    )
-                    btn.setStyleSheet(StyleSheet_Addition_Button)
-                    if ArrowButton.underMouse():
-                        Label_Text.setStyleSheet(StyleSheet_Addition_Label)
-                        ArrowButton.setStyleSheet(StyleSheet_Addition_Arrow)
-                    if Label_Text.underMouse():
-                        Label_Text.setStyleSheet(StyleSheet_Addition_Label)
-                        ArrowButton.setStyleSheet(StyleSheet_Addition_Arrow)
+                    StyleMapping_Ribbon.SetRibbonHover([Label_Text, ArrowButton], True)
 
                     if parent is not None:
                         # Set the value in the parent for detecting that the menu is entered.
@@ -347,38 +492,7 @@ class CustomControls:
             if showText is False:
                 # Change the background color for commandbutton and label on hovering (CSS)
                 def enterEventCustom_2(event):
-                    BorderColor = StyleMapping_Ribbon.ReturnStyleItem("Border_Color")
-                    if Parameters_Ribbon.CUSTOM_COLORS_ENABLED:
-                        BorderColor = Parameters_Ribbon.COLOR_BORDERS
-                    if Parameters_Ribbon.BORDER_TRANSPARANT:
-                        BorderColor = StyleMapping_Ribbon.ReturnStyleItem(
-                            "Background_Color_Hover"
-                        )
-                    StyleSheet_Addition_Arrow = (
-                        "QToolButton, QTextEdit {background-color: "
-                        + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        + ";border: 0.5px solid"
-                        + BorderColor
-                        + ";border-radius: 2px"
-                        + ";margin: 0px"
-                        + ";spacing: 0px"
-                        + ";}"
-                        + """QToolButton::menu-indicator {
-                                subcontrol-origin: padding;
-                                subcontrol-position: center top;
-                            }"""
-                    )
-                    StyleSheet_Addition_Button = (
-                        "QToolButton, QTextEdit {background-color: "
-                        + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-                        + ";border: none"
-                        + ";}"
-                    )
-                    btn.setStyleSheet(StyleSheet_Addition_Button)
-                    if ArrowButton.underMouse():
-                        ArrowButton.setStyleSheet(StyleSheet_Addition_Arrow)
-                    if Label_Text.underMouse():
-                        ArrowButton.setStyleSheet(StyleSheet_Addition_Arrow)
+                    StyleMapping_Ribbon.SetRibbonHover([ArrowButton], True)
 
                     if parent is not None:
                         # Set the value in the parent for detecting that the menu is entered to True.
@@ -392,18 +506,9 @@ class CustomControls:
                     enterEvent
                 )
 
-            # restore the stylesheets on leaving
+            # remove the highlight on leaving
             def leaveEventCustom(event):
-                StyleSheet = StyleMapping_Ribbon.ReturnStyleSheet(
-                    control="toolbutton",
-                    radius="2px",
-                )
-                StyleSheet_Addition = """QToolButton::menu-indicator {
-                    subcontrol-origin: padding;
-                    subcontrol-position: center top;
-                }"""
-                Label_Text.setStyleSheet(StyleSheet)
-                ArrowButton.setStyleSheet(StyleSheet_Addition + StyleSheet)
+                StyleMapping_Ribbon.SetRibbonHover([Label_Text, ArrowButton], False)
 
                 # If the menu is hidden, set the value in the parent for detecting that the menu is entered to False.
                 if Menu.isHidden():
@@ -431,61 +536,13 @@ class CustomControls:
                 # Create custom events
                 #
                 # Peform a menu click when clicked on the label
-                def mouseClickevent(event):
-                    CommandButton.animateClick()
-
-                Label_Text.mousePressEvent = lambda mouseClick: mouseClickevent(
-                    mouseClick
-                )
+                Label_Text.setClickTarget(CommandButton)
 
                 # Change the background color for commandbutton and label on hovering (CSS)
                 def enterEventCustom(event):
-                    BorderColor = StyleMapping_Ribbon.ReturnStyleItem("Border_Color")
-                    if Parameters_Ribbon.CUSTOM_COLORS_ENABLED:
-                        BorderColor = Parameters_Ribbon.COLOR_BORDERS
-                    if Parameters_Ribbon.BORDER_TRANSPARANT:
-                        BorderColor = StyleMapping_Ribbon.ReturnStyleItem(
-                            "Background_Color_Hover"
-                        )
-                    StyleSheet_Addition_Label = (
-                        "QToolButton, QTextEdit {background-color: "
-                        + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        + ";border: 0.5px solid"
-                        + BorderColor
-                        + ";border-top: 0px solid"
-                        + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        + ";border-top-left-radius: 0px;border-bottom-left-radius: 2px;"
-                        + "border-top-right-radius: 0px;border-bottom-right-radius: 2px"
-                        + ";margin: 0px"
-                        + ";spacing: 0px"
-                        + ";}"
-                    )
-                    StyleSheet_Addition_Command = (
-                        "QToolButton, QTextEdit {background-color: "
-                        + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        + ";border: 0.5px solid"
-                        + BorderColor
-                        + ";border-bottom: 0px solid"
-                        + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        + ";border-top-left-radius: 2px;border-bottom-left-radius: 0px;"
-                        + "border-top-right-radius: 2px;border-bottom-right-radius: 0px"
-                        + ";margin: 0px"
-                        + ";spacing: 0px"
-                        + ";}"
+                    StyleMapping_Ribbon.SetRibbonHover(
+                        [CommandButton, Label_Text], True
                     )
-                    StyleSheet_Addition_Button = (
-                        "QToolButton, QTextEdit {background-color: "
-                        + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-                        + ";border: none"
-                        + ";}"
-                    )
-                    btn.setStyleSheet(StyleSheet_Addition_Button)
-                    if CommandButton.underMouse():
-                        Label_Text.setStyleSheet(StyleSheet_Addition_Label)
-                        CommandButton.setStyleSheet(StyleSheet_Addition_Command)
-                    if Label_Text.underMouse():
-                        Label_Text.setStyleSheet(StyleSheet_Addition_Label)
-                        CommandButton.setStyleSheet(StyleSheet_Addition_Command)
 
                 Label_Text.enterEvent = lambda enterEvent: enterEventCustom(enterEvent)
                 CommandButton.enterEvent = lambda enterEvent: enterEventCustom(
@@ -495,34 +552,7 @@ class CustomControls:
             if showText is False:
                 # Change the background color for commandbutton and label on hovering (CSS)
                 def enterEventCustom_2(event):
-                    BorderColor = StyleMapping_Ribbon.ReturnStyleItem("Border_Color")
-                    if Parameters_Ribbon.CUSTOM_COLORS_ENABLED:
-                        BorderColor = Parameters_Ribbon.COLOR_BORDERS
-                    if Parameters_Ribbon.BORDER_TRANSPARANT:
-                        BorderColor = StyleMapping_Ribbon.ReturnStyleItem(
-                            "Background_Color_Hover"
-                        )
-                    StyleSheet_Addition_Command = (
-                        "QToolButton, QTextEdit {background-color: "
-                        + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        + ";border: 0.5px solid"
-                        + BorderColor
-                        + ";border-radius: 2px"
-                        + ";margin: 0px"
-                        + ";spacing: 0px"
-                        + ";}"
-                    )
-                    StyleSheet_Addition_Button = (
-                        "QToolButton, QTextEdit {background-color: "
-                        + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-                        + ";border: none"
-                        + ";}"
-                    )
-                    btn.setStyleSheet(StyleSheet_Addition_Button)
-                    if CommandButton.underMouse():
-                        CommandButton.setStyleSheet(StyleSheet_Addition_Command)
-                    if Label_Text.underMouse():
-                        CommandButton.setStyleSheet(StyleSheet_Addition_Command)
+                    StyleMapping_Ribbon.SetRibbonHover([CommandButton], True)
 
                 Label_Text.enterEvent = lambda enterEvent: enterEventCustom_2(
                     enterEvent
@@ -531,21 +561,9 @@ class CustomControls:
                     enterEvent
                 )
 
-            # restore the stylesheets on leaving
+            # remove the highlight on leaving
             def leaveEventCustom(event):
-                StyleSheet = StyleMapping_Ribbon.ReturnStyleSheet(
-                    control="toolbutton",
-                    radius="2px",
-                )
-                StyleSheet_Addition = (
-                    "QToolButton, QToolButton:hover, QTextEdit, QTextEdit:hover {background-color: "
-                    + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-                    + ";border: 0.5px solid"
-                    + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-                    + ";}"
-                )
-                Label_Text.setStyleSheet(StyleSheet_Addition + StyleSheet)
-                CommandButton.setStyleSheet(StyleSheet)
+                StyleMapping_Ribbon.SetRibbonHover([CommandButton, Label_Text], False)
 
             Label_Text.leaveEvent = lambda leaveEvent: leaveEventCustom(leaveEvent)
             CommandButton.leaveEvent = lambda leaveEvent: leaveEventCustom(leaveEvent)
@@ -557,60 +575,26 @@ class CustomControls:
         # Add the layout to the button
         btn.setLayout(Layout)
 
-        # Set the stylesheet
-        StyleSheet = StyleMapping_Ribbon.ReturnStyleSheet(
-            control="toolbutton", radius="2px"
-        )
-        StyleSheet_Addition_Label = (
-            "QToolButton, QTextEdit {background-color: "
-            + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-            + ";border: 0.5px solid"
-            + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-            + ";border-top: 0px solid"
-            + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-            + ";border-radius: 2px"
-            + ";margin: 0px"
-            + ";spacing: 0px"
-            + ";}"
-        )
-        StyleSheet_Addition_Command = (
-            "QToolButton, QTextEdit {background-color: "
-            + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-            + ";border: 0.5px solid"
-            + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-            + ";border-bottom: 0px solid"
-            + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-            + ";border-radius: 2px"
-            + ";margin: 0px"
-            + ";spacing: 0px"
-            + ";}"
-        )
-        StyleSheet_Addition_Button = (
-            "QToolButton, QTextEdit {background-color: "
-            + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-            + ";border: none"
-            + ";}"
-        )
-        StyleSheet_Addition_Arrow = (
-            "QToolButton, QTextEdit {background-color: "
-            + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-            + ";border: 0.5px solid"
-            + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-            + ";border-top: 0px solid"
-            + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-            + ";border-radius: 2px"
-            + ";margin: 0px"
-            + ";spacing: 0px"
-            + ";}"
-            + """QToolButton::menu-indicator {
-                    subcontrol-origin: padding;
-                    subcontrol-position: center top;
-                }"""
-        )
-        CommandButton.setStyleSheet(StyleSheet_Addition_Command + StyleSheet)
-        ArrowButton.setStyleSheet(StyleSheet_Addition_Arrow + StyleSheet)
-        Label_Text.setStyleSheet(StyleSheet_Addition_Label + StyleSheet)
-        btn.setStyleSheet(StyleSheet_Addition_Button + StyleSheet)
+        # Set the properties for the ribbon stylesheet
+        StyleMapping_Ribbon.SetRibbonRole(btn, "button")
+        if Menu is not None and len(Menu.actions()) > 1:
+            ArrowPart = "second"
+            if showText is False:
+                ArrowPart = "single"
+            StyleMapping_Ribbon.SetRibbonRole(
+                CommandButton, "command", "large", "first"
+            )
+            StyleMapping_Ribbon.SetRibbonRole(Label_Text, "label", "large", "first")
+            StyleMapping_Ribbon.SetRibbonRole(ArrowButton, "arrow", "large", ArrowPart)
+        else:
+            CommandPart = "first"
+            if showText is False:
+                CommandPart = "single"
+            StyleMapping_Ribbon.SetRibbonRole(
+                CommandButton, "command", "large", CommandPart
+            )
+            StyleMapping_Ribbon.SetRibbonRole(Label_Text, "label", "large", "second")
+            StyleMapping_Ribbon.SetRibbonRole(ArrowButton, "arrow", "large", "second")
 
         # Set the final sizes
         width = ButtonSize.width()
@@ -648,15 +632,7 @@ class CustomControls:
         CommandButton = QToolButton()
         ArrowButton = QToolButton()
         Layout = QHBoxLayout()
-        Label_Text = QTextEdit()
-        # Set the default stylesheet
-        StyleSheet_Addition_Button = (
-            "QToolButton, QToolButton:hover {background-color: "
-            + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-            + ";border: none"
-            + ";}"
-        )
-        btn.setStyleSheet(StyleSheet_Addition_Button)
+        Label_Text = RibbonLabel()
         # Define the parameters
         TextWidth = 0
         space = 6
@@ -690,67 +666,29 @@ class CustomControls:
         # If text must be shown wrapped, add a layout with label
         if showText is True and Text != "":
             # Create a label
-            # Label_Text = QTextEdit()
-            Label_Text.setReadOnly(True)
-            Label_Text.setFrameShape(QFrame.Shape.NoFrame)
-            Label_Text.setFrameShadow(QFrame.Shadow.Plain)
-            Label_Text.setTextInteractionFlags(Qt.TextInteractionFlag.NoTextInteraction)
-            Label_Text.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-            Label_Text.setHorizontalScrollBarPolicy(
-                Qt.ScrollBarPolicy.ScrollBarAlwaysOff
-            )
-            Label_Text.document().setDocumentMargin(0)
-            Label_Text.viewport().setCursor(Qt.CursorShape.ArrowCursor)
-            Label_Text.setFocusPolicy(Qt.FocusPolicy.NoFocus)
-            Label_Text.setSizeAdjustPolicy(QTextEdit.SizeAdjustPolicy.AdjustToContents)
             Label_Text.setFixedHeight(CommandButton.height())
             # Set the font
             Font = QFont()
             Font.setPixelSize(FontSize)
             Label_Text.setFont(Font)
-            FontMetrics = QFontMetrics(Font)
             if setWordWrap is True:
-                Label_Text.setWordWrapMode(QTextOption.WrapMode.WordWrap)
-                # Determine the maximum length per line
-                FontMetrics = QFontMetrics(Font)
-                maxWidth = 0
-                maxLength = 0
-                for c in Text:
-                    maxWidth = maxWidth + FontMetrics.horizontalAdvance(c, -1)
-                    if maxWidth < ButtonSize.width() * 2:
-                        maxLength = maxLength + 1
-                    if maxWidth >= ButtonSize.width() * 2:
-                        break
+                # Wrap the text on twice the width of the button
+                TextLayout = ReturnWrappedLines(
+                    Text, Font, ButtonSize.width() * 2, MaxNumberOfLines
+                )
                 # Get the first text line
-                line1 = StandardFunctions.ReturnWrappedText(
-                    Text, maxLength, MaxNumberOfLines, True
-                )[0]
+                line1 = TextLayout["Lines"][0]
                 # Add the line with a space to avoid te need to set spacing. (Spacing breaks the hover background)
                 Label_Text.append(" " + line1)
-                # Try to get the second line if there is one
-                try:
-                    line2 = StandardFunctions.ReturnWrappedText(
-                        Text, maxLength, MaxNumberOfLines, True
-                    )[1]
+                # Update a parameter for the width
+                TextWidth = TextLayout["TightWidths"][0]
+                # Get the second line if there is one
+                if len(TextLayout["Lines"]) > 1:
+                    line2 = TextLayout["Lines"][1]
                     # Add the line with a space to avoid te need to set spacing. (Spacing breaks the hover background)
                     Label_Text.append(" " + line2)
-                    if (
-                        FontMetrics.tightBoundingRect(line1).width()
-                        > FontMetrics.tightBoundingRect(line2).width()
-                    ):
-                        # Update a parameter for the width
-                        TextWidth = FontMetrics.tightBoundingRect(line1).width()
-                    else:
-                        # Update a parameter for the width
-                        TextWidth = FontMetrics.tightBoundingRect(line2).width()
-                except Exception:
-                    # Correct the margin to set the arrow vertical center (bug in Qt)
-                    marginCorrection = (
-                        CommandButton.height() - FontMetrics.boundingRect(Text).height()
-                    ) / 2
-                    Label_Text.setViewportMargins(0, marginCorrection, 0, 0)
                     # Update a parameter for the width
-                    TextWidth = FontMetrics.tightBoundingRect(line1).width()
+                    TextWidth = max(TextWidth, TextLayout["TightWidths"][1])
 
                 # Adjust the size
                 Label_Text.setMaximumWidth(TextWidth + space)
@@ -759,7 +697,7 @@ class CustomControls:
 
                 # If the text is higher than the commandbutton, switch to no wrap
                 if (
-                    FontMetrics.boundingRect(line1).height() * MaxNumberOfLines
+                    ReturnTextSize(line1, Font)[1] * MaxNumberOfLines
                 ) > ButtonSize.height():
                     setWordWrap = False
                     # reset the values
@@ -775,33 +713,16 @@ class CustomControls:
             if setWordWrap is False:
                 # if the text must be elided, return a updated text
                 if ElideMode is True:
-                    # Determine the maximum length per line
-                    FontMetrics = QFontMetrics(Text)
-                    maxWidth = 0
-                    maxLength = 0
-                    for c in Text:
-                        maxWidth = maxWidth + FontMetrics.horizontalAdvance(c, -1)
-                        if maxWidth < ButtonSize.width() * 3:
-                            maxLength = maxLength + 1
-                        if maxWidth >= ButtonSize.width() * 3:
-                            limit = maxLength - 3
-                            Text = Text[:limit].strip() + "..."
-                            break
+                    Text = ReturnElidedText(Text, Font, ButtonSize.width() * 3)
                 # Set the number of lines to 1 and disable wrap
                 MaxNumberOfLines = 1
-                Label_Text.setWordWrapMode(QTextOption.WrapMode.NoWrap)
                 # Add the line with a space to avoid te need to set spacing. (Spacing breaks the hover background)
                 Label_Text.setText(" " + Text)
                 # Update the size
                 Label_Text.adjustSize()
                 Label_Text.setFixedHeight(CommandButton.height())
-                # Correct the margin to set the arrow vertical center (bug in Qt)
-                marginCorrection = (
-                    CommandButton.height() - FontMetrics.boundingRect(Text).height()
-                ) / 2
-                Label_Text.setViewportMargins(0, marginCorrection, 0, 0)
                 # Update the width parameter
-                TextWidth = FontMetrics.boundingRect(Text).width() + space
+                TextWidth = ReturnTextSize(Text, Font)[0] + space
             # Set the text alignment
             TextAlignment = Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft
             Label_Text.setAlignment(TextAlignment)
@@ -819,7 +740,8 @@ class CustomControls:
                 + str(Parameters_Ribbon.FONTSIZE_MENUS)
                 + "px;}"
             )
-            Menu.setStyleSheet(StyleSheet_Menu)
+            if Menu.styleSheet() != StyleSheet_Menu:
+                Menu.setStyleSheet(StyleSheet_Menu)
             ArrowButton.setPopupMode(QToolButton.ToolButtonPopupMode.InstantPopup)
             # Set the height according the space for the menubutton
             ArrowButton.setFixedHeight(CommandButton.height())
@@ -841,63 +763,14 @@ class CustomControls:
                 def mouseClickevent(event):
                     ArrowButton.animateClick()
 
-                Label_Text.mousePressEvent = lambda mouseClick: mouseClickevent(
-                    mouseClick
-                )
                 ArrowButton.mousePressEvent = lambda mouseClick: mouseClickevent(
                     mouseClick
                 )
+                Label_Text.setClickTarget(ArrowButton)
 
                 # Change the background color for commandbutton and label on hovering (CSS)
                 def enterEventCustom(event):
-                    BorderColor = StyleMapping_Ribbon.ReturnStyleItem("Border_Color")
-                    if Parameters_Ribbon.CUSTOM_COLORS_ENABLED:
-                        BorderColor = Parameters_Ribbon.COLOR_BORDERS
-                    if Parameters_Ribbon.BORDER_TRANSPARANT:
-                        BorderColor = StyleMapping_Ribbon.ReturnStyleItem(
-                            "Background_Color_Hover"
-                        )
-                    StyleSheet_Addition_Label = (
-                        "QToolButton, QTextEdit { "
-                        + "background-color: "
-                        + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        + ";border: 0.5px solid"
-                        + BorderColor
-                        + ";border-right: 0px solid"
-                        + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        + ";border-top-left-radius: 2px;border-bottom-left-radius: 2px;"
-                        + "border-top-right-radius: 0px;border-bottom-right-radius: 0px"
-                        + ";margin: 0px"
-                        + ";spacing: 0px"
-                        + ";}"
-                    )
-                    StyleSheet_Addition_Arrow = (
-                        "QToolButton, QTextEdit { "
-                        + "background-color: "
-                        + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        + ";border: 0.5px solid"
-                        + BorderColor
-                        + ";border-left: 0px solid"
-                        + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        + ";border-top-left-radius: 0px;border-bottom-left-radius: 0px;"
-                        + "border-top-right-radius: 2px;border-bottom-right-radius: 2px"
-                        + ";margin: 0px"
-                        + ";spacing: 0px"
-                        + ";}"
-                    )
-                    StyleSheet_Addition_Button = (
-                        "QToolButton:hover {background-color: "
-                        + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-                        + ";border: none"
-                        + ";}"
-                    )
-                    btn.setStyleSheet(StyleSheet_Addition_Button)
-                    if ArrowButton.underMouse():
-                        ArrowButton.setStyleSheet(StyleSheet_Addition_Arrow)
-                        Label_Text.setStyleSheet(StyleSheet_Addition_Label)
-                    if Label_Text.underMouse():
-                        ArrowButton.setStyleSheet(StyleSheet_Addition_Arrow)
-                        Label_Text.setStyleSheet(StyleSheet_Addition_Label)
+                    StyleMapping_Ribbon.SetRibbonHover([Label_Text, ArrowButton], True)
 
                     if parent is not None:
                         # Set the value in the parent for detecting that the menu is entered.
@@ -910,35 +783,7 @@ class CustomControls:
             if showText is False:
                 # Change the background color for commandbutton and label on hovering (CSS)
                 def enterEventCustom_2(event):
-                    BorderColor = StyleMapping_Ribbon.ReturnStyleItem("Border_Color")
-                    if Parameters_Ribbon.CUSTOM_COLORS_ENABLED:
-                        BorderColor = Parameters_Ribbon.COLOR_BORDERS
-                    if Parameters_Ribbon.BORDER_TRANSPARANT:
-                        BorderColor = StyleMapping_Ribbon.ReturnStyleItem(
-                            "Background_Color_Hover"
-                        )
-                    StyleSheet_Addition_Arrow = (
-                        "QToolButton, QTextEdit { "
-                        + "background-color: "
-                        + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        + ";border: 0.5px solid"
-                        + BorderColor
-                        + ";border-radius: 2px"
-                        + ";margin: 0px"
-                        + ";spacing: 0px"
-                        + ";}"
-                    )
-                    StyleSheet_Addition_Button = (
-                        "QToolButton:hover {background-color: "
-                        + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-                        + ";border: none"
-                        + ";}"
-                    )
-                    btn.setStyleSheet(StyleSheet_Addition_Button)
-                    if ArrowButton.underMouse():
-                        ArrowButton.setStyleSheet(StyleSheet_Addition_Arrow)
-                    if Label_Text.underMouse():
-                        ArrowButton.setStyleSheet(StyleSheet_Addition_Arrow)
+                    StyleMapping_Ribbon.SetRibbonHover([ArrowButton], True)
 
                     if parent is not None:
                         # Set the value in the parent for detecting that the menu is entered.
@@ -952,20 +797,9 @@ class CustomControls:
                     enterEvent
                 )
 
-            # restore the stylesheets on leaving
+            # remove the highlight on leaving
             def leaveEventCustom(event):
-                StyleSheet = StyleMapping_Ribbon.ReturnStyleSheet(
-                    control="toolbutton",
-                    radius="2px",
-                )
-                StyleSheet_Addition = (
-                    "QToolButton, QToolButton:hover, QTextEdit, QTextEdit:hover {background-color: "
-                    + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-                    + ";border: none"
-                    + ";}"
-                )
-                Label_Text.setStyleSheet(StyleSheet + StyleSheet_Addition)
-                ArrowButton.setStyleSheet(StyleSheet + StyleSheet_Addition)
+                StyleMapping_Ribbon.SetRibbonHover([Label_Text, ArrowButton], False)
 
                 if parent is not None:
                     # If the menu is hidden, set the value in the parent for detecting that the menu is entered to False.
@@ -994,63 +828,16 @@ class CustomControls:
                 def mouseClickevent(event):
                     CommandButton.animateClick()
 
-                Label_Text.mousePressEvent = lambda mouseClick: mouseClickevent(
-                    mouseClick
-                )
                 ArrowButton.mousePressEvent = lambda mouseClick: mouseClickevent(
                     mouseClick
                 )
+                Label_Text.setClickTarget(CommandButton)
 
                 # Change the background color for commandbutton and label on hovering (CSS)
                 def enterEventCustom(event):
-                    BorderColor = StyleMapping_Ribbon.ReturnStyleItem("Border_Color")
-                    if Parameters_Ribbon.CUSTOM_COLORS_ENABLED:
-                        BorderColor = Parameters_Ribbon.COLOR_BORDERS
-                    if Parameters_Ribbon.BORDER_TRANSPARANT:
-                        BorderColor = StyleMapping_Ribbon.ReturnStyleItem(
-                            "Background_Color_Hover"
-                        )
-                    StyleSheet_Addition_Label = (
-                        "QToolButton, QTextEdit { "
-                        + "background-color: "
-                        + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        + ";border: 0.5px solid"
-                        + BorderColor
-                        + ";border-left: 0px solid"
-                        + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        + ";border-top-left-radius: 0px;border-bottom-left-radius: 0px;"
-                        + "border-top-right-radius: 2px;border-bottom-right-radius: 2px"
-                        + ";margin: 0px"
-                        + ";spacing: 0px"
-                        + ";}"
-                    )
-                    StyleSheet_Addition_Command = (
-                        "QToolButton, QTextEdit { "
-                        + "background-color: "
-                        + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        + ";border: 0.5px solid"
-                        + BorderColor
-                        + ";border-right: 0px solid"
-                        + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        + ";border-top-left-radius: 2px;border-bottom-left-radius: 2px;"
-                        + "border-top-right-radius: 0px;border-bottom-right-radius: 0px"
-                        + ";margin: 0px"
-                        + ";spacing: 0px"
-                        + ";}"
+                    StyleMapping_Ribbon.SetRibbonHover(
+                        [CommandButton, Label_Text], True
                     )
-                    StyleSheet_Addition_Button = (
-                        "QToolButton, QToolButton:hover {background-color: "
-                        + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-                        + ";border: none"
-                        + ";}"
-                    )
-                    btn.setStyleSheet(StyleSheet_Addition_Button)
-                    if CommandButton.underMouse():
-                        CommandButton.setStyleSheet(StyleSheet_Addition_Command)
-                        Label_Text.setStyleSheet(StyleSheet_Addition_Label)
-                    if Label_Text.underMouse():
-                        CommandButton.setStyleSheet(StyleSheet_Addition_Command)
-                        Label_Text.setStyleSheet(StyleSheet_Addition_Label)
 
                 Label_Text.enterEvent = lambda enterEvent: enterEventCustom(enterEvent)
                 CommandButton.enterEvent = lambda enterEvent: enterEventCustom(
@@ -1060,35 +847,7 @@ class CustomControls:
             if showText is False:
                 # Change the background color for commandbutton and label on hovering (CSS)
                 def enterEventCustom_2(event):
-                    BorderColor = StyleMapping_Ribbon.ReturnStyleItem("Border_Color")
-                    if Parameters_Ribbon.CUSTOM_COLORS_ENABLED:
-                        BorderColor = Parameters_Ribbon.COLOR_BORDERS
-                    if Parameters_Ribbon.BORDER_TRANSPARANT:
-                        BorderColor = StyleMapping_Ribbon.ReturnStyleItem(
-                            "Background_Color_Hover"
-                        )
-                    StyleSheet_Addition_Command = (
-                        "QToolButton, QTextEdit { "
-                        + "background-color: "
-                        + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        + ";border: 0.5px solid"
-                        + BorderColor
-                        + ";border-radius: 2px"
-                        + ";margin: 0px"
-                        + ";spacing: 0px"
-                        + ";}"
-                    )
-                    StyleSheet_Addition_Button = (
-                        "QToolButton, QToolButton:hover {background-color: "
-                        + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-                        + ";border: none"
-                        + ";}"
-                    )
-                    btn.setStyleSheet(StyleSheet_Addition_Button)
-                    if CommandButton.underMouse():
-                        CommandButton.setStyleSheet(StyleSheet_Addition_Command)
-                    if Label_Text.underMouse():
-                        CommandButton.setStyleSheet(StyleSheet_Addition_Command)
+                    StyleMapping_Ribbon.SetRibbonHover([CommandButton], True)
 
                 Label_Text.enterEvent = lambda enterEvent: enterEventCustom_2(
                     enterEvent
@@ -1097,20 +856,9 @@ class CustomControls:
                     enterEvent
                 )
 
-            # restore the stylesheets on leaving
+            # remove the highlight on leaving
             def leaveEventCustom(event):
-                StyleSheet = StyleMapping_Ribbon.ReturnStyleSheet(
-                    control="toolbutton",
-                    radius="2px",
-                )
-                StyleSheet_Addition = (
-                    "QToolButton, QToolButton:hover, QTextEdit, QTextEdit:hover {background-color: "
-                    + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-                    + ";border: none"
-                    + ";}"
-                )
-                Label_Text.setStyleSheet(StyleSheet + StyleSheet_Addition)
-                CommandButton.setStyleSheet(StyleSheet + StyleSheet_Addition)
+                StyleMapping_Ribbon.SetRibbonHover([CommandButton, Label_Text], False)
 
             Label_Text.leaveEvent = lambda leaveEvent: leaveEventCustom(leaveEvent)
             CommandButton.leaveEvent = lambda leaveEvent: leaveEventCustom(leaveEvent)
@@ -1128,58 +876,26 @@ class CustomControls:
 
         # Add the layout
         btn.setLayout(Layout)
-        # Set the stylesheet for the controls
-        StyleSheet = StyleMapping_Ribbon.ReturnStyleSheet(control="toolbutton")
-        StyleSheet_Addition_Label = (
-            "QToolButton, QTextEdit { "
-            + "background-color: "
-            + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-            + ";border: 0.5px solid"
-            + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-            + ";border-left: 0px solid"
-            + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-            + ";border-radius: 2px"
-            + ";margin: 0px"
-            + ";spacing: 0px"
-            + ";}"
-        )
-        StyleSheet_Addition_Command = (
-            "QToolButton, QTextEdit { "
-            + "background-color: "
-            + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-            + ";border: 0.5px solid"
-            + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-            + ";border-right: 0px solid"
-            + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-            + ";border-radius: 2px"
-            + ";margin: 0px"
-            + ";spacing: 0px"
-            + ";}"
-        )
-        StyleSheet_Addition_Arrow = (
-            "QToolButton, QTextEdit { "
-            + "background-color: "
-            + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-            + ";border: 0.5px solid"
-            + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-            + ";border-left: 0px solid"
-            + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-            + ";border-radius: 2px"
-            + ";margin: 0px"
-            + ";spacing: 0px"
-            + ";}"
-        )
-        StyleSheet_Addition_button = (
-            "QToolButton, QToolButton:hover, QTextEdit, QTextEdit:hover {background-color: "
-            + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-            + ";border: 0px solid"
-            + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-            + ";}"
-        )
-        CommandButton.setStyleSheet(StyleSheet_Addition_Command + StyleSheet)
-        ArrowButton.setStyleSheet(StyleSheet_Addition_Arrow + StyleSheet)
-        Label_Text.setStyleSheet(StyleSheet_Addition_Label + StyleSheet)
-        btn.setStyleSheet(StyleSheet_Addition_button + StyleSheet)
+        # Set the properties for the ribbon stylesheet
+        StyleMapping_Ribbon.SetRibbonRole(btn, "button")
+        if Menu is not None and len(Menu.actions()) > 1:
+            ArrowPart = "second"
+            if showText is False:
+                ArrowPart = "single"
+            StyleMapping_Ribbon.SetRibbonRole(
+                CommandButton, "command", "small", "first"
+            )
+            StyleMapping_Ribbon.SetRibbonRole(Label_Text, "label", "small", "first")
+            StyleMapping_Ribbon.SetRibbonRole(ArrowButton, "arrow", "small", ArrowPart)
+        else:
+            CommandPart = "first"
+            if showText is False:
+                CommandPart = "single"
+            StyleMapping_Ribbon.SetRibbonRole(
+                CommandButton, "command", "small", CommandPart
+            )
+            StyleMapping_Ribbon.SetRibbonRole(Label_Text, "label", "small", "second")
+            StyleMapping_Ribbon.SetRibbonRole(ArrowButton, "arrow", "small", "second")
 
         # Set the correct dimensions
         btn.setFixedWidth(CommandButton.width() + MenuButtonSpace + TextWidth)
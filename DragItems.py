@@ -437,6 +437,8 @@ class ModernMenu(RibbonBar):
                 + ";}"
             )
             StyleSheet = StyleSheet_Addition_2 + StyleSheet + StyleSheet_Addition
+        # add the stylesheet for the custom buttons
+        StyleSheet = StyleSheet + StyleMapping_Ribbon.ReturnRibbonStyleSheet()
         self.setStyleSheet(StyleSheet)
 
         # If the text for the tabs is set to be disabled, update the stylesheet
@@ -1828,16 +1830,8 @@ class ModernMenu(RibbonBar):
                                 pass
 
                             # Set the background always to background color.
-                            # Styling is managed in the custom button class
-                            StyleSheet_Addition_Button = (
-                                "QToolButton, QToolButton:hover {background-color: "
-                                + StyleMapping_Ribbon.ReturnStyleItem(
-                                    "Background_Color"
-                                )
-                                + ";border: none"
-                                + ";}"
-                            )
-                            btn.setStyleSheet(StyleSheet_Addition_Button)
+                            # Styling is managed by the ribbon stylesheet
+                            StyleMapping_Ribbon.SetRibbonRole(btn, "button")
 
                             # add the button text to the shadowList for checking if buttons are already there.
                             shadowList.append(button.text())
@@ -102,9 +102,15 @@ import LoadLicenseForm_Ribbon
 import Standard_Functions_RIbbon as StandardFunctions
 from Standard_Functions_RIbbon import CommandInfoCorrections
 import Serialize_Ribbon
+import IconStore_Ribbon
+import Catalog_Ribbon
+import LayoutPlanner_Ribbon
+import UpdateCheck_Ribbon
+import Tracing_Ribbon
 import StyleMapping_Ribbon
 import platform
-import math
+import time
+from collections import OrderedDict
 
 # import Ribbon. This contains the ribbon commands for FreeCAD
 import Ribbon
@@ -162,6 +168,8 @@ class ModernMenu(RibbonBar):
     ribbonStructure = {}
     wbNameMapping = {}
     isWbLoaded = {}
+    # Hash of the ribbon structure for the layout plan cache
+    StructureHash = ""
     MainWindowLoaded = False
     LeaveEventEnabled = True
 
@@ -195,9 +203,8 @@ class ModernMenu(RibbonBar):
     # Create the list for the commands
     List_Commands = []
 
-    # Create the lists for the deserialized icons
-    List_CommandIcons = []
-    List_WorkBenchIcons = []
+    # The shared catalog with the commands and icons
+    Catalog: Catalog_Ribbon.CommandCatalog = None
 
     # Declare the custom overlay function states
     OverlayToggled = False
@@ -215,6 +222,27 @@ class ModernMenu(RibbonBar):
     # Define the versions for update and developments
     UpdateVersion = ""
     DeveloperVersion = ""
+    # The background check for a new version
+    UpdateChecker = None
+
+    # Building the tabs in the background when FreeCAD is idle
+    PrebuildTimer = None
+    # The panel builder of the tab that is partly build, and the name of that tab
+    PrebuildBuilder = None
+    PrebuildTabName = ""
+    # Tabs that failed to build in the background. These are build when they are activated
+    PrebuildFailed = set()
+
+    # The version of the theme that is applied to the tab bar
+    TabBarThemeVersion = 0
+
+    # The built tabs with their statistics, from least to most recently used
+    BuiltTabs = OrderedDict()
+    # Proxy actions per command and workbench. These are reused when a tab is build again
+    ProxyActions = {}
+    # Tabs that are build with proxy actions, because their workbench was not loaded.
+    # These are build again when their workbench is activated
+    ProxyTabs = set()
 
     # Define a boolan to detect if an menu is entered.
     # used to keep the ribbon unfolded, when clicking on a dropdown menu
@@ -227,6 +255,7 @@ class ModernMenu(RibbonBar):
     # Used for a message when a datafile update is needed.
     LayoutMenuShortCut = ""
 
+    @Tracing_Ribbon.Traced("ModernMenu.__init__")
     def __init__(self):
         """
         Constructor
@@ -238,22 +267,26 @@ class ModernMenu(RibbonBar):
         self.connectSignals()
 
         # read ribbon structure from JSON file
-        with open(Parameters_Ribbon.RIBBON_STRUCTURE_JSON, "r") as file:
-            self.ribbonStructure.update(json.load(file))
-        file.close()
-
-        DataFile2 = os.path.join(os.path.dirname(__file__), "RibbonDataFile2.dat")
-        if os.path.exists(DataFile2) is True:
-            Data = {}
-            # read ribbon structure from JSON file
-            with open(DataFile2, "r") as file:
-                Data.update(json.load(file))
+        with Tracing_Ribbon.Span("ModernMenu: read RibbonStructure.json"):
+            with open(Parameters_Ribbon.RIBBON_STRUCTURE_JSON, "r") as file:
+                JsonText = file.read()
             file.close()
-            try:
-                # Load the list of commands
-                self.List_Commands = Data["List_Commands"]
-            except Exception:
-                pass
+            self.ribbonStructure.update(json.loads(JsonText))
+            # Keep the data as stored, to write the file only when something is changed
+            StoredRibbonStructure = json.loads(JsonText)
+
+        # Get the catalog with the commands and icons. This is shared with the layout dialog
+        Span = Tracing_Ribbon.Begin("ModernMenu: load catalog")
+        try:
+            self.Catalog = Catalog_Ribbon.ReturnCatalog()
+            # Load the list of commands
+            self.List_Commands = self.Catalog.List_Commands
+        except Exception as e:
+            if Parameters_Ribbon.DEBUG_MODE is True:
+                StandardFunctions.Print(f"{e.with_traceback(e.__traceback__)}", "Warning")
+            # Use an empty catalog
+            self.Catalog = Catalog_Ribbon.CommandCatalog(DataFile="", DataFile2="")
+        Tracing_Ribbon.End(Span)
 
         # check the language and remove texts from the ribbonstructure if the language does not match
         self.CheckLanguage()
@@ -391,11 +424,10 @@ class ModernMenu(RibbonBar):
             if ViewsRibbon_Inlist is False:
                 ListIgnoredToolbars.append("Views - Ribbon")
         self.ribbonStructure["ignoredToolbars"] = ListIgnoredToolbars
-        # write the change to the json file
-        # Writing to sample.json
-        with open(Parameters_Ribbon.RIBBON_STRUCTURE_JSON, "w") as outfile:
-            json.dump(self.ribbonStructure, outfile, indent=4)
-        outfile.close()
+        # write the change to the json file, if there is any
+        StandardFunctions.WriteJsonFile(
+            self.ribbonStructure, Parameters_Ribbon.RIBBON_STRUCTURE_JSON, StoredRibbonStructure
+        )
 
         # Get the address of the repository address
         PackageXML = os.path.join(os.path.dirname(__file__), "package.xml")
@@ -403,81 +435,17 @@ class ModernMenu(RibbonBar):
         if self.ReproAdress != "" or self.ReproAdress is not None:
             print(translate("FreeCAD Ribbon", "FreeCAD Ribbon: ") + self.ReproAdress)
 
-        # Activate the workbenches used in the new panels otherwise the panel stays empty
-        try:
-            if "newPanels" in self.ribbonStructure:
-                for WorkBenchName in self.ribbonStructure["newPanels"]:
-                    for NewPanel in self.ribbonStructure["newPanels"][WorkBenchName]:
-                        # Get the commands from the custom panel
-                        Commands = self.ribbonStructure["newPanels"][WorkBenchName][NewPanel]
-
-                        # Get the command and its original toolbar
-                        for CommandItem in Commands:
-                            if (
-                                CommandItem[1] != "General"
-                                and CommandItem[1] != "Global"
-                                and CommandItem[1] != "Standard"
-                            ):
-                                # Activate the workbench if not loaded
-                                Gui.activateWorkbench(CommandItem[1])
-        except Exception as e:
-            if Parameters_Ribbon.DEBUG_MODE is True:
-                StandardFunctions.Print(
-                    f"new panels have wrong format. Please create them again!\n{e}",
-                    "Error",
-                )
-            pass
+        # The workbenches used in the new panels, dropdown buttons and quick access commands are not activated here.
+        # Their commands are shown with proxy actions, which activate the workbench when they are triggered.
+        # See ReturnProxyAction.
 
-        # Activate the workbenches used in the dropdown buttons otherwise the button stays empty
+        # Check if you are on a developer version. If so set developer version
         try:
-            if "dropdownButtons" in self.ribbonStructure:
-                for DropDownCommand, Commands in self.ribbonStructure["dropdownButtons"].items():
-                    for CommandItem in Commands:
-                        if CommandItem[1] != "General" and CommandItem[1] != "Global" and CommandItem[1] != "Standard":
-                            # Activate the workbench if not loaded
-                            Gui.activateWorkbench(CommandItem[1])
-        except Exception as e:
-            if Parameters_Ribbon.DEBUG_MODE is True:
-                StandardFunctions.Print(
-                    f"dropdownbuttons have wrong format. Please create them again!\n{e}",
-                    "Warning",
-                )
-            pass
-
-        # Check if there is a new version
-        # Get the latest version
-        try:
-            User = "APEbbers"
-            Repo = "FreeCAD-Ribbon"
-            Branch = "main"
-            File = "package.xml"
-            ElementName = "version"
-            LatestVersion = StandardFunctions.ReturnXML_Value_Git(User, Repo, Branch, File, ElementName)
-            if LatestVersion is not None:
-                # Get the current version
-                PackageXML = os.path.join(os.path.dirname(__file__), "package.xml")
-                CurrentVersion = StandardFunctions.ReturnXML_Value(PackageXML, "version")
-                # Check if you are on a developer version. If so set developer version
-                if CurrentVersion.lower().endswith("x"):
-                    self.DeveloperVersion = CurrentVersion
-                    self.UpdateVersion = ""
-                # If you are not on a developer version, check if you have the latest version
-                if CurrentVersion.lower().endswith("x") is False:
-                    # Create arrays from the versions
-                    LatestVersionArray = LatestVersion.split(".")
-                    CurrentVersionArray = CurrentVersion.split(".")
-
-                    # Set the length to the shortest lenght
-                    ArrayLenght = len(LatestVersionArray)
-                    if len(CurrentVersionArray) < ArrayLenght:
-                        ArrayLenght = len(CurrentVersionArray)
-
-                    # Check per level if the latest version has the highest number
-                    # if so set update version
-                    for i in range(ArrayLenght):
-                        if LatestVersionArray[i] > CurrentVersionArray[i]:
-                            print(f"{LatestVersionArray[i]}, {CurrentVersionArray[i]}")
-                            self.UpdateVersion = LatestVersion
+            PackageXML = os.path.join(os.path.dirname(__file__), "package.xml")
+            CurrentVersion = StandardFunctions.ReturnXML_Value(PackageXML, "version")
+            if CurrentVersion.lower().endswith("x"):
+                self.DeveloperVersion = CurrentVersion
+                self.UpdateVersion = ""
         except Exception:
             pass
 
@@ -485,6 +453,14 @@ class ModernMenu(RibbonBar):
         self.CreateMenus()  # Create the menus
         self.createModernMenu()  # Create the ribbon
 
+        # Check if there is a new version. This is done on a background thread after the ribbon is shown,
+        # so a slow or missing internet connection does not block the startup.
+        if self.DeveloperVersion == "":
+            QTimer.singleShot(0, self.StartUpdateCheck)
+
+        # Build the tabs of the loaded workbenches when FreeCAD is idle
+        self.SchedulePrebuild(2000)
+
         # Set the custom stylesheet
         StyleSheet = Path(Parameters_Ribbon.STYLESHEET).read_text()
         # modify the stylesheet to set the border and background for a toolbar and menu
@@ -551,6 +527,8 @@ class ModernMenu(RibbonBar):
             + "px;}"
         )
         StyleSheet = StyleSheet + StyleSheet_Addition_5
+        # add the stylesheet for the custom buttons. These are styled with properties instead of their own stylesheet
+        StyleSheet = StyleSheet + StyleMapping_Ribbon.ReturnRibbonStyleSheet()
         self.setStyleSheet(StyleSheet)
 
         # get the state of the mainwindow
@@ -803,6 +781,7 @@ class ModernMenu(RibbonBar):
         mw.workbenchActivated.disconnect(self.onWbActivated)
         return
 
+    @Tracing_Ribbon.Traced("createModernMenu")
     def createModernMenu(self):
         """
         Create menu tabs.
@@ -855,18 +834,17 @@ class ModernMenu(RibbonBar):
             try:
                 # If it is a standard freecad button, set the command accordingly
                 if commandName.endswith("_ddb") is False:
+                    # Check if the workbench is loaded. If not, actions will be an empty list
+                    QuickAction = []
                     try:
-                        # Check if the workbench is loaded. If not, actions will be an empty list
-                        # Find the command its workbench and activate it
-                        QuickAction = Gui.Command.get(commandName).getAction()
-                        if len(QuickAction) == 0:
-                            for CommandItem in self.List_Commands:
-                                if CommandItem[0] == commandName:
-                                    Gui.activateWorkbench(CommandItem[3])
-                                    break
+                        Command = Gui.Command.get(commandName)
+                        if Command is not None:
+                            QuickAction = Command.getAction()
                     except Exception:
                         pass
-                    QuickAction = Gui.Command.get(commandName).getAction()
+                    # If the workbench is not loaded, use a proxy action from the data file
+                    if len(QuickAction) == 0 and self.Catalog.ReturnCommand(commandName) is not None:
+                        QuickAction = [self.ReturnProxyAction(commandName)]
 
                     if len(QuickAction) == 1:
                         button.setDefaultAction(QuickAction[0])
@@ -951,6 +929,8 @@ class ModernMenu(RibbonBar):
 
         self.tabBar().setIconSize(QSize(self.TabBar_Size - 6, self.TabBar_Size - 6))
         self.tabBar().setStyleSheet("margin: 0px;padding: 0px;height: " + str(self.TabBar_Size) + ";")
+        # The theme colors are applied again in onWbActivated
+        self.TabBarThemeVersion = 0
 
         # Correct colors when no stylesheet is selected for FreeCAD.
         self.quickAccessToolBar().setStyleSheet("")
@@ -1322,6 +1302,269 @@ class ModernMenu(RibbonBar):
 
         return
 
+    def StartUpdateCheck(self):
+        self.UpdateChecker = UpdateCheck_Ribbon.UpdateChecker(self)
+        self.UpdateChecker.Finished.connect(self.on_UpdateCheck_Finished)
+        self.UpdateChecker.start()
+        return
+
+    def on_UpdateCheck_Finished(self, LatestVersion: str):
+        if LatestVersion == "" or self.DeveloperVersion != "":
+            return
+
+        # Get the current version
+        PackageXML = os.path.join(os.path.dirname(__file__), "package.xml")
+        CurrentVersion = StandardFunctions.ReturnXML_Value(PackageXML, "version")
+
+        # Create arrays from the versions
+        LatestVersionArray = LatestVersion.split(".")
+        CurrentVersionArray = CurrentVersion.split(".")
+
+        # Set the length to the shortest lenght
+        ArrayLenght = len(LatestVersionArray)
+        if len(CurrentVersionArray) < ArrayLenght:
+            ArrayLenght = len(CurrentVersionArray)
+
+        # Check per level if the latest version has the highest number
+        # if so set update version
+        UpdateVersion = ""
+        for i in range(ArrayLenght):
+            if LatestVersionArray[i] > CurrentVersionArray[i]:
+                UpdateVersion = LatestVersion
+
+        # Update the application menu to show the "Update available" button
+        if UpdateVersion != self.UpdateVersion:
+            self.UpdateVersion = UpdateVersion
+            self.ApplicationMenus()
+        return
+
+    # region - Build tabs in the background
+    def SchedulePrebuild(self, Delay: int = 1000):
+        """_summary_
+        Starts building the tabs when FreeCAD is idle.
+        A timer with interval 0 is used. Its timeout is only handled when there are no other events,
+        so user input goes first.
+
+        Args:
+            Delay (int, optional): Time in ms before starting. Defaults to 1000.
+        """
+        if Parameters_Ribbon.PREBUILD_TABS is False:
+            return
+
+        if self.PrebuildTimer is None:
+            self.PrebuildTimer = QTimer(self)
+            self.PrebuildTimer.setInterval(0)
+            self.PrebuildTimer.timeout.connect(self.PrebuildTick)
+        if self.PrebuildTimer.isActive() is False:
+            QTimer.singleShot(Delay, self.PrebuildTimer.start)
+        return
+
+    def PrebuildTick(self):
+        """Builds panels until the time budget is used. At least one panel is build per call."""
+        # Wait while the user is busy with a menu, a dialog or the mouse
+        if (
+            QApplication.activePopupWidget() is not None
+            or QApplication.activeModalWidget() is not None
+            or QApplication.mouseButtons() != Qt.MouseButton.NoButton
+        ):
+            self.PrebuildTimer.stop()
+            self.SchedulePrebuild(500)
+            return
+
+        Deadline = time.perf_counter() + Parameters_Ribbon.PREBUILD_BUDGET / 1000
+        while True:
+            if self.PrebuildBuilder is None:
+                TabIndex = self.ReturnPrebuildTab()
+                # If all tabs are build, stop.
+                # The prebuild is scheduled again when a workbench is activated.
+                if TabIndex < 0:
+                    self.PrebuildTimer.stop()
+                    if Parameters_Ribbon.DEBUG_MODE is True:
+                        self.PrintCategoryStats()
+                    # Export the spans of the prebuild. (Only when tracing is enabled)
+                    Tracing_Ribbon.Export(Tracing_Ribbon.TRACE_FILE_PANELS, "panel trace")
+                    return
+                self.PrebuildTabName = self.tabBar().tabText(TabIndex)
+                self.PrebuildBuilder = self.ReturnPanelBuilder(TabIndex)
+
+            try:
+                with Tracing_Ribbon.Span(f"prebuild: {self.PrebuildTabName}", "prebuild"):
+                    next(self.PrebuildBuilder)
+            except StopIteration:
+                # A tab build in the background is not used yet. Make it the first to remove
+                if self.PrebuildTabName in self.BuiltTabs:
+                    self.BuiltTabs.move_to_end(self.PrebuildTabName, last=False)
+                # If toolbars were missing, the tab is not loaded. Do not try it again
+                if self.isWbLoaded.get(self.PrebuildTabName, False) is False:
+                    self.PrebuildFailed.add(self.PrebuildTabName)
+                self.PrebuildBuilder = None
+                self.PrebuildTabName = ""
+            except Exception as e:
+                # Do not try this tab again. It will be build when it is activated
+                if Parameters_Ribbon.DEBUG_MODE is True:
+                    StandardFunctions.Print(f"{e.with_traceback(e.__traceback__)}", "Warning")
+                self.PrebuildFailed.add(self.PrebuildTabName)
+                self.PrebuildBuilder = None
+                self.PrebuildTabName = ""
+
+            if time.perf_counter() >= Deadline:
+                return
+
+    def ReturnPrebuildTab(self) -> int:
+        """_summary_
+        Returns the index of the next tab to build in the background.
+        Loading a workbench would block FreeCAD. Tabs of workbenches that are not loaded,
+        are build with proxy actions from the data file. See ReturnPanelBuilder.
+
+        Returns:
+            int: the tab index or -1 if there is no tab to build.
+        """
+        # Do not build more tabs than allowed
+        if Parameters_Ribbon.MAX_BUILT_TABS > 0 and len(self.BuiltTabs) >= Parameters_Ribbon.MAX_BUILT_TABS:
+            return -1
+
+        TabIndexes = []
+        for TabIndex in range(self.tabBar().count()):
+            TabName = self.tabBar().tabText(TabIndex)
+            WorkBenchName = self.tabBar().tabData(TabIndex)
+            if TabName == "" or WorkBenchName is None:
+                continue
+            if self.isWbLoaded.get(TabName, False) is True or TabName in self.PrebuildFailed:
+                continue
+            # Tabs that are build with proxy actions are build again when their workbench is activated
+            if TabName in self.ProxyTabs:
+                continue
+            # A workbench that is not loaded, can only be build when it is in the data file
+            try:
+                if (
+                    hasattr(Gui.getWorkbench(WorkBenchName), "__Workbench__") is False
+                    and self.Catalog.ReturnWorkbench(WorkBenchName) is None
+                ):
+                    continue
+            except Exception:
+                continue
+            TabIndexes.append(TabIndex)
+
+        if len(TabIndexes) == 0:
+            return -1
+        # Build the most used tabs first. The sort is stable, so equal tabs stay in the tab order
+        if Parameters_Ribbon.PREBUILD_ORDER == "MostUsed":
+            TabUsage = Parameters_Ribbon.preferences.GetGroup("TabUsage")
+            TabIndexes.sort(key=lambda TabIndex: -TabUsage.GetInt(self.tabBar().tabData(TabIndex)))
+        return TabIndexes[0]
+
+    def EvictCategories(self, KeepTab: str = ""):
+        """_summary_
+        Removes the panels of the least recently used tabs, when there are more built tabs than allowed.
+        The tabs are build again when they are activated.
+
+        Args:
+            KeepTab (str, optional): A tab that must not be removed. Defaults to "".
+        """
+        if Parameters_Ribbon.MAX_BUILT_TABS <= 0:
+            return
+
+        while len(self.BuiltTabs) > Parameters_Ribbon.MAX_BUILT_TABS:
+            TabName = ""
+            for BuiltTab in self.BuiltTabs:
+                if BuiltTab != KeepTab and BuiltTab != self.tabBar().tabText(self.tabBar().currentIndex()):
+                    TabName = BuiltTab
+                    break
+            if TabName == "":
+                break
+
+            Stats = self.BuiltTabs.pop(TabName)
+            self.ClearCategory(TabName)
+            if Parameters_Ribbon.DEBUG_MODE is True:
+                StandardFunctions.Print(
+                    f"Ribbon UI: removed the panels of '{TabName}' ({Stats['QObjects']} objects, "
+                    f"{Stats['Memory'] / 1048576:.1f} MB)",
+                    "Log",
+                )
+        return
+
+    def ClearCategory(self, TabName: str):
+        """Deletes the panels of a tab and marks the tab as not loaded"""
+        try:
+            category = self.category(TabName)
+        except KeyError:
+            return
+
+        # Remove the panels and separators from the category
+        Layout = category._categoryLayout
+        while Layout.count() > 0:
+            Item = Layout.takeAt(0)
+            Widget = Item.widget()
+            if Widget is not None:
+                Widget.hide()
+                Widget.deleteLater()
+        category.panels().clear()
+
+        self.isWbLoaded[TabName] = False
+        self.ProxyTabs.discard(TabName)
+        return
+
+    def ReplaceProxyTab(self, TabName: str):
+        """_summary_
+        Builds a tab that was build with proxy actions again, with the actions of its loaded workbench.
+
+        Args:
+            TabName (str): The name of the tab.
+        """
+        if TabName not in self.ProxyTabs:
+            return
+
+        for TabIndex in range(self.tabBar().count()):
+            if self.tabBar().tabText(TabIndex) == TabName:
+                self.ClearCategory(TabName)
+                self.BuiltTabs.pop(TabName, None)
+                self.buildPanels(TabIndex)
+                break
+        return
+
+    def ReturnCategoryStats(self, category, MemoryBefore: int = -1) -> dict:
+        """_summary_
+        Returns the number of QObjects and the memory used by a tab.
+
+        Args:
+            category (RibbonCategory): The category of the tab.
+            MemoryBefore (int, optional): The process memory before the tab was build. Defaults to -1 (unknown).
+
+        Returns:
+            dict: {"QObjects": int, "Memory": bytes, -1 if unknown}
+        """
+        Memory = -1
+        MemoryAfter = StandardFunctions.ReturnProcessMemory()
+        if MemoryBefore >= 0 and MemoryAfter >= 0:
+            Memory = max(MemoryAfter - MemoryBefore, 0)
+        return {"QObjects": len(category.findChildren(QObject)), "Memory": Memory}
+
+    def PrintCategoryStats(self):
+        """Prints the number of QObjects and the memory per built tab in the report view"""
+        Lines = [
+            "Ribbon UI: built tabs, from least to most recently used",
+            f"{'tab':<40}{'QObjects':>10}{'memory (MB)':>14}",
+        ]
+        for TabName, Stats in self.BuiltTabs.items():
+            Memory = "n/a"
+            if Stats["Memory"] >= 0:
+                Memory = f"{Stats['Memory'] / 1048576:.1f}"
+            Lines.append(f"{TabName[:39]:<40}{Stats['QObjects']:>10}{Memory:>14}")
+        StandardFunctions.Print("\n".join(Lines))
+        return
+
+    def AddTabUsage(self, WorkBenchName: str):
+        """Counts how often a workbench is activated. Used for the order of building tabs in the background"""
+        try:
+            TabUsage = Parameters_Ribbon.preferences.GetGroup("TabUsage")
+            TabUsage.SetInt(WorkBenchName, TabUsage.GetInt(WorkBenchName) + 1)
+        except Exception:
+            pass
+        return
+
+    # endregion
+
+    @Tracing_Ribbon.Traced("CreateMenus")
     def CreateMenus(self):
         MenuBar = mw.menuBar()
 
@@ -1698,13 +1941,7 @@ class ModernMenu(RibbonBar):
             self.hideClassicToolbars()
         return
 
-    def onWbActivated(self):
-        if len(mw.findChildren(QDockWidget, "Ribbon")) > 0:
-            if Parameters_Ribbon.AUTOHIDE_RIBBON is False:
-                self.UnfoldRibbon()
-            # else:
-            #     self.FoldRibbon(True)
-
+    def setTabBarStyleSheet(self):
         # Set the text color depending in tabstyle
         if Parameters_Ribbon.TABBAR_STYLE != 1:
             self.tabBar().setStyleSheet(
@@ -1724,6 +1961,24 @@ class ModernMenu(RibbonBar):
                 + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
                 + """;}"""
             )
+        return
+
+    def onWbActivated(self):
+        # The workbench can add commands and create their actions. Clear the cached command info first,
+        # because this slot is connected before the slot of the cache and runs first.
+        StandardFunctions.OnWorkbenchActivated()
+
+        if len(mw.findChildren(QDockWidget, "Ribbon")) > 0:
+            if Parameters_Ribbon.AUTOHIDE_RIBBON is False:
+                self.UnfoldRibbon()
+            # else:
+            #     self.FoldRibbon(True)
+
+        # Set the text color depending in tabstyle. Only needed when the theme has changed
+        ThemeVersion = StyleMapping_Ribbon.ReturnThemeVersion()
+        if ThemeVersion != self.TabBarThemeVersion:
+            self.TabBarThemeVersion = ThemeVersion
+            self.setTabBarStyleSheet()
 
         # ensure that workbench is already loaded
         workbench = Gui.activeWorkbench()
@@ -1747,6 +2002,16 @@ class ModernMenu(RibbonBar):
         # create panels. Do this after updateCurrentTab.
         # Otherwise, the sketcher workbench won;t be loaded properly the first time
         self.buildPanels()
+
+        # If the tab was build with proxy actions, build it again with the actions of the workbench.
+        # This is done after the tab is shown, so the tab is shown with the proxy actions first
+        TabName = self.tabBar().tabText(self.tabBar().currentIndex())
+        if TabName in self.ProxyTabs:
+            QTimer.singleShot(0, lambda: self.ReplaceProxyTab(TabName))
+
+        # Count the activation and build the tabs of other loaded workbenches when FreeCAD is idle
+        self.AddTabUsage(workbench.name())
+        self.SchedulePrebuild()
         return
 
     def onTabBarClicked(self):
@@ -1760,11 +2025,55 @@ class ModernMenu(RibbonBar):
     def ToggleApplicationButton(self):
         self.applicationOptionButton().showMenu()
 
-    def buildPanels(self):
-        # Get the active workbench and get its name
+    @Tracing_Ribbon.Traced("buildPanels")
+    def buildPanels(self, TabIndex: int = -1):
+        """_summary_
+        Builds the panels of a tab, if not already done.
+
+        Args:
+            TabIndex (int, optional): The index of the tab. Defaults to the current tab.
+        """
+        if TabIndex < 0:
+            TabIndex = self.tabBar().currentIndex()
+        TabName = self.tabBar().tabText(TabIndex)
+        IsBuilt = self.isWbLoaded.get(TabName, False)
+
+        # If this tab is partly build in the background, finish it
+        Builder = None
+        if self.PrebuildBuilder is not None and self.PrebuildTabName == self.tabBar().tabText(TabIndex):
+            Builder = self.PrebuildBuilder
+            self.PrebuildBuilder = None
+            self.PrebuildTabName = ""
+        else:
+            Builder = self.ReturnPanelBuilder(TabIndex)
+        for toolbar in Builder:
+            pass
+
+        # Mark the tab as most recently used and remove the least recently used tabs
+        if TabName in self.BuiltTabs:
+            self.BuiltTabs.move_to_end(TabName)
+        self.EvictCategories(TabName)
+
+        # Report the memory and QObjects per tab, when a tab was build
+        if Parameters_Ribbon.DEBUG_MODE is True and IsBuilt is False:
+            self.PrintCategoryStats()
+        # Export the spans of the tab, after the span of this function has ended. (Only when tracing is enabled)
+        if IsBuilt is False:
+            QTimer.singleShot(0, lambda: Tracing_Ribbon.Export(Tracing_Ribbon.TRACE_FILE_PANELS, "panel trace"))
+        return
+
+    def ReturnPanelBuilder(self, TabIndex: int):
+        """_summary_
+        Returns a generator that builds the panels of a tab. It yields after each panel,
+        so the panels can be build in small steps when FreeCAD is idle.
+
+        Args:
+            TabIndex (int): The index of the tab.
+        """
+        # Get the workbench of the tab and get its name
         #
-        workbenchTitle = self.tabBar().tabText(self.tabBar().currentIndex())
-        workbenchName = self.tabBar().tabData(self.tabBar().currentIndex())
+        workbenchTitle = self.tabBar().tabText(TabIndex)
+        workbenchName = self.tabBar().tabData(TabIndex)
         if workbenchName is None:
             return
 
@@ -1774,8 +2083,19 @@ class ModernMenu(RibbonBar):
             return
 
         workbench = Gui.getWorkbench(workbenchName)
-        # Get the list of toolbars from the active workbench
-        ListToolbars: list = workbench.listToolbars()
+        # A workbench that is not loaded has no toolbars yet. Loading it would block FreeCAD.
+        # Use the toolbars from the data file instead and create the buttons with proxy actions
+        IsLoaded = hasattr(workbench, "__Workbench__")
+        if IsLoaded is True:
+            # Get the list of toolbars from the active workbench
+            ListToolbars: list = workbench.listToolbars()
+        else:
+            WorkbenchItem = self.Catalog.ReturnWorkbench(workbenchName)
+            if WorkbenchItem is None:
+                return
+            ListToolbars: list = list(WorkbenchItem[3])
+        # The toolbars of the workbench itself. If one of these is missing, the tab is not complete
+        WorkbenchToolbars = set(ListToolbars)
         # Get custom toolbars that are created in the toolbar environment and add them to the list of toolbars
         CustomToolbars = self.List_ReturnCustomToolbars()
         for CustomToolbar in CustomToolbars:
@@ -1786,71 +2106,40 @@ class ModernMenu(RibbonBar):
         for CustomToolbar in CustomToolbars_Global:
             ListToolbars.append(CustomToolbar[0])
 
-        # Get the custom panels and add them to the list of toolbars
-        try:
-            if workbenchName in self.ribbonStructure["customToolbars"]:
-                for CustomPanel in self.ribbonStructure["customToolbars"][workbenchName]:
-                    ListToolbars.append(CustomPanel)
-
-                    # remove the original toolbars from the list
-                    Commands = self.ribbonStructure["customToolbars"][workbenchName][CustomPanel]["commands"]
-                    for Command in Commands:
-                        try:
-                            OriginalToolbar = self.ribbonStructure["customToolbars"][workbenchName][CustomPanel][
-                                "commands"
-                            ][Command]
-                            ListToolbars.remove(OriginalToolbar)
-                        except Exception:
-                            continue
-        except Exception as e:
-            if Parameters_Ribbon.DEBUG_MODE is True:
-                StandardFunctions.Print(f"{e}, 1", "Warning")
-            pass
-
-        # Add the new panels to the toolbar list
-        try:
-            for WorkBenchItem in self.ribbonStructure["newPanels"]:
-                if WorkBenchItem == workbenchName or WorkBenchItem == "Global":
-                    for Panel in self.ribbonStructure["newPanels"][WorkBenchItem]:
-                        ListToolbars.append(Panel)
-        except Exception:
-            pass
+        # The layout is planned without Qt, the widgets are created here from the plan. See LayoutPlanner_Ribbon.py
+        if self.StructureHash == "":
+            self.StructureHash = LayoutPlanner_Ribbon.ReturnStructureHash(self.ribbonStructure)
+        LayoutSettings = LayoutPlanner_Ribbon.ReturnSettings()
+        # Add the custom panels and new panels and sort the toolbars
+        ListToolbars = LayoutPlanner_Ribbon.ReturnToolbars(
+            self.ribbonStructure, workbenchName, ListToolbars, LayoutSettings
+        )
 
+        # The category of the tab
         try:
-            # Get the order of toolbars
-            ToolbarOrder: list = self.ribbonStructure["workbenches"][workbenchName]["toolbars"]["order"]
-
-            # Sort the list of toolbars according the toolbar order
-            def SortToolbars(toolbar):
-                if toolbar == "":
-                    return -1
-
-                position = None
-                try:
-                    position = ToolbarOrder.index(toolbar) + 1
-                except ValueError:
-                    position = 999999
-                    if toolbar.endswith("_custom") or toolbar.endswith("_newPanel"):
-                        if Parameters_Ribbon.DEFAULT_PANEL_POSITION_CUSTOM == "Right":
-                            position = 999999
-                        else:
-                            position = 0
-                return position
-
-            ListToolbars.sort(key=SortToolbars)
-        except Exception:
-            pass
-
+            category = self.category(tabName)
+        except KeyError:
+            return
+        # Remove the panels of a previous build that was not complete, to avoid double panels
+        if len(category.panels()) > 0:
+            self.ClearCategory(tabName)
+        # Measure the memory that is used by the tab
+        MemoryBefore = StandardFunctions.ReturnProcessMemory()
+
+        # Trace the time per panel. The span of the previous panel is ended at the start of the next one,
+        # so it is also ended when a panel is skipped with "continue"
+        PanelSpan = None
+        ToolbarsMissing = False
         # If the toolbar must be ignored, skip it
         for toolbar in ListToolbars:
-            if toolbar in self.ribbonStructure["ignoredToolbars"]:
-                continue
-            if toolbar == "":
+            Tracing_Ribbon.End(PanelSpan)
+            PanelSpan = Tracing_Ribbon.Begin(f"panel: {toolbar}", "panel", Workbench=workbenchName)
+            if LayoutPlanner_Ribbon.IsIgnored(self.ribbonStructure, toolbar) is True:
                 continue
 
             # Create the panel, use the toolbar name as title
             title = StandardFunctions.TranslationsMapping(workbenchName, toolbar)
-            panel: RibbonPanel = self.currentCategory().addPanel(
+            panel: RibbonPanel = category.addPanel(
                 title=title,
                 showPanelOptionButton=True,
             )
@@ -1858,16 +2147,17 @@ class ModernMenu(RibbonBar):
 
             # get list of all buttons in toolbar
             allButtons: list = []
-            try:
-                TB = mw.findChildren(QToolBar, toolbar)
-                allButtons = TB[0].findChildren(QToolButton)
+            TB = mw.findChildren(QToolBar, toolbar)
+            if len(TB) > 0:
                 # remove empty buttons
-                for i in range(len(allButtons)):
-                    button: QToolButton = allButtons[i]
-                    if allButtons[i].text() == "":
-                        allButtons.pop(i)
-            except Exception:
-                pass
+                allButtons = [button for button in TB[0].findChildren(QToolButton) if button.text() != ""]
+            elif IsLoaded is False:
+                allButtons = self.List_ReturnProxyButtons(workbenchName, toolbar)
+            elif toolbar in WorkbenchToolbars:
+                # The toolbar is not created yet. Build the tab again when it is activated
+                ToolbarsMissing = True
+                if Parameters_Ribbon.DEBUG_MODE is True:
+                    StandardFunctions.Print(f"Ribbon UI: toolbar '{toolbar}' of {workbenchName} not found", "Log")
 
             # Add custom panels
             customList = self.List_AddCustomToolBarToWorkbench(workbenchName, toolbar)
@@ -1880,477 +2170,55 @@ class ModernMenu(RibbonBar):
             NewPanelList = self.List_AddNewPanelToWorkbench("Global", toolbar)
             allButtons.extend(NewPanelList)
 
-            # add separators to the command list.
-            if workbenchName in self.ribbonStructure["workbenches"]:
-                if toolbar != "" and toolbar in self.ribbonStructure["workbenches"][workbenchName]["toolbars"]:
-                    if "order" in self.ribbonStructure["workbenches"][workbenchName]["toolbars"][toolbar]:
-                        for j in range(
-                            len(self.ribbonStructure["workbenches"][workbenchName]["toolbars"][toolbar]["order"])
-                        ):
-                            if (
-                                "separator"
-                                in self.ribbonStructure["workbenches"][workbenchName]["toolbars"][toolbar]["order"][
-                                    j
-                                ].lower()
-                            ):
-                                separator = QToolButton()
-                                separator.setText(
-                                    self.ribbonStructure["workbenches"][workbenchName]["toolbars"][toolbar]["order"][j]
-                                )
-                                allButtons.insert(j, separator)
-
-            if workbenchName in self.ribbonStructure["workbenches"]:
-                # order buttons like defined in ribbonStructure
-                if (
-                    toolbar in self.ribbonStructure["workbenches"][workbenchName]["toolbars"]
-                    and "order" in self.ribbonStructure["workbenches"][workbenchName]["toolbars"][toolbar]
-                ):
-                    OrderList: list = self.ribbonStructure["workbenches"][workbenchName]["toolbars"][toolbar]["order"]
-
-                    # XXX check that positionsList consists of strings only
-                    def sortButtons(button: QToolButton):
-                        # Use the text from the button as backup
-                        Text = button.text()
-                        # Get the menu text
-                        if len(button.actions()) > 0:
-                            action = button.actions()[0]
-                            Text = StandardFunctions.CommandInfoCorrections(action.data())["menuText"]
-
-                        if Text == "":
-                            return -1
-
-                        position = None
-                        try:
-                            position = OrderList.index(Text)
-                        except ValueError:
-                            position = 999999
-
-                        return position
-
-                    allButtons.sort(key=sortButtons)
-
-            # add buttons to panel
-            shadowList = (
-                []
-            )  # if buttons are used in multiple workbenches, they can show up double. (Sketcher_NewSketch)
-            # for button in allButtons:
-            NoSmallButtons_spacer = (
-                0  # needed to count the number of small buttons in a column. (bug fix with adding separators)
-            )
-            NoMediumButtons_spacer = (
-                0  # needed to count the number of medium buttons in a column. (bug fix with adding separators)
+            # Plan the panel: order, size and text of the buttons, separators and the buttons for the option menu
+            ButtonInfo = [self.ReturnButtonInfo(button) for button in allButtons]
+            Plan = LayoutPlanner_Ribbon.ReturnPanelPlan(
+                self.ribbonStructure,
+                workbenchName,
+                workbenchTitle,
+                toolbar,
+                title,
+                ButtonInfo,
+                LayoutSettings,
+                self.StructureHash,
             )
 
-            # Define number of rows used per button size
-            LargeButtonRows = 3
-            MediumButtonRows = 2
-            SmallButtonRows = 1
-            # Define the rowCount and column count
-            rowCount = 0
-            columnCount = 0
-            # Set the maximum columns
-            maxColumns = Parameters_Ribbon.MAX_COLUMN_PANELS
-
-            # Define an action list of the actions that are byond the maximum columns
-            ButtonList = []
-
-            # Go through the button list:
-            for i in range(len(allButtons)):
-                button = allButtons[i]
-
-                # count the number of buttons per type. Needed for proper sorting the buttons later.
-                buttonSize = "small"
-                try:
-                    action = button.defaultAction()
-                    buttonSize = self.ribbonStructure["workbenches"][workbenchName]["toolbars"][toolbar]["commands"][
-                        action.data()
-                    ]["size"]
-                    if buttonSize == "small":
-                        NoSmallButtons_spacer += 1
-                    if buttonSize == "medium":
-                        NoMediumButtons_spacer += 1
-                except Exception:
-                    pass
-
-                # Panel overflow behaviour ----------------------------------------------------------------
-                #
-                # get the number of rows in the panel
-                if buttonSize == "small":
-                    rowCount = rowCount + SmallButtonRows
-                if buttonSize == "medium":
-                    rowCount = rowCount + MediumButtonRows
-                if buttonSize == "large" or "separator" in button.text():
-                    rowCount = rowCount + LargeButtonRows
-
-                # If the number of rows divided by 3 is a whole number,
-                # the number of columns is the rowcount divided by 3.
-                columnCount = math.ceil(rowCount / 3)
-                # if buttonSize == "medium":
-                #     columnCount = rowCount / 2
-                # if buttonSize == "large":
-                #     columnCount = rowCount
-                # ----------------------------------------------------------------------------------------
-
-                # if the button has not text, remove it, skip it and increase the counter.
-                if button.text() == "":
-                    continue
-                # If the command is already there, remove it, skip it and increase the counter.
-                elif shadowList.__contains__(button.text()) is True:
-                    continue
-                else:
-                    # If the number of columns is more than allowed,
-                    # Add the actions to the OptionPanel instead.
-                    if maxColumns > 0:
-                        # if the last item before the optionpanel is an separator, skip it
-                        if columnCount > maxColumns and "separator" in button.text():
-                            continue
-                        if columnCount > maxColumns + 2:
-                            ButtonList.append(button)
-                            panel.panelOptionButton().show()
-                            continue
-
-                    # If the last item is not an separator, you can add an separator
-                    # With an paneloptionbutton, use an offset of 2 instead of 1 for i.
-                    if "separator" in button.text() and i < len(allButtons):
-                        separator = panel.addLargeVerticalSeparator(
-                            width=6,
-                            alignment=Qt.AlignmentFlag.AlignCenter,
-                            fixedHeight=False,
-                        )
-                        separator.setObjectName("separator")
-                        # there is a bug in pyqtribbon where the separator is placed in the wrong position
-                        # despite the correct order of the button list.
-                        # To correct this, empty and disabled buttons are added for spacing.
-                        # (adding spacers did not work)
-                        if float((NoSmallButtons_spacer + 1) / 3).is_integer():
-                            spacer_1 = panel.addSmallButton()
-                            spacer_1.setFixedWidth(self.iconSize)
-                            spacer_1.setEnabled(False)
-                            spacer_1.setStyleSheet("background-color: none")
-                        if float((NoSmallButtons_spacer + 2) / 3).is_integer():
-                            spacer_1 = panel.addSmallButton()
-                            spacer_1.setFixedWidth(self.iconSize)
-                            spacer_1.setEnabled(False)
-                            spacer_1.setStyleSheet("background-color: none")
-                            spacer_2 = panel.addSmallButton()
-                            spacer_2.setFixedWidth(self.iconSize)
-                            spacer_2.setEnabled(False)
-                            spacer_2.setStyleSheet("background-color: none")
-                        # reset the counter after a separator is added.
-                        NoSmallButtons_spacer = 0
-                        # Same principle for medium buttons
-                        if float((NoMediumButtons_spacer + 1) / 2).is_integer():
-                            spacer_1 = panel.addMediumButton()
-                            spacer_1.setFixedWidth(Parameters_Ribbon.ICON_SIZE_MEDIUM)
-                            spacer_1.setEnabled(False)
-                            spacer_1.setStyleSheet("background-color: none")
-                        NoMediumButtons_spacer = 0
-                        continue
+            # add the planned items to the panel
+            for Item in Plan["Items"]:
+                if Item["Type"] == "separator":
+                    separator = panel.addLargeVerticalSeparator(
+                        width=6,
+                        alignment=Qt.AlignmentFlag.AlignCenter,
+                        fixedHeight=False,
+                    )
+                    separator.setObjectName("separator")
+                # there is a bug in pyqtribbon where the separator is placed in the wrong position
+                # despite the correct order of the button list.
+                # To correct this, empty and disabled buttons are added for spacing.
+                # (adding spacers did not work)
+                if Item["Type"] == "spacer":
+                    if Item["Size"] == "small":
+                        spacer = panel.addSmallButton()
+                        spacer.setFixedWidth(self.iconSize)
                     else:
-                        try:
-                            action = button.defaultAction()
-
-                            # get the action text
-                            text = action.text()
-                            try:
-                                # If the text is not from a hardcoded dropdown:
-                                if len(action.data().split(", ")) <= 1:
-                                    text = StandardFunctions.CommandInfoCorrections(action.data())["ActionText"]
-                            except Exception:
-                                pass
-
-                            # try to get alternative text from ribbonStructure
-                            try:
-                                textJSON = self.ribbonStructure["workbenches"][workbenchName]["toolbars"][toolbar][
-                                    "commands"
-                                ][action.data()]["text"]
-
-                                # There is a bug in freecad with the comp-sketch menu hase the wrong text
-                                if (
-                                    action.data() == "PartDesign_CompSketches"
-                                    and self.ribbonStructure["workbenches"][workbenchName]["toolbars"][toolbar][
-                                        "commands"
-                                    ][action.data()]["text"]
-                                    == "Create datum"
-                                ):
-                                    textJSON = "Create sketch"
-
-                                # Check if the original menutext is different
-                                # if so use the alternative, otherwise use original
-                                for CommandName in Gui.listCommands():
-                                    # if it is a normal command:
-                                    if len(action.data().split(", ")) <= 1:
-                                        Command = Gui.Command.get(CommandName)
-                                        MenuName = CommandInfoCorrections(CommandName)["menuText"].replace("&", "")
-                                        if CommandName == action.data():
-                                            if (
-                                                MenuName
-                                                != self.ribbonStructure["workbenches"][workbenchName]["toolbars"][
-                                                    toolbar
-                                                ]["commands"][action.data()]["text"]
-                                                and MenuName != ""
-                                                and textJSON != ""
-                                            ):
-                                                text = textJSON
-                                    # if it is a member of a FreeCAD dropdown:
-                                    if len(action.data().split(", ")) > 1:
-                                        MenuName = action.text()
-                                        if (
-                                            MenuName
-                                            != self.ribbonStructure["workbenches"][workbenchName]["toolbars"][toolbar][
-                                                "commands"
-                                            ][action.data()]["text"]
-                                            and MenuName != ""
-                                            and textJSON != ""
-                                        ):
-                                            text = textJSON
-
-                                # the text would be overwritten again when the state of the action changes
-                                # (e.g. when getting enabled / disabled), therefore the action itself
-                                # is manipulated.
-                                action.setText(text)
-                            except KeyError as e:
-                                if Parameters_Ribbon.DEBUG_MODE is True:
-                                    print(f"{workbenchName}, {action.data()}, {e}")
-                                text = action.text()
-
-                            # Get the icon from cache. Use the pixmap as backup
-                            pixmap = ""
-                            CommandName = action.data()
-                            if button.menu() is not None:
-                                CommandName = button.text()
-                            # If the command is an dropdown, use the button text instead of action data
-                            if button.text().endswith("_ddb"):
-                                CommandName = button.text()
-
-                            try:
-                                pixmap = self.ribbonStructure["workbenches"][workbenchName]["toolbars"][toolbar][
-                                    "commands"
-                                ][CommandName]["icon"]
-                            except Exception:
-                                pass
-                            actionIcon = self.ReturnCommandIcon(action.data(), pixmap)
-                            if actionIcon is not None:
-                                action.setIcon(actionIcon)
-
-                            # try to get alternative icon from ribbonStructure
-                            try:
-                                icon_Json = self.ribbonStructure["workbenches"][workbenchName]["toolbars"][toolbar][
-                                    "commands"
-                                ][CommandName]["icon"]
-                                if icon_Json != "":
-                                    action.setIcon(Gui.getIcon(icon_Json))
-                            except KeyError:
-                                pass
-
-                            # If the icon is still none, try to retrieve it from the data file
-                            if action.icon() is None or (action.icon() is not None and action.icon().isNull()):
-                                StandardFunctions.Print(f"An icon retrieved from data file for '{CommandName}'")
-                                DataFile = os.path.join(os.path.dirname(__file__), "RibbonDataFile.dat")
-
-                                if os.path.exists(DataFile) is True:
-                                    Data = {}
-                                    # read ribbon structure from JSON file
-                                    with open(DataFile, "r") as file:
-                                        Data.update(json.load(file))
-                                    file.close()
-                                    try:
-                                        # Load the lists for the deserialized icons
-                                        for IconItem in Data["Command_Icons"]:
-                                            # This works only for FreeCAD Commands
-                                            CommandName_Icon = action.data()
-                                            if CommandName_Icon == IconItem[0]:
-                                                Icon: QIcon = Serialize_Ribbon.deserializeIcon(IconItem[1])
-                                                action.setIcon(Icon)
-                                    except Exception as e:
-                                        if Parameters_Ribbon.DEBUG_MODE is True:
-                                            StandardFunctions.Print(
-                                                f"Trying the get an icon for {CommandName}\n{e}",
-                                                "Warning",
-                                            )
-                                        pass
-
-                            # get button size from ribbonStructure
-                            try:
-                                buttonSize = self.ribbonStructure["workbenches"][workbenchName]["toolbars"][toolbar][
-                                    "commands"
-                                ][CommandName]["size"]
-                                if buttonSize == "":
-                                    buttonSize = "small"
-                            except KeyError:
-                                pass
-
-                            # Check if this is an icon only toolbar
-                            IconOnly = False
-                            for iconToolbar in self.ribbonStructure["iconOnlyToolbars"]:
-                                if iconToolbar == toolbar:
-                                    IconOnly = True
-
-                            btn = RibbonToolButton()
-                            # Make sure that no strange "&" symbols are remainging
-                            action.setText(action.text().replace("&", ""))
-                            if buttonSize == "small":
-                                showText = Parameters_Ribbon.SHOW_ICON_TEXT_SMALL
-                                if IconOnly is True or Parameters_Ribbon.USE_FC_OVERLAY is True:
-                                    showText = False
-
-                                # Create a custom toolbutton
-                                ButtonSize = QSize(
-                                    Parameters_Ribbon.ICON_SIZE_SMALL,
-                                    Parameters_Ribbon.ICON_SIZE_SMALL,
-                                )
-                                IconSize = QSize(
-                                    Parameters_Ribbon.ICON_SIZE_SMALL,
-                                    Parameters_Ribbon.ICON_SIZE_SMALL,
-                                )
-                                Menu = QMenu(self)
-                                if button.menu() is not None:
-                                    Menu = button.menu()
-                                btn = CustomControls.CustomToolButton(
-                                    Text=action.text(),
-                                    Action=action,
-                                    Icon=action.icon(),
-                                    IconSize=IconSize,
-                                    ButtonSize=ButtonSize,
-                                    FontSize=Parameters_Ribbon.FONTSIZE_BUTTONS,
-                                    showText=showText,
-                                    setWordWrap=False,
-                                    ElideMode=False,
-                                    MaxNumberOfLines=2,
-                                    Menu=Menu,
-                                    MenuButtonSpace=16,
-                                    parent=self,
-                                )
-                                # add the button as large button
-                                panel.addSmallWidget(
-                                    btn,
-                                    alignment=Qt.AlignmentFlag.AlignLeft,
-                                    fixedHeight=False,
-                                )  # Set fixedheight to false. This is set in the custom widgets
-
-                            elif buttonSize == "medium":
-                                showText = Parameters_Ribbon.SHOW_ICON_TEXT_MEDIUM
-                                if IconOnly is True or Parameters_Ribbon.USE_FC_OVERLAY is True:
-                                    showText = False
-
-                                # Create a custom toolbutton
-                                ButtonSize = QSize(
-                                    Parameters_Ribbon.ICON_SIZE_MEDIUM,
-                                    Parameters_Ribbon.ICON_SIZE_MEDIUM,
-                                )
-                                IconSize = QSize(
-                                    Parameters_Ribbon.ICON_SIZE_MEDIUM,
-                                    Parameters_Ribbon.ICON_SIZE_MEDIUM,
-                                )
-                                Menu = QMenu(self)
-                                if button.menu() is not None:
-                                    Menu = button.menu()
-                                btn = CustomControls.CustomToolButton(
-                                    Text=action.text(),
-                                    Action=action,
-                                    Icon=action.icon(),
-                                    IconSize=IconSize,
-                                    ButtonSize=ButtonSize,
-                                    FontSize=Parameters_Ribbon.FONTSIZE_BUTTONS,
-                                    showText=showText,
-                                    setWordWrap=Parameters_Ribbon.WRAPTEXT_MEDIUM,
-                                    MaxNumberOfLines=2,
-                                    Menu=Menu,
-                                    MenuButtonSpace=16,
-                                    parent=self,
-                                )
-                                # add the button as large button
-                                panel.addMediumWidget(
-                                    btn,
-                                    alignment=Qt.AlignmentFlag.AlignLeft,
-                                    fixedHeight=False,
-                                )  # Set fixedheight to false. This is set in the custom widgets
-                            elif buttonSize == "large":
-                                showText = Parameters_Ribbon.SHOW_ICON_TEXT_LARGE
-                                if IconOnly is True or Parameters_Ribbon.USE_FC_OVERLAY is True:
-                                    showText = False
-
-                                # Create a custom toolbutton
-                                ButtonSize = QSize(
-                                    Parameters_Ribbon.ICON_SIZE_LARGE,
-                                    Parameters_Ribbon.ICON_SIZE_LARGE,
-                                )
-                                IconSize = QSize(
-                                    Parameters_Ribbon.ICON_SIZE_LARGE,
-                                    Parameters_Ribbon.ICON_SIZE_LARGE,
-                                )
-                                Menu = QMenu(self)
-                                if button.menu() is not None:
-                                    Menu = button.menu()
-                                btn: QToolButton = CustomControls.LargeCustomToolButton(
-                                    Text=action.text(),
-                                    Action=action,
-                                    Icon=action.icon(),
-                                    IconSize=IconSize,
-                                    ButtonSize=ButtonSize,
-                                    FontSize=Parameters_Ribbon.FONTSIZE_BUTTONS,
-                                    showText=showText,
-                                    setWordWrap=Parameters_Ribbon.WRAPTEXT_LARGE,
-                                    MaxNumberOfLines=2,
-                                    Menu=Menu,
-                                    MenuButtonSpace=16,
-                                    parent=self,
-                                )
-                                # add the button as large button
-                                panel.addLargeWidget(
-                                    btn,
-                                    fixedHeight=False,
-                                    alignment=Qt.AlignmentFlag.AlignTop,
-                                )  # Set fixedheight to false. This is set in the custom widgets
-                            else:
-                                if Parameters_Ribbon.DEBUG_MODE is True:
-                                    if buttonSize != "none":
-                                        print(f"{action.text()} is ignored. Its size was: {buttonSize}")
-                                pass
-
-                            if btn.menu() is not None:
-                                btn.popupMode(QToolButton.ToolButtonPopupMode.MenuButtonPopup)
-
-                            # Set the background always to background color.
-                            # Styling is managed in the custom button class
-                            StyleSheet_Addition_Button = (
-                                "QToolButton, QToolButton:hover {background-color: "
-                                + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-                                + ";border: none"
-                                + ";}"
-                            )
-                            btn.setStyleSheet(StyleSheet_Addition_Button)
-
-                            # add the button text to the shadowList for checking if buttons are already there.
-                            shadowList.append(button.text())
+                        spacer = panel.addMediumButton()
+                        spacer.setFixedWidth(Parameters_Ribbon.ICON_SIZE_MEDIUM)
+                    spacer.setEnabled(False)
+                    spacer.setStyleSheet("background-color: none")
+                if Item["Type"] == "button":
+                    try:
+                        self.AddPlannedButton(panel, allButtons[Item["Index"]], Item)
+                    except Exception as e:
+                        if Parameters_Ribbon.DEBUG_MODE is True:
+                            raise e
+                        continue
 
-                        except Exception as e:
-                            if Parameters_Ribbon.DEBUG_MODE is True:
-                                raise e
-                            continue
+            # Define an action list of the actions that are byond the maximum columns
+            ButtonList = [allButtons[i] for i in Plan["Overflow"]]
+            if len(ButtonList) > 0:
+                panel.panelOptionButton().show()
 
-            # Change the name of the view panels to "View"
-            if panel.title() in "Views - Ribbon_newPanel" or panel.title() in "Individual views":
-                panel.setTitle(" Views ")
-            else:
-                # Remove possible workbench names from the titles
-                ListDelimiters = [" - ", "-"]
-                for delimiter in ListDelimiters:
-                    if len(title.split(delimiter, 1)) > 1:
-                        title = title.split(delimiter, 1)[1]
-                if title.startswith(workbenchTitle) is True and title != workbenchTitle:
-                    title = title.replace(workbenchTitle, "")
-                if title.startswith(" ") is True:
-                    title = title.replace(" ", "")
-                panel.setTitle(title)
-
-            # remove any suffix from the panel title
-            if panel.title().endswith("_custom"):
-                panel.setTitle(panel.title().replace("_custom", ""))
-            if panel.title().endswith("_global"):
-                panel.setTitle(panel.title().replace("_global", ""))
-            if panel.title().endswith("_newPanel"):
-                panel.setTitle(panel.title().replace("_newPanel", ""))
+            panel.setTitle(Plan["Title"])
 
             # Set the panelheigth. setting the ribbonheigt, cause the first tab to be shown to large
             # add an offset to make room for the panel titles and icons
@@ -2399,10 +2267,18 @@ class ModernMenu(RibbonBar):
             if len(actionList) == 0:
                 panel.panelOptionButton().hide()
 
-        self.isWbLoaded[tabName] = True
+            # The panel is ready. Let the prebuilder continue later, if its time is up
+            yield toolbar
+        Tracing_Ribbon.End(PanelSpan)
+
+        # Only mark the tab as loaded when all toolbars were found
+        if ToolbarsMissing is False:
+            self.isWbLoaded[tabName] = True
+        if IsLoaded is False:
+            self.ProxyTabs.add(tabName)
+        self.BuiltTabs[tabName] = self.ReturnCategoryStats(category, MemoryBefore)
 
         # Set the previous/next buttons
-        category = self.currentCategory()
         ScrollLeftButton_Category: RibbonCategoryLayoutButton = category.findChildren(RibbonCategoryLayoutButton)[0]
         ScrollRightButton_Category: RibbonCategoryLayoutButton = category.findChildren(RibbonCategoryLayoutButton)[1]
         ScrollLeftButton_Category.setMinimumWidth(self.iconSize * 0.5)
@@ -2434,11 +2310,235 @@ class ModernMenu(RibbonBar):
         )
 
         # Set the maximum height to a high value to prevent from the ribbon to be clipped off
-        self.currentCategory().setMinimumHeight(self.RibbonHeight - self.RibbonMinimalHeight - 3)
-        self.currentCategory().setMaximumHeight(self.RibbonHeight - self.RibbonMinimalHeight - 3)
+        category.setMinimumHeight(self.RibbonHeight - self.RibbonMinimalHeight - 3)
+        category.setMaximumHeight(self.RibbonHeight - self.RibbonMinimalHeight - 3)
         self.setRibbonHeight(self.RibbonHeight)
         return
 
+    def ReturnButtonInfo(self, button: QToolButton) -> dict:
+        """_summary_
+        Returns the info of a toolbutton that is needed by the layout planner.
+
+        Args:
+            button (QToolButton): The toolbutton from a toolbar or custom panel.
+
+        Returns:
+            dict: the button info. See LayoutPlanner_Ribbon.py
+        """
+        ButtonInfo = {
+            "Key": None,
+            "HasAction": False,
+            "ButtonText": button.text(),
+            # Use the text from the button as backup
+            "SortText": button.text(),
+            "HasMenu": button.menu() is not None,
+            "ActionText": "",
+            "CommandText": "",
+            "MenuText": "",
+            "IsLoaded": False,
+        }
+
+        # Get the menu text for sorting
+        if len(button.actions()) > 0:
+            MenuText = CommandInfoCorrections(button.actions()[0].data())["menuText"]
+            # Proxy actions have no menu text until their workbench is loaded
+            if MenuText != "":
+                ButtonInfo["SortText"] = MenuText
+
+        action = button.defaultAction()
+        if action is not None:
+            ButtonInfo["Key"] = action.data()
+            ButtonInfo["HasAction"] = True
+            ButtonInfo["ActionText"] = action.text()
+            # If the command is not from a hardcoded dropdown, get the texts from the command
+            if isinstance(action.data(), str) and len(action.data().split(", ")) <= 1:
+                CommandInfo = CommandInfoCorrections(action.data())
+                ButtonInfo["CommandText"] = CommandInfo["ActionText"]
+                ButtonInfo["MenuText"] = CommandInfo["menuText"].replace("&", "")
+                # The command is loaded when it is registered
+                ButtonInfo["IsLoaded"] = Gui.Command.get(action.data()) is not None
+        return ButtonInfo
+
+    def AddPlannedButton(self, panel: RibbonPanel, button: QToolButton, Item: dict):
+        """_summary_
+        Creates a ribbon button for a button item of the layout plan and adds it to the panel.
+
+        Args:
+            panel (RibbonPanel): The panel
+            button (QToolButton): The original toolbutton
+            Item (dict): The button item from the layout plan
+        """
+        action = button.defaultAction()
+        CommandName = action.data()
+
+        # the text would be overwritten again when the state of the action changes
+        # (e.g. when getting enabled / disabled), therefore the action itself
+        # is manipulated.
+        action.setText(Item["Text"])
+
+        # Get the icon from cache. Use the pixmap as backup
+        actionIcon = self.ReturnCommandIcon(action.data(), Item["Icon"])
+        if actionIcon is not None:
+            action.setIcon(actionIcon)
+
+        # try to get alternative icon from ribbonStructure
+        if Item["Icon"] != "":
+            action.setIcon(Gui.getIcon(Item["Icon"]))
+
+        # If the icon is still none, try to retrieve it from the data file
+        if action.icon() is None or (action.icon() is not None and action.icon().isNull()):
+            StandardFunctions.Print(f"An icon retrieved from data file for '{CommandName}'")
+            DataFile = os.path.join(os.path.dirname(__file__), "RibbonDataFile.dat")
+
+            # Read only this icon from the memory-mapped icon store
+            IconStore = IconStore_Ribbon.ReturnIconStore()
+            if IconStore is not None:
+                try:
+                    # This works only for FreeCAD Commands
+                    Icon = IconStore.ReturnCommandIcon(action.data())
+                    if Icon is not None:
+                        action.setIcon(Icon)
+                except Exception as e:
+                    if Parameters_Ribbon.DEBUG_MODE is True:
+                        StandardFunctions.Print(
+                            f"Trying the get an icon for {CommandName}\n{e}",
+                            "Warning",
+                        )
+                    pass
+            # Data files created by older versions have the icons in the json data file.
+            elif os.path.exists(DataFile) is True:
+                Data = {}
+                # read ribbon structure from JSON file
+                with open(DataFile, "r") as file:
+                    Data.update(json.load(file))
+                file.close()
+                try:
+                    # Load the lists for the deserialized icons
+                    for IconItem in Data["Command_Icons"]:
+                        # This works only for FreeCAD Commands
+                        CommandName_Icon = action.data()
+                        if CommandName_Icon == IconItem[0]:
+                            Icon: QIcon = Serialize_Ribbon.deserializeIcon(IconItem[1])
+                            action.setIcon(Icon)
+                except Exception as e:
+                    if Parameters_Ribbon.DEBUG_MODE is True:
+                        StandardFunctions.Print(
+                            f"Trying the get an icon for {CommandName}\n{e}",
+                            "Warning",
+                        )
+                    pass
+
+        buttonSize = Item["Size"]
+        btn = RibbonToolButton()
+        # Use the panel as parent, so the menu is deleted together with the panel
+        Menu = QMenu(panel)
+        if button.menu() is not None:
+            Menu = button.menu()
+        if buttonSize == "small":
+            # Create a custom toolbutton
+            ButtonSize = QSize(
+                Parameters_Ribbon.ICON_SIZE_SMALL,
+                Parameters_Ribbon.ICON_SIZE_SMALL,
+            )
+            IconSize = QSize(
+                Parameters_Ribbon.ICON_SIZE_SMALL,
+                Parameters_Ribbon.ICON_SIZE_SMALL,
+            )
+            btn = CustomControls.CustomToolButton(
+                Text=action.text(),
+                Action=action,
+                Icon=action.icon(),
+                IconSize=IconSize,
+                ButtonSize=ButtonSize,
+                FontSize=Parameters_Ribbon.FONTSIZE_BUTTONS,
+                showText=Item["ShowText"],
+                setWordWrap=Item["WordWrap"],
+                ElideMode=False,
+                MaxNumberOfLines=2,
+                Menu=Menu,
+                MenuButtonSpace=16,
+                parent=self,
+            )
+            # add the button as small button
+            panel.addSmallWidget(
+                btn,
+                alignment=Qt.AlignmentFlag.AlignLeft,
+                fixedHeight=False,
+            )  # Set fixedheight to false. This is set in the custom widgets
+        elif buttonSize == "medium":
+            # Create a custom toolbutton
+            ButtonSize = QSize(
+                Parameters_Ribbon.ICON_SIZE_MEDIUM,
+                Parameters_Ribbon.ICON_SIZE_MEDIUM,
+            )
+            IconSize = QSize(
+                Parameters_Ribbon.ICON_SIZE_MEDIUM,
+                Parameters_Ribbon.ICON_SIZE_MEDIUM,
+            )
+            btn = CustomControls.CustomToolButton(
+                Text=action.text(),
+                Action=action,
+                Icon=action.icon(),
+                IconSize=IconSize,
+                ButtonSize=ButtonSize,
+                FontSize=Parameters_Ribbon.FONTSIZE_BUTTONS,
+                showText=Item["ShowText"],
+                setWordWrap=Item["WordWrap"],
+                MaxNumberOfLines=2,
+                Menu=Menu,
+                MenuButtonSpace=16,
+                parent=self,
+            )
+            # add the button as medium button
+            panel.addMediumWidget(
+                btn,
+                alignment=Qt.AlignmentFlag.AlignLeft,
+                fixedHeight=False,
+            )  # Set fixedheight to false. This is set in the custom widgets
+        elif buttonSize == "large":
+            # Create a custom toolbutton
+            ButtonSize = QSize(
+                Parameters_Ribbon.ICON_SIZE_LARGE,
+                Parameters_Ribbon.ICON_SIZE_LARGE,
+            )
+            IconSize = QSize(
+                Parameters_Ribbon.ICON_SIZE_LARGE,
+                Parameters_Ribbon.ICON_SIZE_LARGE,
+            )
+            btn: QToolButton = CustomControls.LargeCustomToolButton(
+                Text=action.text(),
+                Action=action,
+                Icon=action.icon(),
+                IconSize=IconSize,
+                ButtonSize=ButtonSize,
+                FontSize=Parameters_Ribbon.FONTSIZE_BUTTONS,
+                showText=Item["ShowText"],
+                setWordWrap=Item["WordWrap"],
+                MaxNumberOfLines=2,
+                Menu=Menu,
+                MenuButtonSpace=16,
+                parent=self,
+            )
+            # add the button as large button
+            panel.addLargeWidget(
+                btn,
+                fixedHeight=False,
+                alignment=Qt.AlignmentFlag.AlignTop,
+            )  # Set fixedheight to false. This is set in the custom widgets
+        else:
+            if Parameters_Ribbon.DEBUG_MODE is True:
+                if buttonSize != "none":
+                    print(f"{action.text()} is ignored. Its size was: {buttonSize}")
+            pass
+
+        if btn.menu() is not None:
+            btn.popupMode(QToolButton.ToolButtonPopupMode.MenuButtonPopup)
+
+        # Set the background always to background color.
+        # Styling is managed by the ribbon stylesheet, based on the properties set in the custom button class
+        StyleMapping_Ribbon.SetRibbonRole(btn, "button")
+        return
+
     def on_ScrollButton_Category_clicked(self, event, ScrollButton: RibbonCategoryLayoutButton):
         for i in range(Parameters_Ribbon.RIBBON_CLICKSPEED):
             ScrollButton.click()
@@ -2531,12 +2631,13 @@ class ModernMenu(RibbonBar):
 
             # Get the command and its original toolbar
             for key, value in list(Commands.items()):
-                # get the menu text from the command list
-                for CommandName in Gui.listCommands():
+                # get the commands with this menu text from the menu text index
+                for CommandName in StandardFunctions.ReturnCommandsByMenuText(key):
+                    CommandInfo = CommandInfoCorrections(CommandName)
                     # Get the english menutext
-                    MenuName = CommandInfoCorrections(CommandName)["menuText"]
+                    MenuName = CommandInfo["menuText"]
                     # Get the translated menutext
-                    MenuNameTtranslated = CommandInfoCorrections(CommandName)["ActionText"]
+                    MenuNameTtranslated = CommandInfo["ActionText"]
 
                     if MenuName == key:
                         try:
@@ -2562,6 +2663,40 @@ class ModernMenu(RibbonBar):
 
         return ButtonList
 
+    def List_ReturnProxyButtons(self, WorkBenchName: str, Toolbar: str) -> list:
+        """_summary_
+        Returns the buttons of a toolbar from a workbench that is not loaded yet.
+        The commands are taken from the data file and the buttons get proxy actions.
+
+        Args:
+            WorkBenchName (str): The name of the workbench.
+            Toolbar (str): The name of the toolbar.
+
+        Returns:
+            list: the toolbuttons.
+        """
+        ButtonList = []
+
+        WorkbenchItem = self.Catalog.ReturnWorkbench(WorkBenchName)
+        if WorkbenchItem is None:
+            return ButtonList
+        try:
+            Commands = WorkbenchItem[3][Toolbar]
+        except (KeyError, TypeError):
+            return ButtonList
+
+        for CommandName in Commands:
+            # Skip separators and commands that are not in the data file
+            if CommandName == "Separator" or self.Catalog.ReturnCommand(CommandName, WorkBenchName) is None:
+                continue
+            action = self.ReturnProxyAction(CommandName, WorkBenchName)
+            NewToolbutton = RibbonToolButton()
+            NewToolbutton.addAction(action)
+            NewToolbutton.setDefaultAction(action)
+            NewToolbutton.setText(action.text().replace("&", ""))
+            ButtonList.append(NewToolbutton)
+        return ButtonList
+
     def List_AddNewPanelToWorkbench(self, WorkBenchName, NewPanel):
         ButtonList = []
 
@@ -2592,8 +2727,11 @@ class ModernMenu(RibbonBar):
                             # If the commandname can be splitted, it is a FreeCAD dropdown
                             if len(CommandName.split(", ")) > 1:
                                 CommandActionList = self.LoadDropDownAction(CommandName)
-                            if CommandActionList is None:
-                                continue
+                            # If the workbench is not loaded, use a proxy action from the data file
+                            if CommandActionList is None or len(CommandActionList) == 0:
+                                if self.Catalog.ReturnCommand(CommandName.split(", ")[0]) is None:
+                                    continue
+                                CommandActionList = [self.ReturnProxyAction(CommandName, CommandItem[1])]
                             # if there are actions, proceed
                             if len(CommandActionList) > 0:
                                 # if there is only one action, add it directly
@@ -2619,9 +2757,11 @@ class ModernMenu(RibbonBar):
 
                                 # Set the text for the toolbutton
                                 if len(CommandName.split(", ")) <= 1:
-                                    NewToolbutton.setText(
-                                        CommandInfoCorrections(CommandName)["menuText"].replace("&", "")
-                                    )
+                                    MenuText = CommandInfoCorrections(CommandName)["menuText"]
+                                    # A proxy action has the menutext from the data file
+                                    if MenuText == "":
+                                        MenuText = NewToolbutton.defaultAction().text()
+                                    NewToolbutton.setText(MenuText.replace("&", ""))
                                 # # If the commandname is from a FreeCAD dropdown, set the commandname as text
                                 # if len(CommandName.split(", ")) > 1:
                                 #     NewToolbutton.setText(CommandName)
@@ -2725,12 +2865,12 @@ class ModernMenu(RibbonBar):
             QIcon: the command icon.
         """
 
-        icon = QIcon()
-        for item in self.List_CommandIcons:
-            if item[0] == CommandName:
-                icon = item[1]
+        icon = StandardFunctions.returnQiCons_Commands(CommandName, pixmap)
+        # If there is no icon, get the stored icon from the catalog
         if icon is None or (icon is not None and icon.isNull()):
-            icon = StandardFunctions.returnQiCons_Commands(CommandName, pixmap)
+            StoredIcon = self.Catalog.ReturnCommandIcon(CommandName)
+            if StoredIcon is not None:
+                icon = StoredIcon
         return icon
 
     def ReturnWorkbenchIcon(self, WorkBenchName: str, pixmap: str = "") -> QIcon:
@@ -2743,21 +2883,92 @@ class ModernMenu(RibbonBar):
         Returns:
             QIcon: the command icon.
         """
+        # Use the stored icon from the catalog first
+        icon = self.Catalog.ReturnWorkbenchIcon(WorkBenchName)
+        if icon is not None and icon.isNull() is False:
+            return icon
+        # If there is no stored icon, get the icon from the workbench. It can be removed since the last reload.
         icon = QIcon()
-        for item in self.List_WorkBenchIcons:
-            if item[0] == WorkBenchName:
-                icon = item[1]
-                return icon
-        if icon is None or (icon is not None and icon.isNull()):
+        try:
             workbench = Gui.getWorkbench(WorkBenchName)
             icon = QIcon(workbench.Icon)
-            return icon
+        except Exception as e:
+            if Parameters_Ribbon.DEBUG_MODE is True:
+                StandardFunctions.Print(f"{e.with_traceback(e.__traceback__)}", "Warning")
         if icon is None or (icon is not None and icon.isNull()):
             if pixmap != "":
                 icon = Gui.getIcon(pixmap)
                 return icon
         return icon
 
+    def ReturnProxyAction(self, CommandName: str, WorkBenchName: str = "") -> QAction:
+        """_summary_
+        Returns a lightweight action for a command of a workbench that is not loaded yet.
+        The text and icon are taken from the data file. The workbench is activated when the action is triggered.
+
+        Args:
+            CommandName (str): Name of the command. Can be "Parent, Index" for a member of a FreeCAD dropdown.
+            WorkBenchName (str, optional): The workbench of the command. Defaults to the workbench from the data file.
+
+        Returns:
+            QAction: the proxy action.
+        """
+        # Reuse the proxy action, when the tab is build again
+        if (CommandName, WorkBenchName) in self.ProxyActions:
+            return self.ProxyActions[(CommandName, WorkBenchName)]
+        ProxyKey = (CommandName, WorkBenchName)
+
+        ParentCommand = CommandName.split(", ")[0]
+        CommandItem = self.Catalog.ReturnCommand(ParentCommand, WorkBenchName)
+
+        action = QAction(self)
+        action.setData(CommandName)
+        action.setObjectName(CommandName)
+        action.setText(CommandName)
+        if CommandItem is not None:
+            # Use the translated menutext if available
+            if len(CommandItem) > 4 and CommandItem[4] != "":
+                action.setText(CommandItem[4])
+            elif CommandItem[2] != "":
+                action.setText(CommandItem[2])
+            if WorkBenchName in ["", "General", "Global", "Standard"]:
+                WorkBenchName = CommandItem[3]
+        Icon = self.Catalog.ReturnCommandIcon(ParentCommand, Lazy=True)
+        if Icon is not None:
+            action.setIcon(Icon)
+
+        action.triggered.connect(lambda checked=False: self.RunProxyAction(CommandName, WorkBenchName))
+        self.ProxyActions[ProxyKey] = action
+        return action
+
+    def RunProxyAction(self, CommandName: str, WorkBenchName: str):
+        """_summary_
+        Runs the command of a proxy action. If the command is not loaded yet, its workbench is activated first.
+        After that the previous workbench is activated again.
+
+        Args:
+            CommandName (str): Name of the command. Can be "Parent, Index" for a member of a FreeCAD dropdown.
+            WorkBenchName (str): The workbench of the command.
+        """
+        ParentCommand = CommandName.split(", ")[0]
+        Index = 0
+        if len(CommandName.split(", ")) > 1:
+            Index = int(CommandName.split(", ")[1])
+
+        try:
+            Command = Gui.Command.get(ParentCommand)
+            if (Command is None or len(Command.getAction()) == 0) and WorkBenchName != "":
+                ActiveWorkbench = Gui.activeWorkbench().name()
+                Gui.activateWorkbench(WorkBenchName)
+                if ActiveWorkbench != WorkBenchName:
+                    Gui.activateWorkbench(ActiveWorkbench)
+            Gui.runCommand(ParentCommand, Index)
+        except Exception as e:
+            if Parameters_Ribbon.DEBUG_MODE is True:
+                StandardFunctions.Print(f"{e.with_traceback(e.__traceback__)}", "Warning")
+            pass
+        return
+
     def RunCommand(self, Command: str):
         print(Command)
         try:
@@ -3039,11 +3250,16 @@ class ModernMenu(RibbonBar):
             for DropDownCommand, Commands in self.ribbonStructure["dropdownButtons"].items():
                 if CommandName == DropDownCommand:
                     for CommandItem in Commands:
+                        action = None
                         Command = Gui.Command.get(CommandItem[0])
                         if Command is not None:
                             action = Command.getAction()
-                            if action is not None:
-                                actionList.append(action)
+                        # If the workbench is not loaded, use a proxy action from the data file
+                        if action is None or len(action) == 0:
+                            if self.Catalog.ReturnCommand(CommandItem[0]) is not None:
+                                action = [self.ReturnProxyAction(CommandItem[0], CommandItem[1])]
+                        if action is not None:
+                            actionList.append(action)
             return actionList
         except Exception as e:
             if Parameters_Ribbon.DEBUG_MODE is True:
@@ -3243,6 +3459,7 @@ class run:
     Activate Modern UI.
     """
 
+    @Tracing_Ribbon.Traced("run")
     def __init__(self, name):
         """
         Constructor
@@ -3280,4 +3497,7 @@ class run:
                 ribbonDock.setMaximumHeight(ribbon.RibbonMinimalHeight)
             # Add the dockwidget to the main window
             mw.addDockWidget(Qt.DockWidgetArea.TopDockWidgetArea, ribbonDock)
+
+            # Export the startup trace when the ribbon is shown. (Only when tracing is enabled)
+            QTimer.singleShot(0, Tracing_Ribbon.Export)
             return
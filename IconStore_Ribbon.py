@@ -0,0 +1,231 @@
+# *************************************************************************
+# *                                                                       *
+# * Copyright (c) 2019-2024 Hakan Seven, Geolta, Paul Ebbers              *
+# *                                                                       *
+# * This program is free software; you can redistribute it and/or modify  *
+# * it under the terms of the GNU Lesser General Public License (LGPL)    *
+# * as published by the Free Software Foundation; either version 3 of     *
+# * the License, or (at your option) any later version.                   *
+# * for detail see the LICENCE text file.                                 *
+# *                                                                       *
+# * This program is distributed in the hope that it will be useful,       *
+# * but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# * GNU Library General Public License for more details.                  *
+# *                                                                       *
+# * You should have received a copy of the GNU Library General Public     *
+# * License along with this program; if not, write to the Free Software   *
+# * Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# * USA                                                                   *
+# *                                                                       *
+# *************************************************************************
+
+# Binary icon store for the ribbon.
+#
+# Layout of the file:
+#   header  : magic (4 bytes), format version (uint16), reserved (uint16), index length (uint32)
+#   index   : utf-8 json -> {"Commands": {name: [offset, length]}, "Workbenches": {name: [offset, length]},
+#                            "Pixmaps": {hash: [offset, length]}}
+#   payload : one compact json blob per icon (the dict returned by Serialize_Ribbon.serializeIcon)
+#             and one raw PNG per shared pixmap of icons that are serialized in the compact format
+#
+# The offsets in the index are relative to the start of the payload.
+# The file is memory-mapped, so only the bytes of the requested icon are read.
+
+import os
+import json
+import mmap
+import struct
+import binascii
+
+ICON_STORE_FILE = os.path.join(os.path.dirname(__file__), "RibbonIconStore.dat")
+
+MAGIC = b"RBIC"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHI")
+
+SECTION_COMMANDS = "Commands"
+SECTION_WORKBENCHES = "Workbenches"
+SECTION_PIXMAPS = "Pixmaps"
+
+# The store that is shared within this FreeCAD session
+_SharedStore = None
+
+
+class IconStore:
+    """Read-only access to a binary icon store. Icons are read one at a time from a memory-map."""
+
+    def __init__(self, FileName: str = ICON_STORE_FILE):
+        self.FileName = FileName
+        self.TimeStamp = os.path.getmtime(FileName)
+        self._File = open(FileName, "rb")
+        self._Map = None
+        self.Index = {
+            SECTION_COMMANDS: {},
+            SECTION_WORKBENCHES: {},
+            SECTION_PIXMAPS: {},
+        }
+        # The shared pixmaps for icons in the compact format
+        self.Pixmaps = PixmapPool(self)
+        try:
+            # An empty file cannot be mapped
+            if os.path.getsize(FileName) < HEADER.size:
+                raise ValueError(f"{FileName} is not a valid icon store")
+            self._Map = mmap.mmap(self._File.fileno(), 0, access=mmap.ACCESS_READ)
+
+            Magic, Version, Reserved, IndexLength = HEADER.unpack_from(self._Map, 0)
+            if Magic != MAGIC or Version != FORMAT_VERSION:
+                raise ValueError(f"{FileName} has an unsupported format")
+
+            IndexStart = HEADER.size
+            self._PayloadStart = IndexStart + IndexLength
+            self.Index.update(
+                json.loads(self._Map[IndexStart : self._PayloadStart].decode("utf-8"))
+            )
+        except Exception:
+            self.close()
+            raise
+        return
+
+    def close(self):
+        if self._Map is not None:
+            self._Map.close()
+            self._Map = None
+        if self._File is not None:
+            self._File.close()
+            self._File = None
+        return
+
+    def names(self, Section: str = SECTION_COMMANDS) -> list:
+        return list(self.Index[Section].keys())
+
+    def contains(self, Name: str, Section: str = SECTION_COMMANDS) -> bool:
+        return Name in self.Index[Section]
+
+    def ReturnSerializedIcon(self, Name: str, Section: str = SECTION_COMMANDS):
+        """Returns the serialized icon (as created by Serialize_Ribbon.serializeIcon) or None"""
+        try:
+            Offset, Length = self.Index[Section][Name]
+        except KeyError:
+            return None
+        return json.loads(self.ReturnBlob(Offset, Length).decode("utf-8"))
+
+    def ReturnBlob(self, Offset: int, Length: int) -> bytes:
+        Start = self._PayloadStart + Offset
+        return self._Map[Start : Start + Length]
+
+    def ReturnIcon(self, Name: str, Section: str = SECTION_COMMANDS):
+        """Returns the deserialized QIcon or None if the icon is not in the store"""
+        import Serialize_Ribbon
+
+        SerializedIcon = self.ReturnSerializedIcon(Name, Section)
+        if SerializedIcon is None:
+            return None
+        return Serialize_Ribbon.deserializeIcon(SerializedIcon, Pool=self.Pixmaps)
+
+    def ReturnCommandIcon(self, CommandName: str):
+        return self.ReturnIcon(CommandName, SECTION_COMMANDS)
+
+    def ReturnWorkbenchIcon(self, WorkBenchName: str):
+        return self.ReturnIcon(WorkBenchName, SECTION_WORKBENCHES)
+
+
+class PixmapPool:
+    """Read-only view on the shared pixmaps in an icon store. Returns the raw PNG data for a hash."""
+
+    def __init__(self, Store: IconStore):
+        self.Store = Store
+
+    def get(self, Hash: str, default=None):
+        try:
+            Offset, Length = self.Store.Index[SECTION_PIXMAPS][Hash]
+        except KeyError:
+            return default
+        return self.Store.ReturnBlob(Offset, Length)
+
+
+def WriteIconStore(
+    WorkbenchIcons: list,
+    CommandIcons: list,
+    FileName: str = ICON_STORE_FILE,
+    Pixmaps: dict = None,
+):
+    """Writes the icons to a binary icon store.
+
+    Args:
+        WorkbenchIcons (list): list of [WorkBenchName, SerializedIcon]
+        CommandIcons (list): list of [CommandName, SerializedIcon]
+        FileName (str, optional): the file to write. Defaults to ICON_STORE_FILE.
+        Pixmaps (dict, optional): the shared pixmaps {hash: data} of icons serialized in the compact format.
+            The data is base64 encoded (str) or raw (bytes, e.g. copied from another store).
+    """
+    Index = {SECTION_COMMANDS: {}, SECTION_WORKBENCHES: {}, SECTION_PIXMAPS: {}}
+    Blobs = []
+    Offset = 0
+    for Section, IconList in (
+        (SECTION_WORKBENCHES, WorkbenchIcons),
+        (SECTION_COMMANDS, CommandIcons),
+    ):
+        for Name, SerializedIcon in IconList:
+            Blob = json.dumps(SerializedIcon, separators=(",", ":")).encode("utf-8")
+            # The last icon with the same name wins, like in the old lists
+            Index[Section][Name] = [Offset, len(Blob)]
+            Blobs.append(Blob)
+            Offset = Offset + len(Blob)
+
+    # Store the shared pixmaps as raw PNG data. No need for base64 in a binary file
+    if Pixmaps is not None:
+        for Hash, Data in Pixmaps.items():
+            Blob = Data
+            if isinstance(Data, str):
+                Blob = binascii.a2b_base64(Data)
+            Index[SECTION_PIXMAPS][Hash] = [Offset, len(Blob)]
+            Blobs.append(Blob)
+            Offset = Offset + len(Blob)
+
+    IndexData = json.dumps(Index, separators=(",", ":")).encode("utf-8")
+
+    # A mapped file cannot be replaced on Windows. Close the shared store first
+    CloseIconStore()
+
+    TempFile = FileName + ".tmp"
+    with open(TempFile, "wb") as outfile:
+        outfile.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(IndexData)))
+        outfile.write(IndexData)
+        for Blob in Blobs:
+            outfile.write(Blob)
+    os.replace(TempFile, FileName)
+    return
+
+
+def ReturnIconStore(FileName: str = ICON_STORE_FILE):
+    """Returns the icon store shared within this session, or None if there is no (valid) store.
+    The store is re-opened when the file is changed on disk."""
+    global _SharedStore
+
+    if os.path.exists(FileName) is False:
+        CloseIconStore()
+        return None
+
+    if _SharedStore is not None:
+        if (
+            _SharedStore.FileName == FileName
+            and _SharedStore.TimeStamp == os.path.getmtime(FileName)
+        ):
+            return _SharedStore
+        CloseIconStore()
+
+    try:
+        _SharedStore = IconStore(FileName)
+    except Exception:
+        _SharedStore = None
+    return _SharedStore
+
+
+def CloseIconStore():
+    global _SharedStore
+
+    if _SharedStore is not None:
+        _SharedStore.close()
+        _SharedStore = None
+    return
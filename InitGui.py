@@ -22,8 +22,15 @@
 import os
 import FreeCAD as App
 import FreeCADGui as Gui
+import Tracing_Ribbon
+
+# Trace the phases of the startup. Only recorded when "DebugMode" or "TraceStartup" is enabled
+InitGuiSpan = Tracing_Ribbon.Begin("InitGui")
+Span = Tracing_Ribbon.Begin("InitGui: import FCBinding")
 import FCBinding
 import Parameters_Ribbon
+
+Tracing_Ribbon.End(Span)
 import shutil
 import sys
 import platform
@@ -45,6 +52,8 @@ def QT_TRANSLATE_NOOP(context, text):
 
 global pathIcons
 
+Span = Tracing_Ribbon.Begin("InitGui: resources")
+
 # Get the resources
 pathIcons = Parameters_Ribbon.ICON_LOCATION
 pathStylSheets = Parameters_Ribbon.STYLESHEET_LOCATION
@@ -84,6 +93,9 @@ if fileExists is False:
 
 # remove the test workbench
 Gui.removeWorkbench("TestWorkbench")
+Tracing_Ribbon.End(Span)
+
+Span = Tracing_Ribbon.Begin("InitGui: overlay settings")
 
 USECUSTOMOVERLAY = os.path.join(os.path.dirname(FCBinding.__file__), "OVERLAY_DISABLED")
 if (
@@ -104,6 +116,9 @@ if Parameters_Ribbon.USE_FC_OVERLAY is True:
     preferences = App.ParamGet("User parameter:BaseApp/Preferences/DockWindows")
     preferences.SetBool("ActivateOverlay", True)
 
+Tracing_Ribbon.End(Span)
+
+Span = Tracing_Ribbon.Begin("InitGui: main window")
 try:
     print(translate("FreeCAD Ribbon", "Activating Ribbon Bar..."))
     mw = Gui.getMainWindow()
@@ -131,5 +146,10 @@ except Exception as e:
     if Parameters_Ribbon.DEBUG_MODE is True:
         print(f"{e.with_traceback(e.__traceback__)}, 0")
 
+Tracing_Ribbon.End(Span)
+
+Span = Tracing_Ribbon.Begin("InitGui: translations")
 Gui.addLanguagePath(os.path.join(os.path.dirname(FCBinding.__file__), "translations"))
 Gui.updateLocale()
+Tracing_Ribbon.End(Span)
+Tracing_Ribbon.End(InitGuiSpan)
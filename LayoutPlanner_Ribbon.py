@@ -0,0 +1,536 @@
+# *************************************************************************
+# *                                                                       *
+# * Copyright (c) 2019-2024 Hakan Seven, Geolta, Paul Ebbers              *
+# *                                                                       *
+# * This program is free software; you can redistribute it and/or modify  *
+# * it under the terms of the GNU Lesser General Public License (LGPL)    *
+# * as published by the Free Software Foundation; either version 3 of     *
+# * the License, or (at your option) any later version.                   *
+# * for detail see the LICENCE text file.                                 *
+# *                                                                       *
+# * This program is distributed in the hope that it will be useful,       *
+# * but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# * GNU Library General Public License for more details.                  *
+# *                                                                       *
+# * You should have received a copy of the GNU Library General Public     *
+# * License along with this program; if not, write to the Free Software   *
+# * Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# * USA                                                                   *
+# *                                                                       *
+# *************************************************************************
+
+# Layout planner for the ribbon panels.
+#
+# The planner decides the order of the panels and, per panel, the order of the buttons, their size and text,
+# the separators, the spacers and which buttons go to the overflow menu.
+# It is pure Python: it does not import FreeCAD or Qt. The result is a render plan with only dicts, lists,
+# strings, numbers and booleans. ModernMenu.buildPanels creates the widgets from this plan.
+#
+# The buttons of a panel are given as a list of button info dicts:
+#   {
+#       "Key": the command name (action data) of the default action, or None,
+#       "HasAction": True if the button has a default action,
+#       "ButtonText": the text of the button,
+#       "SortText": the menu text used for sorting (the button text if there is no menu text),
+#       "HasMenu": True if the button has a menu,
+#       "ActionText": the current text of the default action,
+#       "CommandText": the (translated) action text of the command, "" if unknown,
+#       "MenuText": the untranslated menu text without "&", "" if unknown,
+#       "IsLoaded": True if the command is loaded in FreeCAD,
+#   }
+#
+# The plan of a panel is:
+#   {
+#       "Toolbar": the toolbar name,
+#       "Title": the panel title,
+#       "Items": a list of items, in order:
+#           {"Type": "button", "Index": index in the button list, "Text": str, "Icon": str, "Size": str,
+#            "ShowText": bool, "WordWrap": bool}
+#           {"Type": "separator"}
+#           {"Type": "spacer", "Size": "small" or "medium"}
+#       "Overflow": the indexes of the buttons for the overflow menu,
+#   }
+
+import json
+import math
+import hashlib
+
+# Number of rows used per button size
+LARGE_BUTTON_ROWS = 3
+MEDIUM_BUTTON_ROWS = 2
+SMALL_BUTTON_ROWS = 1
+
+# Settings used when planning. ReturnSettings() reads them from the preferences.
+DefaultSettings = {
+    "MaxColumns": 0,
+    "CustomPanelPosition": "Right",
+    "ShowText_Small": True,
+    "ShowText_Medium": True,
+    "ShowText_Large": True,
+    "WrapText_Medium": True,
+    "WrapText_Large": True,
+    "UseOverlay": False,
+}
+
+# The cached plans per plan key. Only the plans of the current ribbon structure are kept
+PlanCache = {}
+PlanCacheStats = {"hits": 0, "misses": 0}
+# The hash of the ribbon structure of the cached plans
+_PlanCacheHash = ""
+# The maximum number of cached plans. The cache is cleared when it is full
+MAX_PLANS = 2000
+
+
+def ReturnSettings() -> dict:
+    """Returns the planner settings from the ribbon preferences"""
+    import Parameters_Ribbon
+
+    return {
+        "MaxColumns": Parameters_Ribbon.MAX_COLUMN_PANELS,
+        "CustomPanelPosition": Parameters_Ribbon.DEFAULT_PANEL_POSITION_CUSTOM,
+        "ShowText_Small": Parameters_Ribbon.SHOW_ICON_TEXT_SMALL,
+        "ShowText_Medium": Parameters_Ribbon.SHOW_ICON_TEXT_MEDIUM,
+        "ShowText_Large": Parameters_Ribbon.SHOW_ICON_TEXT_LARGE,
+        "WrapText_Medium": Parameters_Ribbon.WRAPTEXT_MEDIUM,
+        "WrapText_Large": Parameters_Ribbon.WRAPTEXT_LARGE,
+        "UseOverlay": Parameters_Ribbon.USE_FC_OVERLAY,
+    }
+
+
+def ReturnStructureHash(Structure: dict) -> str:
+    """Returns a hash of the ribbon structure"""
+    Text = json.dumps(Structure, sort_keys=True)
+    return hashlib.sha1(Text.encode("utf-8")).hexdigest()
+
+
+def ReturnCommands(Structure: dict, WorkBenchName: str, Toolbar: str) -> dict:
+    """Returns the command settings of a toolbar from the ribbon structure, or an empty dict"""
+    try:
+        return Structure["workbenches"][WorkBenchName]["toolbars"][Toolbar]["commands"]
+    except (KeyError, TypeError):
+        return {}
+
+
+def ReturnOrder(Structure: dict, WorkBenchName: str, Toolbar: str):
+    """Returns the order list of a toolbar from the ribbon structure, or None"""
+    try:
+        return Structure["workbenches"][WorkBenchName]["toolbars"][Toolbar]["order"]
+    except (KeyError, TypeError):
+        return None
+
+
+def ReturnToolbars(
+    Structure: dict,
+    WorkBenchName: str,
+    Toolbars: list,
+    Settings: dict = DefaultSettings,
+) -> list:
+    """_summary_
+    Returns the toolbars of a workbench in the order of the panels.
+
+    Args:
+        Structure (dict): The ribbon structure
+        WorkBenchName (str): The name of the workbench
+        Toolbars (list): The toolbars of the workbench, including the custom toolbars from FreeCAD
+        Settings (dict, optional): The planner settings. Defaults to DefaultSettings.
+
+    Returns:
+        list: the toolbar names. Ignored toolbars are not removed.
+    """
+    ListToolbars = list(Toolbars)
+
+    # Add the custom panels and remove their original toolbars
+    try:
+        if WorkBenchName in Structure["customToolbars"]:
+            for CustomPanel in Structure["customToolbars"][WorkBenchName]:
+                ListToolbars.append(CustomPanel)
+
+                Commands = Structure["customToolbars"][WorkBenchName][CustomPanel][
+                    "commands"
+                ]
+                for Command in Commands:
+                    try:
+                        ListToolbars.remove(Commands[Command])
+                    except Exception:
+                        continue
+    except Exception:
+        pass
+
+    # Add the new panels
+    try:
+        for WorkBenchItem in Structure["newPanels"]:
+            if WorkBenchItem == WorkBenchName or WorkBenchItem == "Global":
+                for Panel in Structure["newPanels"][WorkBenchItem]:
+                    ListToolbars.append(Panel)
+    except Exception:
+        pass
+
+    # Sort the list of toolbars according the toolbar order
+    try:
+        ToolbarOrder: list = Structure["workbenches"][WorkBenchName]["toolbars"][
+            "order"
+        ]
+
+        def SortToolbars(toolbar):
+            if toolbar == "":
+                return -1
+
+            position = None
+            try:
+                position = ToolbarOrder.index(toolbar) + 1
+            except ValueError:
+                position = 999999
+                if toolbar.endswith("_custom") or toolbar.endswith("_newPanel"):
+                    if Settings["CustomPanelPosition"] == "Right":
+                        position = 999999
+                    else:
+                        position = 0
+            return position
+
+        ListToolbars.sort(key=SortToolbars)
+    except Exception:
+        pass
+
+    return ListToolbars
+
+
+def IsIgnored(Structure: dict, Toolbar: str) -> bool:
+    if Toolbar == "":
+        return True
+    return Toolbar in Structure.get("ignoredToolbars", [])
+
+
+def ReturnPanelTitle(Title: str, WorkBenchTitle: str) -> str:
+    """Returns the title of a panel without workbench names and suffixes"""
+    # Change the name of the view panels to "View"
+    if Title in "Views - Ribbon_newPanel" or Title in "Individual views":
+        Title = " Views "
+    else:
+        # Remove possible workbench names from the titles
+        ListDelimiters = [" - ", "-"]
+        for delimiter in ListDelimiters:
+            if len(Title.split(delimiter, 1)) > 1:
+                Title = Title.split(delimiter, 1)[1]
+        if Title.startswith(WorkBenchTitle) is True and Title != WorkBenchTitle:
+            Title = Title.replace(WorkBenchTitle, "")
+        if Title.startswith(" ") is True:
+            Title = Title.replace(" ", "")
+
+    # remove any suffix from the panel title
+    for Suffix in ["_custom", "_global", "_newPanel"]:
+        if Title.endswith(Suffix):
+            Title = Title.replace(Suffix, "")
+    return Title
+
+
+def ReturnButtonText(Button: dict, Commands: dict):
+    """_summary_
+    Returns the text for the button. Alternative texts from the ribbon structure are used when set.
+
+    Args:
+        Button (dict): The button info
+        Commands (dict): The command settings of the toolbar
+
+    Returns:
+        str: the text without "&".
+    """
+    Key = Button["Key"]
+    text = Button["ActionText"]
+    IsDropDownMember = isinstance(Key, str) and len(Key.split(", ")) > 1
+
+    # If the text is not from a hardcoded dropdown, use the text of the command
+    if (
+        isinstance(Key, str)
+        and IsDropDownMember is False
+        and Button["CommandText"] != ""
+    ):
+        text = Button["CommandText"]
+
+    try:
+        StoredText = Commands[Key]["text"]
+        textJSON = StoredText
+        # There is a bug in freecad with the comp-sketch menu hase the wrong text
+        if Key == "PartDesign_CompSketches" and StoredText == "Create datum":
+            textJSON = "Create sketch"
+
+        # Check if the original menutext is different
+        # if so use the alternative, otherwise use original
+        if IsDropDownMember is False:
+            MenuName = Button["MenuText"]
+            if Button["IsLoaded"] is True:
+                if MenuName != StoredText and MenuName != "" and textJSON != "":
+                    text = textJSON
+        else:
+            MenuName = Button["ActionText"]
+            if MenuName != StoredText and MenuName != "" and textJSON != "":
+                text = textJSON
+    except (KeyError, TypeError):
+        text = Button["ActionText"]
+
+    return text.replace("&", "")
+
+
+def PlanPanel(
+    Structure: dict,
+    WorkBenchName: str,
+    WorkBenchTitle: str,
+    Toolbar: str,
+    Title: str,
+    Buttons: list,
+    Settings: dict = DefaultSettings,
+) -> dict:
+    """_summary_
+    Returns the render plan for a panel.
+
+    Args:
+        Structure (dict): The ribbon structure
+        WorkBenchName (str): The name of the workbench
+        WorkBenchTitle (str): The title of the workbench
+        Toolbar (str): The name of the toolbar
+        Title (str): The translated title of the toolbar
+        Buttons (list): The button info dicts, in the order they are collected
+        Settings (dict, optional): The planner settings. Defaults to DefaultSettings.
+
+    Returns:
+        dict: the panel plan.
+    """
+    Commands = ReturnCommands(Structure, WorkBenchName, Toolbar)
+    OrderList = ReturnOrder(Structure, WorkBenchName, Toolbar)
+
+    Entries = []
+    for i in range(len(Buttons)):
+        Entry = dict(Buttons[i])
+        Entry["Index"] = i
+        Entries.append(Entry)
+
+    if OrderList is not None:
+        # add separators to the button list
+        for j in range(len(OrderList)):
+            if "separator" in OrderList[j].lower():
+                Separator = {
+                    "Key": None,
+                    "HasAction": False,
+                    "ButtonText": OrderList[j],
+                    "SortText": OrderList[j],
+                    "HasMenu": False,
+                    "Index": None,
+                }
+                Entries.insert(j, Separator)
+
+        # order buttons like defined in the ribbon structure
+        def SortButtons(Entry: dict):
+            Text = Entry["SortText"]
+            if Text == "":
+                return -1
+            try:
+                return OrderList.index(Text)
+            except ValueError:
+                return 999999
+
+        Entries.sort(key=SortButtons)
+
+    Items = []
+    Overflow = []
+    # if buttons are used in multiple workbenches, they can show up double. (Sketcher_NewSketch)
+    shadowList = []
+    # needed to count the number of small and medium buttons in a column. (bug fix with adding separators)
+    NoSmallButtons_spacer = 0
+    NoMediumButtons_spacer = 0
+    rowCount = 0
+    columnCount = 0
+    maxColumns = Settings["MaxColumns"]
+    IconOnly = Toolbar in Structure.get("iconOnlyToolbars", [])
+
+    for Entry in Entries:
+        ButtonText = Entry["ButtonText"]
+        IsSeparator = "separator" in ButtonText
+
+        # count the number of buttons per type. Needed for proper sorting the buttons later.
+        buttonSize = "small"
+        if Entry["HasAction"] is True:
+            try:
+                buttonSize = Commands[Entry["Key"]]["size"]
+                if buttonSize == "small":
+                    NoSmallButtons_spacer += 1
+                if buttonSize == "medium":
+                    NoMediumButtons_spacer += 1
+            except (KeyError, TypeError):
+                pass
+
+        # Panel overflow behaviour: get the number of rows and columns in the panel
+        if buttonSize == "small":
+            rowCount = rowCount + SMALL_BUTTON_ROWS
+        if buttonSize == "medium":
+            rowCount = rowCount + MEDIUM_BUTTON_ROWS
+        if buttonSize == "large" or IsSeparator:
+            rowCount = rowCount + LARGE_BUTTON_ROWS
+        columnCount = math.ceil(rowCount / 3)
+
+        # if the button has not text, skip it.
+        if ButtonText == "":
+            continue
+        # If the command is already there, skip it.
+        if ButtonText in shadowList:
+            continue
+
+        # If the number of columns is more than allowed, add the button to the overflow menu instead.
+        if maxColumns > 0:
+            # if the last item before the overflow menu is an separator, skip it
+            if columnCount > maxColumns and IsSeparator:
+                continue
+            if columnCount > maxColumns + 2:
+                Overflow.append(Entry["Index"])
+                continue
+
+        if IsSeparator:
+            Items.append({"Type": "separator"})
+            # there is a bug in pyqtribbon where the separator is placed in the wrong position
+            # despite the correct order of the button list.
+            # To correct this, empty and disabled buttons are added for spacing.
+            if float((NoSmallButtons_spacer + 1) / 3).is_integer():
+                Items.append({"Type": "spacer", "Size": "small"})
+            if float((NoSmallButtons_spacer + 2) / 3).is_integer():
+                Items.append({"Type": "spacer", "Size": "small"})
+                Items.append({"Type": "spacer", "Size": "small"})
+            NoSmallButtons_spacer = 0
+            # Same principle for medium buttons
+            if float((NoMediumButtons_spacer + 1) / 2).is_integer():
+                Items.append({"Type": "spacer", "Size": "medium"})
+            NoMediumButtons_spacer = 0
+            continue
+
+        # Buttons without an action cannot be added
+        if Entry["HasAction"] is False:
+            continue
+
+        # Get the key for the icon and size. For dropdowns, this is the button text
+        CommandName = Entry["Key"]
+        if Entry["HasMenu"] is True or ButtonText.endswith("_ddb"):
+            CommandName = ButtonText
+
+        Icon = ""
+        try:
+            Icon = Commands[CommandName]["icon"]
+        except (KeyError, TypeError):
+            pass
+        try:
+            buttonSize = Commands[CommandName]["size"]
+            if buttonSize == "":
+                buttonSize = "small"
+        except (KeyError, TypeError):
+            pass
+
+        showText = False
+        WordWrap = False
+        if buttonSize == "small":
+            showText = Settings["ShowText_Small"]
+        if buttonSize == "medium":
+            showText = Settings["ShowText_Medium"]
+            WordWrap = Settings["WrapText_Medium"]
+        if buttonSize == "large":
+            showText = Settings["ShowText_Large"]
+            WordWrap = Settings["WrapText_Large"]
+        if IconOnly is True or Settings["UseOverlay"] is True:
+            showText = False
+
+        Items.append(
+            {
+                "Type": "button",
+                "Index": Entry["Index"],
+                "Text": ReturnButtonText(Entry, Commands),
+                "Icon": Icon,
+                "Size": buttonSize,
+                "ShowText": showText,
+                "WordWrap": WordWrap,
+            }
+        )
+        # add the button text to the shadowList for checking if buttons are already there.
+        shadowList.append(ButtonText)
+
+    return {
+        "Toolbar": Toolbar,
+        "Title": ReturnPanelTitle(Title, WorkBenchTitle),
+        "Items": Items,
+        "Overflow": Overflow,
+    }
+
+
+# The keys of the button info, in a fixed order for the plan key
+BUTTON_INFO_KEYS = (
+    "Key",
+    "HasAction",
+    "ButtonText",
+    "SortText",
+    "HasMenu",
+    "ActionText",
+    "CommandText",
+    "MenuText",
+    "IsLoaded",
+)
+
+
+def ReturnPlanKey(
+    StructureHash: str,
+    WorkBenchName: str,
+    WorkBenchTitle: str,
+    Toolbar: str,
+    Title: str,
+    Buttons: list,
+    Settings: dict,
+) -> tuple:
+    """Returns the cache key for a plan. Tuples are used, because they are much faster to hash than json."""
+    ButtonKey = tuple(
+        tuple(Button.get(Key) for Key in BUTTON_INFO_KEYS) for Button in Buttons
+    )
+    SettingsKey = tuple(sorted(Settings.items()))
+    return (
+        StructureHash,
+        WorkBenchName,
+        WorkBenchTitle,
+        Toolbar,
+        Title,
+        ButtonKey,
+        SettingsKey,
+    )
+
+
+def ReturnPanelPlan(
+    Structure: dict,
+    WorkBenchName: str,
+    WorkBenchTitle: str,
+    Toolbar: str,
+    Title: str,
+    Buttons: list,
+    Settings: dict = DefaultSettings,
+    StructureHash: str = "",
+) -> dict:
+    """Same as PlanPanel, but the plan is cached by the structure hash and the other arguments"""
+    if StructureHash == "":
+        StructureHash = ReturnStructureHash(Structure)
+    Key = ReturnPlanKey(
+        StructureHash, WorkBenchName, WorkBenchTitle, Toolbar, Title, Buttons, Settings
+    )
+
+    # The plans of a previous ribbon structure are not used anymore
+    if StructureHash != _PlanCacheHash or len(PlanCache) >= MAX_PLANS:
+        ClearPlanCache(StructureHash)
+
+    Plan = PlanCache.get(Key)
+    if Plan is None:
+        PlanCacheStats["misses"] += 1
+        Plan = PlanPanel(
+            Structure, WorkBenchName, WorkBenchTitle, Toolbar, Title, Buttons, Settings
+        )
+        PlanCache[Key] = Plan
+    else:
+        PlanCacheStats["hits"] += 1
+    return Plan
+
+
+def ClearPlanCache(StructureHash: str = ""):
+    global _PlanCacheHash
+
+    PlanCache.clear()
+    _PlanCacheHash = StructureHash
+    return
@@ -27,6 +27,7 @@ from PySide.QtWidgets import (
     QListWidgetItem,
     QTableWidgetItem,
     QListWidget,
+    QListView,
     QTableWidget,
     QToolBar,
     QToolButton,
@@ -39,17 +40,23 @@ from PySide.QtWidgets import (
     QRadioButton,
     QLabel,
 )
-from PySide.QtCore import Qt, SIGNAL, Signal, QObject, QThread, QSize
+from PySide.QtCore import Qt, SIGNAL, Signal, QObject, QThread, QSize, QTimer
 import sys
 import json
+import time
+import hashlib
 from datetime import datetime
 import shutil
 import Standard_Functions_RIbbon as StandardFunctions
 from Standard_Functions_RIbbon import CommandInfoCorrections
 import Parameters_Ribbon
 import Serialize_Ribbon
+import IconStore_Ribbon
+import Catalog_Ribbon
 import webbrowser
 import StyleMapping_Ribbon
+import CommandModel_Ribbon
+import CommandSearch_Ribbon
 
 # Get the resources
 pathIcons = Parameters_Ribbon.ICON_LOCATION
@@ -102,9 +109,8 @@ class LoadDialog(Design_ui.Ui_Form):
 
     List_IgnoredToolbars_internal = []
 
-    # Create the lists for the deserialized icons
-    List_CommandIcons = []
-    List_WorkBenchIcons = []
+    # The shared catalog with the commands, workbenches and icons
+    Catalog: Catalog_Ribbon.CommandCatalog = None
 
     # Create a tomporary list for newly added dropdown buttons
     newDDBList = []
@@ -119,6 +125,22 @@ class LoadDialog(Design_ui.Ui_Form):
         # # this will create a Qt widget from our ui file
         self.form = Gui.PySideUic.loadUi(os.path.join(pathUI, "Design.ui"))
 
+        # Create one model with all commands, shared by the command lists.
+        # Every command list gets its own filter, which hides the commands that are already selected.
+        self.CommandModel = CommandModel_Ribbon.CommandListModel(self.form)
+        # The search uses the workbench titles and tooltips as well and ranks the most used commands higher
+        self.CommandModel.SearchIndex.ExtraTextSource = self.ReturnSearchTexts
+        self.CommandModel.SearchIndex.setUsage(self.ReturnCommandUsage())
+        self.CommandFilter_QC = self.SetCommandFilter(
+            self.form.CommandsAvailable_QC, self.form.CommandsSelected_QC
+        )
+        self.CommandFilter_NP = self.SetCommandFilter(
+            self.form.CommandsAvailable_NP, self.form.NewPanel_NP
+        )
+        self.CommandFilter_DDB = self.SetCommandFilter(
+            self.form.CommandsAvailable_DDB, self.form.NewControl_DDB
+        )
+
         # Get the address of the repository address
         PackageXML = os.path.join(os.path.dirname(__file__), "package.xml")
         self.ReproAdress = StandardFunctions.ReturnXML_Value(
@@ -188,11 +210,9 @@ class LoadDialog(Design_ui.Ui_Form):
 
         # region - Load data------------------------------------------------------------------
         #
-        Data = {}
-        # read ribbon structure from JSON file
-        with open(DataFile, "r") as file:
-            Data.update(json.load(file))
-        file.close()
+        # Get the catalog with the data, shared with the ribbon
+        self.Catalog = Catalog_Ribbon.ReturnCatalog(LoadAll=True)
+        Data = self.Catalog.Data
 
         DataUpdateNeeded = False
         try:
@@ -240,9 +260,12 @@ class LoadDialog(Design_ui.Ui_Form):
             pass
 
         # Load the standard lists for Workbenches, toolbars and commands
-        self.List_Workbenches = Data["List_Workbenches"]
-        self.StringList_Toolbars = Data["StringList_Toolbars"]
-        self.List_Commands = Data["List_Commands"]
+        # Use copies, because dropdown buttons and new panels are added to these lists.
+        self.List_Workbenches = list(self.Catalog.List_Workbenches)
+        self.StringList_Toolbars = list(self.Catalog.StringList_Toolbars)
+        self.List_Commands = list(self.Catalog.List_Commands)
+        # Menu text index for List_Commands
+        self.CommandIndex = StandardFunctions.CommandListIndex(self.List_Commands)
 
         # test if List_Commands is correct
         i = 5
@@ -262,21 +285,6 @@ class LoadDialog(Design_ui.Ui_Form):
             if Answer == "yes":
                 self.on_ReloadWB_clicked()
 
-        # Load the lists for the deserialized icons
-        try:
-            for IconItem in Data["WorkBench_Icons"]:
-                Icon: QIcon = Serialize_Ribbon.deserializeIcon(IconItem[1])
-                item = [IconItem[0], Icon]
-                self.List_WorkBenchIcons.append(item)
-            # Load the lists for the deserialized icons
-            for IconItem in Data["Command_Icons"]:
-                Icon: QIcon = Serialize_Ribbon.deserializeIcon(IconItem[1])
-                item = [IconItem[0], Icon]
-                self.List_CommandIcons.append(item)
-        except Exception as e:
-            StandardFunctions.Print(f"{e.with_traceback(e.__traceback__)}", "Warning")
-            pass
-
         # check if the list with workbenches is up-to-date
         missingWB = []
         for WorkBenchName in Gui.listWorkbenches():
@@ -373,6 +381,8 @@ class LoadDialog(Design_ui.Ui_Form):
 
         # region - Load all controls------------------------------------------------------------------
         #
+        # Set the first tab activated. Only the current tab is filled, the other tabs are filled when they are opened.
+        self.form.tabWidget.setCurrentWidget(self.form.tabWidget.widget(0))
         # laod all controls
         self.LoadControls()
         # endregion-----------------------------------------------------------------------------------
@@ -472,9 +482,7 @@ class LoadDialog(Design_ui.Ui_Form):
         # Connect the filter for the quick commands on the quickcommands tab
         self.form.ListCategory_QC.currentTextChanged.connect(FilterQuickCommands_QC)
         # Connect the searchbar for the quick commands on the quick commands tab
-        self.form.SearchBar_QC.cursorPositionChanged.connect(
-            self.on_SearchBar_QC_TextChanged
-        )
+        self.form.SearchBar_QC.textChanged.connect(self.on_SearchBar_QC_TextChanged)
 
         #
         # --- ExcludePanelsTab ------------------
@@ -608,9 +616,7 @@ class LoadDialog(Design_ui.Ui_Form):
         # Connect the filter for the quick commands on the quickcommands tab
         self.form.ListCategory_NP.currentTextChanged.connect(FilterWorkbench_NP)
         # Connect the searchbar for the quick commands on the quick commands tab
-        self.form.SearchBar_NP.cursorPositionChanged.connect(
-            self.on_SearchBar_NP_TextChanged
-        )
+        self.form.SearchBar_NP.textChanged.connect(self.on_SearchBar_NP_TextChanged)
 
         #
         # --- CreateDropDownButtonTab ----------------
@@ -664,9 +670,7 @@ class LoadDialog(Design_ui.Ui_Form):
         # Connect the filter for the quick commands on the quickcommands tab
         self.form.ListCategory_DDB.currentTextChanged.connect(FilterWorkbench_DDB)
         # Connect the searchbar for the quick commands on the quick commands tab
-        self.form.SearchBar_DDB.cursorPositionChanged.connect(
-            self.on_SearchBar_DDB_TextChanged
-        )
+        self.form.SearchBar_DDB.textChanged.connect(self.on_SearchBar_DDB_TextChanged)
 
         #
         # --- RibbonDesignTab ------------------
@@ -750,6 +754,8 @@ class LoadDialog(Design_ui.Ui_Form):
 
         # # connect the change of the current tab event to a function to set the size per tab
         # self.form.tabWidget.currentChanged.connect(self.on_tabBar_currentIndexChanged)
+        # Fill the controls of a tab, the first time the tab is opened
+        self.form.tabWidget.currentChanged.connect(self.LoadTab)
 
         # Connect the cancel button
         def Cancel():
@@ -767,10 +773,6 @@ class LoadDialog(Design_ui.Ui_Form):
 
         # region - Modify controls--------------------------------------------------------------------
         #
-        # -- TabWidget
-        # Set the first tab activated
-        self.form.tabWidget.setCurrentWidget(self.form.tabWidget.widget(0))
-        #
         # -- Initial setup tab --
         self.form.DefaultButtonSize_IS_Workbenches.setItemData(
             0, "small", Qt.ItemDataRole.UserRole
@@ -821,29 +823,96 @@ class LoadDialog(Design_ui.Ui_Form):
         # Set the icon and size for the refresh button
         self.form.LoadWB.setIcon(Gui.getIcon("view-refresh"))
         self.form.LoadWB.setIconSize(QSize(20, 20))
+        self.form.LoadWB.setToolTip(
+            translate(
+                "FreeCAD Ribbon",
+                "Reload the workbenches that have changed.\n"
+                "Hold Shift to reload all workbenches.",
+            )
+        )
 
         return
 
-    def on_ReloadWB_clicked(self, resetTexts=False, RestartFreeCAD=False):
+    def on_ReloadWB_clicked(
+        self, resetTexts=False, RestartFreeCAD=False, FullReload=False
+    ):
         # minimize the dialog
         self.form.hide()
 
-        # Load the workbenches
+        # get the system language
+        FreeCAD_preferences = App.ParamGet("User parameter:BaseApp/Preferences/General")
+        FCLanguage = FreeCAD_preferences.GetString("Language")
+
+        # --- Fingerprints ---------------------------------------------------------------------------------------------
+        #
+        # Get the data of the previous reload. Workbenches with an unchanged fingerprint are taken from this data,
+        # so they don't need to be activated and their icons don't need to be serialized again.
+        OldCatalog = Catalog_Ribbon.ReturnCatalog(LoadAll=True)
+        OldData = OldCatalog.Data
+        # The stylesheet and the icon theme change the icons of all workbenches, also when they are not loaded
+        IconFormat = {
+            "Compact": Parameters_Ribbon.COMPACT_ICONS,
+            "Encoding": Parameters_Ribbon.ICON_ENCODING,
+            "StyleSheet": App.ParamGet(
+                "User parameter:BaseApp/Preferences/MainWindow"
+            ).GetString("StyleSheet"),
+            "IconTheme": QIcon.themeName(),
+        }
+        # Reload all workbenches when the reload button is clicked with the shift key pressed
+        if (
+            QGuiApplication.keyboardModifiers() & Qt.KeyboardModifier.ShiftModifier
+            == Qt.KeyboardModifier.ShiftModifier
+        ):
+            FullReload = True
+        OldFingerprints = {}
+        if (
+            FullReload is False
+            and OldData.get("dataVersion") == self.DataFileVersion
+            and OldData.get("IconFormat") == IconFormat
+        ):
+            OldFingerprints = OldData.get("Fingerprints", {})
+
+        Versions = StandardFunctions.ReturnWorkbenchVersions()
+        Fingerprints = {}
+        ChangedWorkbenches = []
+        for WorkBenchName in Gui.listWorkbenches():
+            if str(WorkBenchName) == "" or str(WorkBenchName) == "NoneWorkbench":
+                continue
+            Fingerprint = self.ReturnWorkbenchFingerprint(
+                WorkBenchName, Versions, FCLanguage
+            )
+            OldFingerprint = OldFingerprints.get(WorkBenchName)
+            if (
+                self.IsFingerprintChanged(OldFingerprint, Fingerprint) is True
+                or OldCatalog.ReturnWorkbench(WorkBenchName) is None
+            ):
+                ChangedWorkbenches.append(WorkBenchName)
+            elif Fingerprint["ToolbarItems"] == "":
+                # The workbench is not loaded. Keep the toolbar items of the previous reload
+                Fingerprint["ToolbarItems"] = OldFingerprint["ToolbarItems"]
+            Fingerprints[WorkBenchName] = Fingerprint
+        # A set for the lookups below. The list keeps the order for loading.
+        ChangedWorkbenchSet = set(ChangedWorkbenches)
+
+        # Load only the workbenches that have changed
         self.loadAllWorkbenches(
             AutoHide=False,
             FinishMessage=translate(
                 "FreeCAD Ribbon", "Ribbon UI: Data file is created."
             ),
+            WorkbenchList=ChangedWorkbenches,
         )
+        # The toolbar items are now available for the loaded workbenches
+        for WorkBenchName in ChangedWorkbenches:
+            Fingerprints[WorkBenchName] = self.ReturnWorkbenchFingerprint(
+                WorkBenchName, Versions, FCLanguage
+            )
 
         # clear the lists first
         self.List_Workbenches.clear()
         self.StringList_Toolbars.clear()
         self.List_Commands.clear()
-
-        # get the system language
-        FreeCAD_preferences = App.ParamGet("User parameter:BaseApp/Preferences/General")
-        FCLanguage = FreeCAD_preferences.GetString("Language")
+        self.CommandIndex.Reset()
 
         # --- Workbenches ----------------------------------------------------------------------------------------------
         #
@@ -853,6 +922,13 @@ class LoadDialog(Design_ui.Ui_Form):
         for WorkBenchName in List_Workbenches:
             if str(WorkBenchName) != "" or WorkBenchName is not None:
                 if str(WorkBenchName) != "NoneWorkbench":
+                    # Use the data of the previous reload, if the workbench is unchanged
+                    if WorkBenchName not in ChangedWorkbenchSet:
+                        self.List_Workbenches.append(
+                            OldCatalog.ReturnWorkbench(WorkBenchName)
+                        )
+                        continue
+
                     # Gui.activateWorkbench(WorkBenchName)
                     WorkBench = Gui.getWorkbench(WorkBenchName)
                     # Get the toolbar items
@@ -891,6 +967,15 @@ class LoadDialog(Design_ui.Ui_Form):
                 and WorkBench[0] != ""
                 and WorkBench[0] is not None
             ):
+                # Use the toolbars of the previous reload, if the workbench is unchanged.
+                # Custom toolbars have a list of commands instead of the workbench name and are added below
+                if WorkBench[0] not in ChangedWorkbenchSet:
+                    for ToolbarItem in OldCatalog.ReturnToolbarsByWorkbench(
+                        WorkBench[0]
+                    ):
+                        self.StringList_Toolbars.append(ToolbarItem)
+                    continue
+
                 # Gui.activateWorkbench(WorkBench[0])
                 wbToolbars = Gui.getWorkbench(WorkBench[0]).listToolbars()
                 # Go through the toolbars
@@ -914,12 +999,27 @@ class LoadDialog(Design_ui.Ui_Form):
         #
         # Create a list of all commands with their icon
         self.List_Commands.clear()
+        self.CommandIndex.Reset()
+        # Keep track of the commands per workbench that are added, to prevent duplicates
+        CommandKeys = set()
+        # Use the commands of the previous reload for the unchanged workbenches.
+        # Standard commands can come from any workbench, so they are kept as well.
+        ReusedCommands = set()
+        for CommandItem in OldCatalog.List_Commands:
+            if (
+                CommandItem[3] not in ChangedWorkbenchSet
+                and (CommandItem[3] in Fingerprints or CommandItem[3] == "Standard")
+                and (CommandItem[0], CommandItem[3]) not in CommandKeys
+            ):
+                self.List_Commands.append(CommandItem)
+                CommandKeys.add((CommandItem[0], CommandItem[3]))
+                ReusedCommands.add(CommandItem[0])
+
         # Create a list of command names
         CommandNames = []
-        for i in range(len(self.List_Workbenches)):
-            # Gui.activateWorkbench(self.List_Workbenches[i][0])
-            WorkBench = Gui.getWorkbench(self.List_Workbenches[i][0])
-            WorkBenchName = self.List_Workbenches[i][0]
+        for WorkBenchName in ChangedWorkbenches:
+            # Gui.activateWorkbench(WorkBenchName)
+            WorkBench = Gui.getWorkbench(WorkBenchName)
             # Get the toolbar items
             ToolbarItems: dict = WorkBench.getToolbarItems()
             # Update the toolbar items with corrections
@@ -932,13 +1032,9 @@ class LoadDialog(Design_ui.Ui_Form):
                             Item = [value[j], "Standard"]
                         else:
                             Item = [value[j], WorkBenchName]
-                        IsInList = False
-                        for CommandNamesItem in CommandNames:
-                            if CommandNamesItem == Item:
-                                IsInList = True
-                                break
-                        if IsInList is False:
+                        if (Item[0], Item[1]) not in CommandKeys:
                             CommandNames.append(Item)
+                            CommandKeys.add((Item[0], Item[1]))
 
         # Go through the list
         for CommandName in CommandNames:
@@ -974,6 +1070,9 @@ class LoadDialog(Design_ui.Ui_Form):
                 # Add children of the commands if there are any
                 if len(ChildCommands) > 0:
                     for childCommand in ChildCommands:
+                        if (childCommand[0], WorkBenchName) in CommandKeys:
+                            continue
+                        CommandKeys.add((childCommand[0], WorkBenchName))
                         self.List_Commands.append(
                             [
                                 childCommand[0],
@@ -985,36 +1084,45 @@ class LoadDialog(Design_ui.Ui_Form):
                         )
 
         # add also custom commands
+        #
+        # The workbench names per workbench title
+        WorkBenchNames = {}
+        for WorkBench in self.List_Workbenches:
+            WorkBenchNames.setdefault(WorkBench[2], []).append(WorkBench[0])
         Toolbars = self.List_ReturnCustomToolbars()
         for Toolbar in Toolbars:
             WorkbenchTitle = Toolbar[1]
-            for WorkBench in self.List_Workbenches:
-                if WorkbenchTitle == WorkBench[2]:
-                    WorkBenchName = WorkBench[0]
-                    for CustomCommand in Toolbar[2]:
-                        command = Gui.Command.get(CustomCommand)
-                        if CommandInfoCorrections(CustomCommand)["pixmap"] != "":
-                            IconName = CommandInfoCorrections(CustomCommand)["pixmap"]
-                        else:
-                            IconName = ""
-                        MenuName = CommandInfoCorrections(CustomCommand)[
-                            "menuText"
-                        ].replace("&", "")
-                        MenuNameTranslated = CommandInfoCorrections(CustomCommand)[
-                            "ActionText"
-                        ].replace("&", "")
-                        self.List_Commands.append(
-                            [
-                                CustomCommand,
-                                IconName,
-                                MenuName,
-                                WorkBenchName,
-                                MenuNameTranslated,
-                            ]
-                        )
+            for WorkBenchName in WorkBenchNames.get(WorkbenchTitle, []):
+                for CustomCommand in Toolbar[2]:
+                    if (CustomCommand, WorkBenchName) in CommandKeys:
+                        continue
+                    CommandKeys.add((CustomCommand, WorkBenchName))
+                    command = Gui.Command.get(CustomCommand)
+                    if CommandInfoCorrections(CustomCommand)["pixmap"] != "":
+                        IconName = CommandInfoCorrections(CustomCommand)["pixmap"]
+                    else:
+                        IconName = ""
+                    MenuName = CommandInfoCorrections(CustomCommand)[
+                        "menuText"
+                    ].replace("&", "")
+                    MenuNameTranslated = CommandInfoCorrections(CustomCommand)[
+                        "ActionText"
+                    ].replace("&", "")
+                    self.List_Commands.append(
+                        [
+                            CustomCommand,
+                            IconName,
+                            MenuName,
+                            WorkBenchName,
+                            MenuNameTranslated,
+                        ]
+                    )
         Toolbars = self.List_ReturnCustomToolbars_Global()
         for Toolbar in Toolbars:
             for CustomCommand in Toolbar[2]:
+                if (CustomCommand, Toolbar[1]) in CommandKeys:
+                    continue
+                CommandKeys.add((CustomCommand, Toolbar[1]))
                 command = Gui.Command.get(CustomCommand)
                 if CommandInfoCorrections(CustomCommand)["pixmap"] != "":
                     IconName = CommandInfoCorrections(CustomCommand)["pixmap"]
@@ -1043,6 +1151,9 @@ class LoadDialog(Design_ui.Ui_Form):
                 "Std_BoxSelection",
             ]
             for CommandName in ListCommands:
+                if (CommandName, "Standard") in CommandKeys:
+                    continue
+                CommandKeys.add((CommandName, "Standard"))
                 command = Gui.Command.get(CommandName)
                 if CommandInfoCorrections(CommandName)["pixmap"] != "":
                     IconName = CommandInfoCorrections(CommandName)["pixmap"]
@@ -1063,39 +1174,66 @@ class LoadDialog(Design_ui.Ui_Form):
 
         # --- Serialize Icons ------------------------------------------------------------------------------------------
         #
-        WorkbenchIcon = []
+        # In the compact format, identical pixmaps are stored only once for all icons
+        Pixmaps = {}
+        Compact = Parameters_Ribbon.COMPACT_ICONS
+        Encoding = Parameters_Ribbon.ICON_ENCODING
+        # Keep the icons, to add them to the catalog afterwards
+        Dict_WorkBenchIcons = {}
+        Dict_CommandIcons = {}
+        # The serialized icons of unchanged workbenches and commands are copied from the previous reload
+        Dict_SerializedWorkbenchIcons = {}
+        Dict_SerializedCommandIcons = {}
+        # Only collect the icons here. The encoding is done in parallel by Serialize_Ribbon.serializeIcons
         for WorkBenchItem in self.List_Workbenches:
             WorkBenchName = WorkBenchItem[0]
+            if WorkBenchName not in ChangedWorkbenchSet:
+                SerializedIcon = OldCatalog.ReturnSerializedIcon(
+                    WorkBenchName, IconStore_Ribbon.SECTION_WORKBENCHES, Pixmaps
+                )
+                if SerializedIcon is not None:
+                    Dict_SerializedWorkbenchIcons[WorkBenchName] = SerializedIcon
+                    continue
             Icon = Gui.getIcon(WorkBenchItem[1])
             if Icon is not None and Icon.isNull() is False:
-                try:
-                    SerializedIcon = Serialize_Ribbon.serializeIcon(Icon)
-
-                    WorkbenchIcon.append([WorkBenchName, SerializedIcon])
-                    # add the icons also to the deserialized list
-                    self.List_WorkBenchIcons.append([WorkBenchName, Icon])
-                except Exception as e:
-                    if Parameters_Ribbon.DEBUG_MODE is True:
-                        StandardFunctions.Print(
-                            f"{e.with_traceback(e.__traceback__)}", "Warning"
-                        )
+                Dict_WorkBenchIcons[WorkBenchName] = Icon
 
-        CommandIcons = []
         for CommandItem in self.List_Commands:
             CommandName = CommandItem[0]
+            if (
+                CommandName in Dict_CommandIcons
+                or CommandName in Dict_SerializedCommandIcons
+            ):
+                continue
+            if CommandName in ReusedCommands:
+                SerializedIcon = OldCatalog.ReturnSerializedIcon(
+                    CommandName, IconStore_Ribbon.SECTION_COMMANDS, Pixmaps
+                )
+                if SerializedIcon is not None:
+                    Dict_SerializedCommandIcons[CommandName] = SerializedIcon
+                    continue
             Icon = StandardFunctions.returnQiCons_Commands(CommandName, CommandItem[1])
             if Icon is not None and Icon.isNull() is False:
-                try:
-                    SerializedIcon = Serialize_Ribbon.serializeIcon(Icon)
-
-                    CommandIcons.append([CommandName, SerializedIcon])
-                    # add the icons also to the deserialized list
-                    self.List_CommandIcons.append([CommandName, Icon])
-                except Exception as e:
-                    if Parameters_Ribbon.DEBUG_MODE is True:
-                        StandardFunctions.Print(
-                            f"{e.with_traceback(e.__traceback__)}", "Warning"
-                        )
+                Dict_CommandIcons[CommandName] = Icon
+
+        WorkbenchIcon = list(Dict_SerializedWorkbenchIcons.items())
+        WorkbenchIcon.extend(
+            Serialize_Ribbon.serializeIcons(
+                list(Dict_WorkBenchIcons.items()),
+                Compact=Compact,
+                Pool=Pixmaps,
+                Encoding=Encoding,
+            )
+        )
+        CommandIcons = list(Dict_SerializedCommandIcons.items())
+        CommandIcons.extend(
+            Serialize_Ribbon.serializeIcons(
+                list(Dict_CommandIcons.items()),
+                Compact=Compact,
+                Pool=Pixmaps,
+                Encoding=Encoding,
+            )
+        )
 
         # Write the lists to a data file
         #
@@ -1111,14 +1249,17 @@ class LoadDialog(Design_ui.Ui_Form):
         Data["List_Workbenches"] = self.List_Workbenches
         Data["StringList_Toolbars"] = self.StringList_Toolbars
         Data["List_Commands"] = self.List_Commands
-        Data["WorkBench_Icons"] = WorkbenchIcon
-        Data["Command_Icons"] = CommandIcons
+        Data["Fingerprints"] = Fingerprints
+        Data["IconFormat"] = IconFormat
         # Write to the data file
         DataFile = os.path.join(os.path.dirname(__file__), "RibbonDataFile.dat")
         with open(DataFile, "w") as outfile:
             json.dump(Data, outfile, indent=4)
         outfile.close()
 
+        # Write the icons to a binary icon store. This can be memory-mapped and read one icon at a time
+        IconStore_Ribbon.WriteIconStore(WorkbenchIcon, CommandIcons, Pixmaps=Pixmaps)
+
         # Write a second data file with the list of commands, Language and data version only
         Data2 = {}
         Data2["dataVersion"] = self.DataFileVersion
@@ -1130,6 +1271,14 @@ class LoadDialog(Design_ui.Ui_Form):
             json.dump(Data2, outfile, indent=4)
         outfile.close()
 
+        # Reload the shared catalog and add the icons that are already deserialized
+        Catalog_Ribbon.ResetCatalog()
+        Catalog = Catalog_Ribbon.ReturnCatalog(LoadAll=True)
+        for WorkBenchName, Icon in Dict_WorkBenchIcons.items():
+            Catalog.AddWorkbenchIcon(WorkBenchName, Icon)
+        for CommandName, Icon in Dict_CommandIcons.items():
+            Catalog.AddCommandIcon(CommandName, Icon)
+
         # Write a time stamp to preferences
         TimeStamp = datetime.now().strftime("%B %d, %Y, %H:%M:%S")
         Parameters_Ribbon.Settings.SetStringSetting("ReloadTimeStamp", TimeStamp)
@@ -1179,6 +1328,55 @@ class LoadDialog(Design_ui.Ui_Form):
                 StandardFunctions.restart_freecad()
         return
 
+    def ReturnWorkbenchFingerprint(self, WorkBenchName, Versions: dict, Language: str):
+        """
+        Returns the fingerprint of a workbench. When it changes, the data of the workbench must be reloaded.
+
+        Args:
+            WorkBenchName (str): The name of the workbench
+            Versions (dict): The versions of the addons, from StandardFunctions.ReturnWorkbenchVersions()
+            Language (str): The FreeCAD language
+
+        Returns:
+            dict: {"Version", "Language", "ToolbarItems"}.
+            "ToolbarItems" is a hash of the toolbar items, or empty if the workbench is not loaded yet.
+        """
+        Version = Versions.get(WorkBenchName)
+        if Version is None:
+            # Workbenches without a package.xml are versioned with FreeCAD
+            Version = ".".join(App.Version()[0:3])
+
+        ToolbarItems = ""
+        try:
+            Items: dict = Gui.getWorkbench(WorkBenchName).getToolbarItems()
+            if len(Items) > 0:
+                ToolbarItems = hashlib.sha1(
+                    json.dumps(Items, sort_keys=True).encode("utf-8")
+                ).hexdigest()
+        except Exception:
+            pass
+
+        return {"Version": Version, "Language": Language, "ToolbarItems": ToolbarItems}
+
+    def IsFingerprintChanged(self, OldFingerprint: dict, Fingerprint: dict) -> bool:
+        """
+        Compares the fingerprint of a workbench with the one from the previous reload.
+        The toolbar items are only compared when the workbench is loaded.
+        """
+        if OldFingerprint is None:
+            return True
+        if (
+            OldFingerprint.get("Version") != Fingerprint["Version"]
+            or OldFingerprint.get("Language") != Fingerprint["Language"]
+        ):
+            return True
+        if (
+            Fingerprint["ToolbarItems"] != ""
+            and OldFingerprint.get("ToolbarItems") != Fingerprint["ToolbarItems"]
+        ):
+            return True
+        return False
+
     # region - Control functions----------------------------------------------------------------------
     # Add all toolbars of the selected workbench to the toolbar list(QComboBox)
     #
@@ -1237,7 +1435,8 @@ class LoadDialog(Design_ui.Ui_Form):
 
     def on_ExportLayout_IS_clicked(self):
         # Update the ribbon structure file before copy
-        self.WriteJson()
+        if self.WriteJson() is False:
+            return
         FileName = StandardFunctions.GetFileDialog(
             Filter="RibbonStructure (*.json)",
             parent=self.form,
@@ -1407,24 +1606,21 @@ class LoadDialog(Design_ui.Ui_Form):
     # region - QuickCommands tab
     def on_ListCategory_QC_TextChanged(self):
         self.FilterCommands_ListCategory(
-            self.form.CommandsAvailable_QC,
+            self.CommandFilter_QC,
             self.form.ListCategory_QC,
-            self.form.SearchBar_QC,
         )
         return
 
     def on_SearchBar_QC_TextChanged(self):
         self.FilterCommands_SearchBar(
-            self.form.CommandsAvailable_QC,
+            self.CommandFilter_QC,
             self.form.SearchBar_QC,
-            self.form.CommandsSelected_QC,
-            self.form.ListCategory_QC,
         )
         return
 
     def on_AddCommand_QC_clicked(self):
-        self.AddItem(
-            SourceWidget=self.form.CommandsAvailable_QC,
+        self.AddCommands(
+            SourceView=self.form.CommandsAvailable_QC,
             DestinationWidget=self.form.CommandsSelected_QC,
         )
 
@@ -1435,10 +1631,7 @@ class LoadDialog(Design_ui.Ui_Form):
         return
 
     def on_RemoveCommand_QC_clicked(self):
-        self.AddItem(
-            SourceWidget=self.form.CommandsSelected_QC,
-            DestinationWidget=self.form.CommandsAvailable_QC,
-        )
+        self.RemoveCommands(SourceWidget=self.form.CommandsSelected_QC)
 
         # Enable the apply button
         if self.CheckChanges() is True:
@@ -1782,10 +1975,7 @@ class LoadDialog(Design_ui.Ui_Form):
                                 MenuName = ToolbarCommand[4].replace("&", "")
 
                                 # get the icon for this command if there isn't one, leave it None
-                                Icon = QIcon()
-                                for item in self.List_CommandIcons:
-                                    if item[0] == ToolbarCommand[0]:
-                                        Icon = item[1]
+                                Icon = self.ReturnCommandIcon(ToolbarCommand[0])
                                 if Icon is None:
                                     Command = Gui.Command.get(CommandName)
                                     if Command is not None:
@@ -1998,10 +2188,7 @@ class LoadDialog(Design_ui.Ui_Form):
                                         ListWidgetItem.setData(
                                             Qt.ItemDataRole.UserRole, CommandItem
                                         )
-                                        Icon = QIcon()
-                                        for item in self.List_CommandIcons:
-                                            if item[0] == CommandItem[0]:
-                                                Icon = item[1]
+                                        Icon = self.ReturnCommandIcon(CommandItem[0])
                                         if Icon is None:
                                             Icon = Gui.getIcon(CommandItem[1])
                                         if Icon is not None:
@@ -2389,10 +2576,7 @@ class LoadDialog(Design_ui.Ui_Form):
                                     ListWidgetItem.setData(
                                         Qt.ItemDataRole.UserRole, CommandName
                                     )
-                                    Icon = QIcon()
-                                    for item in self.List_CommandIcons:
-                                        if item[0] == Commands[0][0]:
-                                            Icon = item[1]
+                                    Icon = self.ReturnCommandIcon(Commands[0][0])
                                     if Icon is None:
                                         for CommandItem in self.List_Commands:
                                             if Commands[0][0] == CommandItem[0]:
@@ -2427,10 +2611,7 @@ class LoadDialog(Design_ui.Ui_Form):
                                             ListWidgetItem.setData(
                                                 Qt.ItemDataRole.UserRole, CommandName
                                             )
-                                            Icon = None
-                                            for item in self.List_CommandIcons:
-                                                if item[0] == CommandName:
-                                                    Icon = item[1]
+                                            Icon = self.ReturnCommandIcon(CommandName)
                                             if Icon is None:
                                                 IconName = StandardFunctions.CommandInfoCorrections(
                                                     CommandName
@@ -2461,24 +2642,21 @@ class LoadDialog(Design_ui.Ui_Form):
 
     def on_ListCategory_NP_TextChanged(self):
         self.FilterCommands_ListCategory(
-            self.form.CommandsAvailable_NP,
+            self.CommandFilter_NP,
             self.form.ListCategory_NP,
-            self.form.SearchBar_NP,
         )
         return
 
     def on_SearchBar_NP_TextChanged(self):
         self.FilterCommands_SearchBar(
-            self.form.CommandsAvailable_NP,
+            self.CommandFilter_NP,
             self.form.SearchBar_NP,
-            self.form.NewPanel_NP,
-            self.form.ListCategory_NP,
         )
         return
 
     def on_AddCommand_NP_clicked(self):
-        self.AddItem(
-            SourceWidget=self.form.CommandsAvailable_NP,
+        self.AddCommands(
+            SourceView=self.form.CommandsAvailable_NP,
             DestinationWidget=self.form.NewPanel_NP,
         )
 
@@ -2489,11 +2667,7 @@ class LoadDialog(Design_ui.Ui_Form):
         return
 
     def on_RemoveCommand_NP_clicked(self):
-        self.AddItem(
-            SourceWidget=self.form.NewPanel_NP,
-            DestinationWidget=self.form.CommandsAvailable_NP,
-            CheckIfInList=False,
-        )
+        self.RemoveCommands(SourceWidget=self.form.NewPanel_NP)
 
         # Enable the apply button
         if self.CheckChanges() is True:
@@ -2575,11 +2749,8 @@ class LoadDialog(Design_ui.Ui_Form):
 
         # Add the dropdown button to the command list widgets
         FirstCommand = DropDownButton[0][0]
-        Icon = None
         IconName = ""
-        for item in self.List_CommandIcons:
-            if item[0] == FirstCommand:
-                Icon = item[1]
+        Icon = self.ReturnCommandIcon(FirstCommand)
         if Icon is None:
             IconName = ""
             for CommandItem in self.List_Commands:
@@ -2588,15 +2759,12 @@ class LoadDialog(Design_ui.Ui_Form):
                         "pixmap"
                     ]
             Icon = StandardFunctions.returnQiCons_Commands(FirstCommand, IconName)
-        ListWidgetItem = QListWidgetItem()
-        ListWidgetItem.setText(DropDownName)
-        ListWidgetItem.setData(Qt.ItemDataRole.UserRole, DropDownName + Suffix)
-        if Icon is not None:
-            ListWidgetItem.setIcon(Icon)
-        # Add the ListWidgetItem to the several listWidgets
-        self.form.CommandsAvailable_QC.addItem(ListWidgetItem)
-        self.form.CommandsAvailable_NP.addItem(ListWidgetItem.clone())
-        self.form.CommandsAvailable_DDB.addItem(ListWidgetItem.clone())
+        # Add the dropdown button to the command model, which is shared by the command lists
+        self.CommandModel.addRow(
+            CommandModel_Ribbon.CreateRow(
+                DropDownName + Suffix, DropDownName, "General", Icon
+            )
+        )
 
         # Add the command to the list of commands
         self.List_Commands.append(
@@ -2634,23 +2802,17 @@ class LoadDialog(Design_ui.Ui_Form):
                 # If the DropDownButton is equal to the text in the combobox, go through its commands
                 if DropDownButton == DropDownControl:
                     for CommandName in Commands:
-                        for i in range(self.form.CommandsAvailable_DDB.count()):
-                            ListWidgetItem = self.form.CommandsAvailable_DDB.item(i)
-
-                            # If the command is equal to one in the commandsavaialble listwidget,
-                            # Move it to the listwidget for the dropdown button.
-                            if (
-                                ListWidgetItem.data(Qt.ItemDataRole.UserRole)
-                                == CommandName[0]
-                            ):
-                                self.form.NewControl_DDB.addItem(ListWidgetItem.clone())
-                                self.form.CommandsAvailable_DDB.removeItemWidget(
-                                    ListWidgetItem
-                                )
-                                # load the text as well
-                                self.form.ControlName_DDB.setText(
-                                    DropDownControl.split("_")[0]
-                                )
+                        # If the command is in the command model, add it to the listwidget for the dropdown button.
+                        # The filter of the available commands hides it then.
+                        Row = self.CommandModel.ReturnRow(CommandName[0])
+                        if Row is not None:
+                            self.form.NewControl_DDB.addItem(
+                                self.ReturnListWidgetItem(Row)
+                            )
+                            # load the text as well
+                            self.form.ControlName_DDB.setText(
+                                DropDownControl.split("_")[0]
+                            )
 
         return
 
@@ -2695,25 +2857,22 @@ class LoadDialog(Design_ui.Ui_Form):
 
     def on_ListCategory_DDB_TextChanged(self):
         self.FilterCommands_ListCategory(
-            self.form.CommandsAvailable_DDB,
+            self.CommandFilter_DDB,
             self.form.ListCategory_DDB,
-            self.form.SearchBar_DDB,
         )
         return
 
     def on_SearchBar_DDB_TextChanged(self):
         self.FilterCommands_SearchBar(
-            self.form.CommandsAvailable_DDB,
+            self.CommandFilter_DDB,
             self.form.SearchBar_DDB,
-            self.form.NewControl_DDB,
-            self.form.ListCategory_DDB,
         )
         return
 
     def on_AddCommand_DDB_clicked(self):
         Filter = [self.form.CommandList_DDB.currentText() + "_ddb"]
-        self.AddItem(
-            SourceWidget=self.form.CommandsAvailable_DDB,
+        self.AddCommands(
+            SourceView=self.form.CommandsAvailable_DDB,
             DestinationWidget=self.form.NewControl_DDB,
             ExcludedItems=Filter,
         )
@@ -2725,10 +2884,7 @@ class LoadDialog(Design_ui.Ui_Form):
         return
 
     def on_RemoveCommand_DDB_clicked(self):
-        self.AddItem(
-            SourceWidget=self.form.NewControl_DDB,
-            DestinationWidget=self.form.CommandsAvailable_DDB,
-        )
+        self.RemoveCommands(SourceWidget=self.form.NewControl_DDB)
 
         # Enable the apply button
         if self.CheckChanges() is True:
@@ -3053,7 +3209,7 @@ class LoadDialog(Design_ui.Ui_Form):
                     Order = []
                     for j in range(self.form.CommandTable_RD.rowCount()):
                         Order.append(
-                            QTableWidgetItem(self.form.CommandTable_RD.item(j, 0)).data(
+                            self.form.CommandTable_RD.item(j, 0).data(
                                 Qt.ItemDataRole.UserRole
                             )
                         )
@@ -3118,23 +3274,7 @@ class LoadDialog(Design_ui.Ui_Form):
                             CommandName, pixmap=IconName
                         )
                         if Icon is None:
-                            for item in self.List_CommandIcons:
-                                if item[0] == CommandName:
-                                    Icon = item[1]
-                                    break
-                                if (
-                                    CommandName.endswith("_ddb")
-                                    and "dropdownButtons" in self.Dict_DropDownButtons
-                                ):
-                                    for (
-                                        DropDownCommand,
-                                        Commands,
-                                    ) in self.Dict_DropDownButtons[
-                                        "dropdownButtons"
-                                    ].items():
-                                        if Commands[0][0] == item[0]:
-                                            Icon = item[1]
-                                            break
+                            Icon = self.ReturnCommandIcon(CommandName)
 
                         # Set the default check states
                         checked_small = Qt.CheckState.Checked
@@ -3262,9 +3402,9 @@ class LoadDialog(Design_ui.Ui_Form):
                         Order = []
                         for j in range(self.form.CommandTable_RD.rowCount()):
                             Order.append(
-                                QTableWidgetItem(
-                                    self.form.CommandTable_RD.item(j, 0)
-                                ).data(Qt.ItemDataRole.UserRole)
+                                self.form.CommandTable_RD.item(j, 0).data(
+                                    Qt.ItemDataRole.UserRole
+                                )
                             )
 
                         # Add or update the dict for the Ribbon command panel
@@ -3363,9 +3503,7 @@ class LoadDialog(Design_ui.Ui_Form):
         Order = []
         for i in range(self.form.CommandTable_RD.rowCount()):
             Order.append(
-                QTableWidgetItem(self.form.CommandTable_RD.item(i, 0)).data(
-                    Qt.ItemDataRole.UserRole
-                )
+                self.form.CommandTable_RD.item(i, 0).data(Qt.ItemDataRole.UserRole)
             )
 
         # Add or update the dict for the Ribbon command panel
@@ -3666,14 +3804,17 @@ class LoadDialog(Design_ui.Ui_Form):
 
     @staticmethod
     def on_UpdateJson_clicked(self):
-        self.WriteJson()
+        if self.WriteJson() is False:
+            return
         # Set the button disabled
         self.form.UpdateJson.setDisabled(True)
         return
 
     @staticmethod
     def on_Close_clicked(self):
-        self.WriteJson()
+        # Keep the dialog open when the layout is not saved
+        if self.WriteJson() is False:
+            return
 
         # Set the size of the window to the previous state
         Parameters_Ribbon.Settings.SetIntSetting(
@@ -3721,7 +3862,8 @@ class LoadDialog(Design_ui.Ui_Form):
 
     # region - Functions------------------------------------------------------------------------------
     def addWorkbenches(self):
-        ShadowList = []  # List to add the commands and prevent duplicates
+        ShadowList = set()  # Set to add the workbenches and prevent duplicates
+        IgnoredWorkbenches = set(self.List_IgnoredWorkbenches)
 
         # Fill the Workbenches available, selected and workbench list
         self.form.WorkbenchList_IS.clear()
@@ -3764,13 +3906,10 @@ class LoadDialog(Design_ui.Ui_Form):
             WorkbenchName = workbench[0]
             WorkbenchTitle = workbench[2]
 
-            if [WorkbenchName, WorkbenchTitle] not in ShadowList:
+            if (WorkbenchName, WorkbenchTitle) not in ShadowList:
                 # Default a workbench is selected
                 # if in List_IgnoredWorkbenches, set IsSelected to false
-                IsSelected = True
-                for IgnoredWorkbench in self.List_IgnoredWorkbenches:
-                    if WorkbenchTitle == IgnoredWorkbench:
-                        IsSelected = False
+                IsSelected = WorkbenchTitle not in IgnoredWorkbenches
 
                 # Get the translate worbench title
                 if len(workbench) == 5:
@@ -3782,10 +3921,7 @@ class LoadDialog(Design_ui.Ui_Form):
                 ListWidgetItem_IW = QListWidgetItem()
                 ListWidgetItem_IW.setText(WorkbenchTitle)
                 ListWidgetItem_IW.setData(Qt.ItemDataRole.UserRole, workbench)
-                Icon = QIcon()
-                for item in self.List_WorkBenchIcons:
-                    if item[0] == WorkbenchName:
-                        Icon = item[1]
+                Icon = self.Catalog.ReturnWorkbenchIcon(WorkbenchName, Lazy=True)
                 if Icon is None:
                     Icon = Gui.getIcon(workbench[1])
 
@@ -3845,7 +3981,7 @@ class LoadDialog(Design_ui.Ui_Form):
                     workbench,
                 )
 
-            ShadowList.append([WorkbenchName, WorkbenchTitle])
+            ShadowList.add((WorkbenchName, WorkbenchTitle))
 
         self.form.ListCategory_QC.setCurrentText(All_KeyWord)
         self.form.ListCategory_EP.setCurrentText(All_KeyWord)
@@ -3870,11 +4006,12 @@ class LoadDialog(Design_ui.Ui_Form):
         self.form.PanelsToExclude_EP.clear()
         self.form.PanelsExcluded_EP.clear()
 
+        IgnoredToolbars = set(self.List_IgnoredToolbars)
+        # Sets with the toolbars in both lists, to prevent duplicates
+        ToolbarsToExclude = set()
+        ToolbarsExcluded = set()
         for Toolbar in self.StringList_Toolbars:
-            IsSelected = False
-            for IgnoredToolbar in self.List_IgnoredToolbars:
-                if Toolbar[0] == IgnoredToolbar:
-                    IsSelected = True
+            IsSelected = Toolbar[0] in IgnoredToolbars
 
             if Toolbar[0] != "":
                 # Get the translated toolbar name
@@ -3886,35 +4023,23 @@ class LoadDialog(Design_ui.Ui_Form):
                 ListWidgetItem = QListWidgetItem()
                 ListWidgetItem.setText(ToolbarTransLated.replace("&", ""))
                 ListWidgetItem.setData(Qt.ItemDataRole.UserRole, Toolbar[0])
-                if IsSelected is False:
-                    IsInlist = False
-                    for i in range(self.form.PanelsToExclude_EP.count()):
-                        ToolbarItem = self.form.PanelsToExclude_EP.item(i)
-                        if ToolbarItem.data(Qt.ItemDataRole.UserRole) == Toolbar[0]:
-                            IsInlist = True
-
-                    if IsInlist is False:
-                        self.form.PanelsToExclude_EP.addItem(ListWidgetItem)
-                if IsSelected is True:
-                    IsInlist = False
-                    for i in range(self.form.PanelsExcluded_EP.count()):
-                        ToolbarItem = self.form.PanelsExcluded_EP.item(i)
-                        if ToolbarItem.data(Qt.ItemDataRole.UserRole) == Toolbar[0]:
-                            IsInlist = True
-
-                    if IsInlist is False:
-                        self.form.PanelsExcluded_EP.addItem(ListWidgetItem)
+                if IsSelected is False and Toolbar[0] not in ToolbarsToExclude:
+                    self.form.PanelsToExclude_EP.addItem(ListWidgetItem)
+                    ToolbarsToExclude.add(Toolbar[0])
+                if IsSelected is True and Toolbar[0] not in ToolbarsExcluded:
+                    self.form.PanelsExcluded_EP.addItem(ListWidgetItem)
+                    ToolbarsExcluded.add(Toolbar[0])
         return
 
     def LoadCommands(self):
-        """Fill the Quick Commands Available and Selected"""
-        self.form.CommandsAvailable_QC.clear()
+        """Fill the command model and the selected Quick Commands"""
         self.form.CommandsSelected_QC.clear()
-        self.form.CommandsAvailable_DDB.clear()
-        self.form.CommandsAvailable_NP.clear()
         self.form.CommandList_DDB.clear()
 
-        ShadowList = []  # List to add the commands and prevent duplicates
+        Rows = []
+        RowCommands = set()  # Set of commands in the rows
+        ShadowList = set()  # Set to add the commands and prevent duplicates
+        QuickCommands = set(self.List_QuickAccessCommands)
 
         for CommandItem in self.List_Commands:
             CommandName = CommandItem[0]
@@ -3926,20 +4051,7 @@ class LoadDialog(Design_ui.Ui_Form):
 
             if MenuNameTranslated != "":
                 if f"{MenuNameTranslated}" not in ShadowList:
-                    Icon = None
-                    for item in self.List_CommandIcons:
-                        if item[0] == CommandName:
-                            Icon = item[1]
-                        if (
-                            str(CommandName).endswith("_ddb")
-                            and "dropdownButtons" in self.Dict_DropDownButtons
-                        ):
-                            for (
-                                DropDownCommand,
-                                Commands,
-                            ) in self.Dict_DropDownButtons["dropdownButtons"].items():
-                                if Commands[0][0] == item[0]:
-                                    Icon = item[1]
+                    Icon = self.ReturnCommandIcon(CommandName)
                     if Icon is None:
                         IconName = StandardFunctions.CommandInfoCorrections(
                             CommandName
@@ -3958,53 +4070,20 @@ class LoadDialog(Design_ui.Ui_Form):
                             CommandName, IconName
                         )
 
-                    Text = MenuNameTranslated
-                    ListWidgetItem = QListWidgetItem()
-                    ListWidgetItem.setText(Text)
-                    ListWidgetItem.setData(Qt.ItemDataRole.UserRole, CommandName)
-                    if Icon is not None:
-                        ListWidgetItem.setIcon(Icon)
-                        ListWidgetItem.setToolTip(
-                            CommandName
-                        )  # Use the tooltip to store the actual command.
-
-                    # Add the ListWidgetItem to the correct ListWidget
-                    #
-                    # Default a command is not selected
-                    IsSelected = False
-                    for QuickCommand in self.List_QuickAccessCommands:
-                        if CommandItem[0] == QuickCommand:
-                            IsSelected = True
-
-                    if Icon is not None:
-                        if IsSelected is False:
-                            IsInlist = False
-                            for i in range(self.form.CommandsAvailable_QC.count()):
-                                Command = self.form.CommandsAvailable_QC.item(i)
-                                if (
-                                    Command.data(Qt.ItemDataRole.UserRole)
-                                    == CommandName
-                                ):
-                                    IsInlist = True
-
-                            if IsInlist is False:
-                                self.form.CommandsAvailable_QC.addItem(ListWidgetItem)
-                        if IsSelected is True:
-                            IsInlist = False
-                            for i in range(self.form.CommandsSelected_QC.count()):
-                                Command = self.form.CommandsSelected_QC.item(i)
-                                if (
-                                    Command.data(Qt.ItemDataRole.UserRole)
-                                    == CommandName
-                                ):
-                                    IsInlist = True
-
-                            if IsInlist is False:
-                                self.form.CommandsSelected_QC.addItem(ListWidgetItem)
+                    # Add the command once to the command model.
+                    # The command lists show it, unless it is in their list with selected commands.
+                    if Icon is not None and CommandName not in RowCommands:
+                        Row = CommandModel_Ribbon.CreateRow(
+                            CommandName, MenuNameTranslated, CommandItem[3], Icon
+                        )
+                        Rows.append(Row)
+                        RowCommands.add(CommandName)
 
-                        # Add clones of the listWidgetItem to the other listwidgets
-                        self.form.CommandsAvailable_NP.addItem(ListWidgetItem.clone())
-                        self.form.CommandsAvailable_DDB.addItem(ListWidgetItem.clone())
+                        # Add the selected quick commands to the list with selected commands
+                        if CommandName in QuickCommands:
+                            self.form.CommandsSelected_QC.addItem(
+                                self.ReturnListWidgetItem(Row)
+                            )
 
                     # If there are any dropdown buttons in the json file, add them to the dropdown list
                     if (
@@ -4015,7 +4094,11 @@ class LoadDialog(Design_ui.Ui_Form):
                             CommandName.replace("_ddb", "")
                         )
 
-            ShadowList.append(f"{MenuNameTranslated}")
+            ShadowList.add(f"{MenuNameTranslated}")
+
+        self.CommandModel.setRows(Rows)
+        # Build the search index when the dialog is idle, so the first search does not have to
+        QTimer.singleShot(0, self.BuildSearchIndex)
 
         # Add a "new" item to the dropdown list
         self.form.CommandList_DDB.addItem(translate("FreeCAD Ribbon", "New"), "new")
@@ -4027,8 +4110,13 @@ class LoadDialog(Design_ui.Ui_Form):
         self.form.CustomToolbarSelector_CP.clear()
         self.form.CustomToolbarSelector_NP.clear()
 
+        # The workbench titles per workbench name
+        WorkBenchTitles = {}
+        for WorkBenchItem in self.List_Workbenches:
+            WorkBenchTitles[WorkBenchItem[0]] = WorkBenchItem[2]
+
         # -- Initial setup tab --
-        ShadowList = []  # List to add the commands and prevent duplicates
+        ShadowList = set()  # Set to add the toolbars and prevent duplicates
         for ToolBarItem in self.StringList_Toolbars:
             if ToolBarItem[0] not in ShadowList and ToolBarItem[0] != "":
                 # Get the translated toolbar name
@@ -4043,7 +4131,7 @@ class LoadDialog(Design_ui.Ui_Form):
 
                 self.form.Panels_IS.addItem(ListWidgetItem)
 
-                ShadowList.append(ToolBarItem[0])
+                ShadowList.add(ToolBarItem[0])
 
         # -- Custom panel tab --
         self.form.CustomToolbarSelector_CP.addItem(
@@ -4051,10 +4139,7 @@ class LoadDialog(Design_ui.Ui_Form):
         )
         try:
             for WorkBenchName in self.Dict_CustomToolbars["customToolbars"]:
-                WorkBenchTitle = ""
-                for WorkBenchItem in self.List_Workbenches:
-                    if WorkBenchItem[0] == WorkBenchName:
-                        WorkBenchTitle = WorkBenchItem[2]
+                WorkBenchTitle = WorkBenchTitles.get(WorkBenchName, "")
                 for CustomPanelTitle in self.Dict_CustomToolbars["customToolbars"][
                     WorkBenchName
                 ]:
@@ -4072,10 +4157,7 @@ class LoadDialog(Design_ui.Ui_Form):
         # -- Load the newPanels --
         try:
             for WorkBenchName in self.Dict_NewPanels["newPanels"]:
-                WorkBenchTitle = ""
-                for WorkBenchItem in self.List_Workbenches:
-                    if WorkBenchItem[0] == WorkBenchName:
-                        WorkBenchTitle = WorkBenchItem[2]
+                WorkBenchTitle = WorkBenchTitles.get(WorkBenchName, "")
                 if WorkBenchName == "Global":
                     WorkBenchTitle = WorkBenchName
 
@@ -4144,17 +4226,18 @@ class LoadDialog(Design_ui.Ui_Form):
                                 if CommandItem[0] == Commands[0][0]:
                                     IconName = CommandItem[1]
                 else:
-                    for i3 in range(len(self.List_Commands)):
-                        if MenuName == self.List_Commands[i3][2]:
-                            if len(self.List_Commands[i3][0].split(", ")) <= 1:
+                    # Get the commands with this menu text from the index
+                    for CommandItem in self.CommandIndex.ReturnItems(MenuName):
+                        if MenuName == CommandItem[2]:
+                            if len(CommandItem[0].split(", ")) <= 1:
                                 if (
-                                    WorkBenchName == self.List_Commands[i3][3]
-                                    or self.List_Commands[i3][3] == "Global"
+                                    WorkBenchName == CommandItem[3]
+                                    or CommandItem[3] == "Global"
                                 ):
-                                    CommandName = self.List_Commands[i3][0]
-                                    IconName = self.List_Commands[i3][1]
-                            if len(self.List_Commands[i3][0].split(", ")) > 1:
-                                CommandName = self.List_Commands[i3][0]
+                                    CommandName = CommandItem[0]
+                                    IconName = CommandItem[1]
+                            if len(CommandItem[0].split(", ")) > 1:
+                                CommandName = CommandItem[0]
 
                 # Go through the cells in the row. If checkstate is checked, uncheck the other cells in the row
                 for i6 in range(1, self.form.CommandTable_RD.columnCount()):
@@ -4172,7 +4255,7 @@ class LoadDialog(Design_ui.Ui_Form):
                 Order = []
                 for i7 in range(1, self.form.CommandTable_RD.rowCount()):
                     Order.append(
-                        QTableWidgetItem(self.form.CommandTable_RD.item(i7, 0)).data(
+                        self.form.CommandTable_RD.item(i7, 0).data(
                             Qt.ItemDataRole.UserRole
                         )
                     )
@@ -4285,6 +4368,19 @@ class LoadDialog(Design_ui.Ui_Form):
         FreeCAD_preferences = App.ParamGet("User parameter:BaseApp/Preferences/General")
         FCLanguage = FreeCAD_preferences.GetString("Language")
 
+        # The lists are read from the controls and filling a tab can add defaults to the dicts.
+        # Fill the tabs that are not opened yet, so the result is the same as when all tabs are opened.
+        for i in range(self.form.tabWidget.count()):
+            self.LoadTab(i)
+        # If a tab could not be filled, its controls are empty. Writing them would remove its settings.
+        if len(self.FailedTabParts) > 0:
+            message = translate(
+                "FreeCAD Ribbon",
+                "Not all tabs could be loaded. The ribbon layout is not saved.\nSee the report view for details.",
+            )
+            StandardFunctions.Mbox(message, "FreeCAD Ribbon", 0, "Warning")
+            return False
+
         # Create the internal lists
         List_IgnoredToolbars = []
         List_IconOnly_Toolbars = []
@@ -4336,8 +4432,19 @@ class LoadDialog(Design_ui.Ui_Form):
         # get the path for the Json file
         JsonFile = Parameters_Ribbon.RIBBON_STRUCTURE_JSON
 
+        # Read the stored data. If nothing is changed, there is no need to write (or backup) the file
+        StoredDict = None
+        try:
+            with open(JsonFile, "r") as file:
+                StoredDict = json.load(file)
+            file.close()
+        except Exception:
+            StoredDict = None
+        if StoredDict == resultingDict:
+            return True
+
         # create a copy and rename it as a backup if enabled
-        if Parameters_Ribbon.ENABLE_BACKUP is True:
+        if Parameters_Ribbon.ENABLE_BACKUP is True and os.path.exists(JsonFile):
             Suffix = datetime.now().strftime("%Y%m%d_%H%M%S")
             BackupName = f"RibbonStructure_{Suffix}.json"
             if os.path.exists(pathBackup) is False:
@@ -4345,11 +4452,153 @@ class LoadDialog(Design_ui.Ui_Form):
             BackupFile = os.path.join(pathBackup, BackupName)
             shutil.copy(JsonFile, BackupFile)
 
-        # Writing to sample.json
-        with open(JsonFile, "w") as outfile:
-            json.dump(resultingDict, outfile, indent=4)
+        # Write the json file. This is done atomically, so a crash cannot leave a partly written file
+        StandardFunctions.WriteJsonFile(resultingDict, JsonFile, StoredDict)
+        return True
 
-        outfile.close()
+    def ReturnCommandIcon(self, CommandName: str):
+        """Returns the stored icon of a command from the catalog or None.
+        For dropdown buttons, the icon of the first command is returned.
+        The icon is decoded only when it is painted, e.g. when a list row becomes visible.
+        """
+        if (
+            str(CommandName).endswith("_ddb")
+            and "dropdownButtons" in self.Dict_DropDownButtons
+        ):
+            try:
+                CommandName = self.Dict_DropDownButtons["dropdownButtons"][CommandName][
+                    0
+                ][0]
+            except Exception:
+                pass
+        return self.Catalog.ReturnCommandIcon(CommandName, Lazy=True)
+
+    def SetCommandFilter(
+        self, View: QListView, ListWidget_Selected: QListWidget
+    ) -> CommandModel_Ribbon.CommandFilterModel:
+        """Show the command model in a view. The commands in the list with selected commands are hidden.
+
+        Args:
+            View (QListView): The view for the available commands
+            ListWidget_Selected (QListWidget): The list with selected commands
+
+        Returns:
+            CommandFilterModel: The filter of the view
+        """
+        Filter = CommandModel_Ribbon.CommandFilterModel(self.CommandModel, View)
+        Filter.setExcludedListWidget(ListWidget_Selected)
+        View.setModel(Filter)
+        return Filter
+
+    def ReturnListWidgetItem(self, Row: list) -> QListWidgetItem:
+        """Returns a new ListWidgetItem for a row of the command model"""
+        ListWidgetItem = QListWidgetItem()
+        ListWidgetItem.setText(Row[CommandModel_Ribbon.ROW_TEXT])
+        ListWidgetItem.setData(
+            Qt.ItemDataRole.UserRole, Row[CommandModel_Ribbon.ROW_COMMAND]
+        )
+        if Row[CommandModel_Ribbon.ROW_ICON] is not None:
+            ListWidgetItem.setIcon(Row[CommandModel_Ribbon.ROW_ICON])
+        # Use the tooltip to store the actual command.
+        ListWidgetItem.setToolTip(Row[CommandModel_Ribbon.ROW_COMMAND])
+        return ListWidgetItem
+
+    def AddCommands(
+        self,
+        SourceView: QListView,
+        DestinationWidget: QListWidget,
+        ExcludedItems=[],
+    ):
+        """Add the selected commands of a view on the command model to a list widget.
+        The filter of the view hides the added commands.
+
+        Args:
+            SourceView (QListView): The view with available commands
+            DestinationWidget (QListWidget): The list with selected commands
+            ExcludedItems (list, optional): Commands that cannot be added. Defaults to [].
+        """
+        Rows = SourceView.model().ReturnSelectedRows(SourceView)
+
+        ListCommands = []
+        for i in range(DestinationWidget.count()):
+            ListCommands.append(
+                DestinationWidget.item(i).data(Qt.ItemDataRole.UserRole)
+            )
+
+        for Row in Rows:
+            CommandName = Row[CommandModel_Ribbon.ROW_COMMAND]
+            if CommandName not in ListCommands and CommandName not in ExcludedItems:
+                DestinationWidget.addItem(self.ReturnListWidgetItem(Row))
+                ListCommands.append(CommandName)
+                self.AddCommandUsage(CommandName)
+
+        SourceView.clearSelection()
+        return
+
+    def BuildSearchIndex(self):
+        """Builds the search index in small steps, so the dialog stays responsive"""
+        Deadline = time.perf_counter() + CommandSearch_Ribbon.INDEX_STEP_BUDGET / 1000
+        if self.CommandModel.SearchIndex.ContinueIndex(Deadline) is False:
+            QTimer.singleShot(0, self.BuildSearchIndex)
+        return
+
+    def ReturnSearchTexts(self, CommandName: str, WorkBenchName: str) -> list:
+        """Returns the extra texts for the command search: the workbench title and the tooltip"""
+        Texts = [WorkBenchName]
+        WorkBenchItem = self.Catalog.ReturnWorkbench(WorkBenchName)
+        if WorkBenchItem is not None:
+            Texts = [WorkBenchItem[2]]
+            if len(WorkBenchItem) == 5:
+                Texts.append(WorkBenchItem[4])
+        Texts.append(
+            StandardFunctions.CommandInfoCorrections(CommandName).get("toolTip", "")
+        )
+        return Texts
+
+    def ReturnCommandUsage(self) -> dict:
+        """Returns how often and when the commands were added in this dialog. Used to rank the search results.
+
+        Returns:
+            dict: CommandName -> [Count, LastUsed (seconds since epoch)]
+        """
+        Usage = {}
+        try:
+            CommandUsage = Parameters_Ribbon.preferences.GetGroup("CommandUsage")
+            CommandLastUsed = Parameters_Ribbon.preferences.GetGroup("CommandLastUsed")
+            for CommandName in CommandUsage.GetInts():
+                Usage[CommandName] = [
+                    CommandUsage.GetInt(CommandName),
+                    CommandLastUsed.GetFloat(CommandName),
+                ]
+        except Exception as e:
+            if Parameters_Ribbon.DEBUG_MODE is True:
+                StandardFunctions.Print(
+                    f"{e.with_traceback(e.__traceback__)}", "Warning"
+                )
+        return Usage
+
+    def AddCommandUsage(self, CommandName: str):
+        """Counts how often a command is added and stores when"""
+        LastUsed = time.time()
+        try:
+            CommandUsage = Parameters_Ribbon.preferences.GetGroup("CommandUsage")
+            CommandUsage.SetInt(CommandName, CommandUsage.GetInt(CommandName) + 1)
+            CommandLastUsed = Parameters_Ribbon.preferences.GetGroup("CommandLastUsed")
+            CommandLastUsed.SetFloat(CommandName, LastUsed)
+        except Exception:
+            pass
+        self.CommandModel.SearchIndex.addUsage(CommandName, 1, LastUsed)
+        return
+
+    def RemoveCommands(self, SourceWidget: QListWidget):
+        """Remove the selected commands from a list widget.
+        The filter of the view with available commands shows them again.
+
+        Args:
+            SourceWidget (QListWidget): The list with selected commands
+        """
+        for Item in SourceWidget.selectedItems():
+            SourceWidget.takeItem(SourceWidget.row(Item))
         return
 
     def ListWidgetItems(self, ListWidget: QListWidget) -> list:
@@ -4471,9 +4720,7 @@ class LoadDialog(Design_ui.Ui_Form):
         # Define the order based on the order in this table widget
         Order = []
         for i in range(CommandTable.rowCount()):
-            Order.append(
-                QTableWidgetItem(CommandTable.item(i, 0)).data(Qt.ItemDataRole.UserRole)
-            )
+            Order.append(CommandTable.item(i, 0).data(Qt.ItemDataRole.UserRole))
 
         # Add or update the dict for the Ribbon command panel
         StandardFunctions.add_keys_nested_dict(
@@ -4882,7 +5129,7 @@ class LoadDialog(Design_ui.Ui_Form):
         self.form.WorkbenchList_IS.clear()
         self.form.Panels_IS.clear()
         #
-        self.form.CommandsAvailable_QC.clear()
+        self.CommandModel.clear()
         self.form.CommandsSelected_QC.clear()
         #
         self.form.PanelsToExclude_EP.clear()
@@ -4895,10 +5142,8 @@ class LoadDialog(Design_ui.Ui_Form):
         self.form.PanelSelected_CP.clear()
         #
         self.form.WorkbenchList_NP.clear()
-        self.form.CommandsAvailable_NP.clear()
         self.form.NewPanel_NP.clear()
         #
-        self.form.CommandsAvailable_DDB.clear()
         self.form.NewControl_DDB.clear()
         self.form.ListCategory_DDB.clear()
         #
@@ -4907,27 +5152,83 @@ class LoadDialog(Design_ui.Ui_Form):
 
         # -- Ribbon design tab --
         # Add all workbenches to the ListItem Widget. In this case a dropdown list.
+        # The workbenches are used on every tab, so they are always added.
         self.addWorkbenches()
-        # Add all toolbars of the selected workbench to the toolbar list(dropdown)
-        self.on_WorkbenchList_RD__TextChanged()
-        self.on_WorkbenchList_CP__activated(False)
 
         # # load the commands in the table.
         # self.on_PanelList_RD__TextChanged()
 
-        # -- Excluded toolbars --
-        self.ExcludedToolbars()
-
-        # Add all commands to the listboxes with commands
-        self.LoadCommands()
-
-        # Add all toolbar to the listboxes for the panels
-        self.LoadPanels()
+        # Fill the controls of the current tab. The other tabs are filled when they are opened.
+        self.LoadedTabParts = set()
+        self.FailedTabParts = set()
+        self.LoadTab(self.form.tabWidget.currentIndex())
 
         # -- Form controls
         self.form.UpdateJson.setDisabled(True)
         return
 
+    def ReturnTabLoaders(self) -> dict:
+        """Returns the functions that fill the controls per tab.
+        Some functions fill controls on more than one tab. These are run only once.
+        The workbench lists are filled by addWorkbenches for all tabs at once.
+
+        Returns:
+            dict: tab widget -> list of functions, in the order to run them
+        """
+        return {
+            # Add all toolbar to the listboxes for the panels
+            self.form.InItialSetup: [self.LoadPanels],
+            # Add all commands to the listboxes with commands
+            self.form.QAToolbars: [self.LoadCommands],
+            # -- Excluded toolbars --
+            self.form.Toolbars: [self.ExcludedToolbars],
+            self.form.CombineToolbars: [self.LoadWorkbench_CP, self.LoadPanels],
+            self.form.tab: [self.LoadCommands],
+            self.form.Createnewpanels: [self.LoadCommands, self.LoadPanels],
+            # Add all toolbars of the selected workbench to the toolbar list(dropdown)
+            self.form.RibbonDesign: [self.on_WorkbenchList_RD__TextChanged],
+        }
+
+    def LoadTab(self, Index: int):
+        """Fills the controls of a tab when it is opened for the first time
+
+        Args:
+            Index (int): The index of the tab
+        """
+        self.LoadTabWidget(self.form.tabWidget.widget(Index))
+        return
+
+    def LoadTabWidget(self, TabWidget: QWidget):
+        """Fills the controls of a tab, if this is not done yet
+
+        Args:
+            TabWidget (QWidget): The page of the tab
+        """
+        # Filling a tab is not a change. Keep the state of the apply button.
+        IsEnabled = self.form.UpdateJson.isEnabled()
+        for Function in self.ReturnTabLoaders().get(TabWidget, []):
+            if Function.__name__ not in self.LoadedTabParts:
+                # A part that failed is tried again the next time. WriteJson does not write while a part failed.
+                try:
+                    Function()
+                    self.LoadedTabParts.add(Function.__name__)
+                    self.FailedTabParts.discard(Function.__name__)
+                except Exception as e:
+                    self.FailedTabParts.add(Function.__name__)
+                    StandardFunctions.Print(
+                        f"Ribbon UI: {Function.__name__} failed: {e}", "Warning"
+                    )
+                    if Parameters_Ribbon.DEBUG_MODE is True:
+                        StandardFunctions.Print(
+                            f"{e.with_traceback(e.__traceback__)}", "Warning"
+                        )
+        self.form.UpdateJson.setEnabled(IsEnabled)
+        return
+
+    def LoadWorkbench_CP(self):
+        self.on_WorkbenchList_CP__activated(False)
+        return
+
     def returnWorkBenchToolbars(self, WorkBenchName):
         wbToolbars = []
         try:
@@ -4970,325 +5271,29 @@ class LoadDialog(Design_ui.Ui_Form):
 
     def FilterCommands_SearchBar(
         self,
-        ListWidget: QListWidget,
+        Filter: CommandModel_Ribbon.CommandFilterModel,
         SearchBar: QLineEdit,
-        DestinationWidget: QListWidget,
-        ListWidget_WorkBenches: QListWidget,
     ):
-        # Get the text in the searchbar as lower case. (This makes it not sensitive for Upper or lower cases)
-        SearchbarText = SearchBar.text().lower()
-
-        # Clear the listwidget
-        ListWidget.clear()
-
-        ShadowList = []  # List to add the commands and prevent duplicates
-        for ToolbarCommand in self.List_Commands:
-            CommandName = ToolbarCommand[0]
-            workbenchName = ToolbarCommand[3]
-            MenuNameTranslated = ToolbarCommand[2].replace("&", "")  # Not translated
-            if len(ToolbarCommand) == 5:
-                MenuNameTranslated = ToolbarCommand[4].replace("&", "")  # Translated
-            if CommandName.endswith("_ddb"):
-                MenuNameTranslated = CommandName.replace("_ddb", "")
-
-            if MenuNameTranslated != "":
-                if (
-                    SearchbarText != ""
-                    and MenuNameTranslated.lower().startswith(SearchbarText)
-                ) or SearchbarText == "":
-                    if f"{MenuNameTranslated}" not in ShadowList:
-                        try:
-                            if (
-                                workbenchName != "Global"
-                                and workbenchName != "General"
-                                and workbenchName != "Standard"
-                                and workbenchName != "All"
-                            ):
-                                WorkbenchTitle = Gui.getWorkbench(
-                                    workbenchName
-                                ).MenuText
-                            else:
-                                WorkbenchTitle = workbenchName
-                        except Exception:
-                            return
-                        if (
-                            WorkbenchTitle
-                            == ListWidget_WorkBenches.currentData(
-                                Qt.ItemDataRole.UserRole
-                            )[2]
-                            or ListWidget_WorkBenches.currentText() == "All"
-                        ):
-                            # Get an icon
-                            # Define a commandname for the icon
-                            CommandName_Icon = CommandName
-                            # If the command is a dropdown button, get the icon from the first command in the dropdown list
-                            if (
-                                str(CommandName).endswith("_ddb")
-                                and "dropdownButtons" in self.Dict_DropDownButtons
-                            ):
-                                for (
-                                    DropDownCommand,
-                                    Commands,
-                                ) in self.Dict_DropDownButtons[
-                                    "dropdownButtons"
-                                ].items():
-                                    if DropDownCommand == CommandName:
-                                        CommandName_Icon = Commands[0][0]
-                            # Get the icon name
-                            IconName = StandardFunctions.CommandInfoCorrections(
-                                CommandName_Icon
-                            )["pixmap"]
-                            # get the icon for this command if there isn't one, leave it None
-                            Icon = StandardFunctions.returnQiCons_Commands(
-                                CommandName_Icon, IconName
-                            )
-                            # If the icon is still None, get the icon from the iconlist
-                            if Icon is None or (Icon is not None and Icon.isNull()):
-                                for item in self.List_CommandIcons:
-                                    if item[0] == CommandName_Icon:
-                                        Icon = item[1]
-                                        break
-
-                            # Define a new ListWidgetItem.
-                            ListWidgetItem = QListWidgetItem()
-                            ListWidgetItem.setText(MenuNameTranslated)
-                            ListWidgetItem.setData(
-                                Qt.ItemDataRole.UserRole, CommandName
-                            )
-                            if Icon is not None:
-                                ListWidgetItem.setIcon(Icon)
-                                ListWidgetItem.setToolTip(
-                                    CommandName
-                                )  # Use the tooltip to store the actual command.
-
-                                # Add the ListWidgetItem to the correct ListWidget
-                                IsInList = False
-                                for i in range(DestinationWidget.count()):
-                                    item = DestinationWidget.item(i)
-                                    if item.data(
-                                        Qt.ItemDataRole.UserRole
-                                    ) == ListWidgetItem.data(Qt.ItemDataRole.UserRole):
-                                        IsInList = True
-                                if IsInList is False:
-                                    ListWidget.addItem(ListWidgetItem)
-                            if Icon is None:
-                                if Parameters_Ribbon.DEBUG_MODE is True:
-                                    StandardFunctions.Print(
-                                        f"{CommandName} has no icon!", "Warning"
-                                    )
-            ShadowList.append(f"{MenuNameTranslated}")
-
+        # Show only the commands that match the text in the searchbar, the best matches first.
+        # (not sensitive for Upper or lower cases) The search starts when the typing has paused.
+        Filter.setSearchText(SearchBar.text())
         return
 
     def FilterCommands_ListCategory(
         self,
-        ListWidget_Commands: QListWidget,
-        ListWidget_WorkBenches: QListWidget,
-        SearchBar: QLineEdit,
+        Filter: CommandModel_Ribbon.CommandFilterModel,
+        ListWidget_WorkBenches: QComboBox,
     ):
-        if (
-            ListWidget_WorkBenches.currentData(Qt.ItemDataRole.UserRole) is None
-            and ListWidget_WorkBenches.currentText() != "All"
-        ):
-            return
-
-        # Get the text in the searchbar as lower case. (This makes it not sensitive for Upper or lower cases)
-        SearchbarText = SearchBar.text().lower()
-
-        # Clear the listwidget
-        ListWidget_Commands.clear()
-
-        ShadowList = []  # List to add the commands and prevent duplicates
-        for ToolbarCommand in self.List_Commands:
-            CommandName = ToolbarCommand[0]
-            workbenchName = ToolbarCommand[3]
-            MenuNameTranslated = ToolbarCommand[2].replace("&", "")  # Not transleted!
-            if len(ToolbarCommand) == 5:
-                MenuNameTranslated = ToolbarCommand[4].replace("&", "")  # Translated
-            if CommandName.endswith("_ddb"):
-                MenuNameTranslated = CommandName.replace("_ddb", "")
-
-            if MenuNameTranslated != "":
-                if (
-                    SearchbarText != ""
-                    and MenuNameTranslated.lower().startswith(SearchbarText)
-                ) or SearchbarText == "":
-                    if (
-                        ListWidget_WorkBenches.currentData(Qt.ItemDataRole.UserRole)
-                        != "All"
-                    ):
-                        if (
-                            f"{MenuNameTranslated}" not in ShadowList
-                            and workbenchName != "Global"
-                            and workbenchName != "General"
-                            and workbenchName != "Standard"
-                        ):
-                            try:
-                                WorkbenchTitle = Gui.getWorkbench(
-                                    workbenchName
-                                ).MenuText
-                            except Exception:
-                                return
-                            if (
-                                WorkbenchTitle
-                                == ListWidget_WorkBenches.currentData(
-                                    Qt.ItemDataRole.UserRole
-                                )[2]
-                            ):
-                                # Get an icon
-                                # Define a commandname for the icon
-                                CommandName_Icon = CommandName
-                                # If the command is a dropdown button, get the icon from the first command in the dropdown list
-                                if (
-                                    str(CommandName).endswith("_ddb")
-                                    and "dropdownButtons" in self.Dict_DropDownButtons
-                                ):
-                                    for (
-                                        DropDownCommand,
-                                        Commands,
-                                    ) in self.Dict_DropDownButtons[
-                                        "dropdownButtons"
-                                    ].items():
-                                        if DropDownCommand == CommandName:
-                                            CommandName_Icon = Commands[0][0]
-                                # Get the icon name
-                                IconName = StandardFunctions.CommandInfoCorrections(
-                                    CommandName_Icon
-                                )["pixmap"]
-                                # get the icon for this command if there isn't one, leave it None
-                                Icon = StandardFunctions.returnQiCons_Commands(
-                                    CommandName_Icon, IconName
-                                )
-                                # If the icon is still None, get the icon from the iconlist
-                                if Icon is None or (Icon is not None and Icon.isNull()):
-                                    for item in self.List_CommandIcons:
-                                        if item[0] == CommandName_Icon:
-                                            Icon = item[1]
-                                            break
-
-                                Text = MenuNameTranslated
-                                ListWidgetItem = QListWidgetItem()
-                                ListWidgetItem.setText(Text)
-                                ListWidgetItem.setData(
-                                    Qt.ItemDataRole.UserRole, CommandName
-                                )
-                                if Icon is not None:
-                                    ListWidgetItem.setIcon(Icon)
-                                ListWidgetItem.setToolTip(
-                                    CommandName
-                                )  # Use the tooltip to store the actual command.
-
-                                # Add the ListWidgetItem to the correct ListWidget
-                                if Icon is not None:
-                                    ListWidget_Commands.addItem(ListWidgetItem)
-
-                        ShadowList.append(f"{MenuNameTranslated}")
-                    if (
-                        f"{MenuNameTranslated}" not in ShadowList
-                        and workbenchName == "Standard"
-                    ):
-                        WorkbenchTitle = workbenchName
-                        if (
-                            WorkbenchTitle
-                            == ListWidget_WorkBenches.currentData(
-                                Qt.ItemDataRole.UserRole
-                            )[2]
-                        ):
-                            IsInlist = False
-                            for i in range(ListWidget_Commands.count()):
-                                CommandItem = ListWidget_Commands.item(i)
-                                if (
-                                    CommandItem.data(Qt.ItemDataRole.UserRole)
-                                    == CommandName
-                                ):
-                                    IsInlist = True
-
-                                if IsInlist is False:
-                                    # Define a commandname for the icon
-                                    CommandName_Icon = CommandName
-                                    Icon = StandardFunctions.returnQiCons_Commands(
-                                        CommandName_Icon
-                                    )
-                                    Text = MenuNameTranslated
-                                    ListWidgetItem = QListWidgetItem()
-                                    ListWidgetItem.setText(Text)
-                                    ListWidgetItem.setData(
-                                        Qt.ItemDataRole.UserRole, CommandName
-                                    )
-                                    if Icon is not None:
-                                        ListWidgetItem.setIcon(Icon)
-                                    ListWidgetItem.setToolTip(
-                                        CommandName
-                                    )  # Use the tooltip to store the actual command.
-
-                                    # Add the ListWidgetItem to the correct ListWidget
-                                    if Icon is not None:
-                                        ListWidget_Commands.addItem(ListWidgetItem)
-
-                    if (
-                        ListWidget_WorkBenches.currentData(Qt.ItemDataRole.UserRole)
-                        == "All"
-                    ):
-                        IsInlist = False
-                        for i in range(ListWidget_Commands.count()):
-                            CommandItem = ListWidget_Commands.item(i)
-                            # if CommandItem.data(Qt.ItemDataRole.UserRole) == CommandName:
-                            #     IsInlist = True
-                            if CommandItem.text() == MenuNameTranslated:
-                                IsInlist = True
-
-                        if IsInlist is False:
-                            # Define a new ListWidgetItem.
-                            Icon = None
-                            for item in self.List_CommandIcons:
-                                if item[0] == CommandName:
-                                    Icon = item[1]
-                                if (
-                                    str(CommandName).endswith("_ddb")
-                                    and "dropdownButtons" in self.Dict_DropDownButtons
-                                ):
-                                    for (
-                                        DropDownCommand,
-                                        Commands,
-                                    ) in self.Dict_DropDownButtons[
-                                        "dropdownButtons"
-                                    ].items():
-                                        if Commands[0][0] == item[0]:
-                                            Icon = item[1]
-                            if Icon is None:
-                                IconName = StandardFunctions.CommandInfoCorrections(
-                                    CommandName
-                                )["pixmap"]
-                                if (
-                                    str(CommandName).endswith("_ddb")
-                                    and "dropdownButtons" in self.Dict_DropDownButtons
-                                ):
-                                    for (
-                                        DropDownCommand,
-                                        Commands,
-                                    ) in self.Dict_DropDownButtons[
-                                        "dropdownButtons"
-                                    ].items():
-                                        if Commands[0][0] == CommandName:
-                                            IconName = ToolbarCommand[1]
-                                Icon = StandardFunctions.returnQiCons_Commands(
-                                    CommandName, IconName
-                                )
-
-                            Text = MenuNameTranslated
-                            ListWidgetItem = QListWidgetItem()
-                            ListWidgetItem.setText(Text)
-                            ListWidgetItem.setData(
-                                Qt.ItemDataRole.UserRole, CommandName
-                            )
-                            if Icon is not None:
-                                ListWidgetItem.setIcon(Icon)
-                                ListWidgetItem.setToolTip(
-                                    CommandName
-                                )  # Use the tooltip to store the actual command.
+        # The category is "All", "Standard" (which has no data) or a workbench
+        Category = ListWidget_WorkBenches.currentData(Qt.ItemDataRole.UserRole)
+        if Category is None:
+            if ListWidget_WorkBenches.currentText() == "":
+                return
+            Category = "Standard"
+        elif Category != CommandModel_Ribbon.CATEGORY_ALL:
+            Category = Category[0]
 
-                                # Add the ListWidgetItem to the correct ListWidget
-                                ListWidget_Commands.addItem(ListWidgetItem)
+        Filter.setCategory(Category)
         return
 
     def CreateRibbonStructure_WB(self, WorkBenchName="All", Size="small"):
@@ -5442,7 +5447,15 @@ class LoadDialog(Design_ui.Ui_Form):
 
         return
 
-    def loadAllWorkbenches(self, AutoHide=True, HideOnly=False, FinishMessage=""):
+    def loadAllWorkbenches(
+        self, AutoHide=True, HideOnly=False, FinishMessage="", WorkbenchList=None
+    ):
+        """
+        Activates the workbenches, so that their toolbars and commands are available.
+
+        Args:
+            WorkbenchList (list, optional): The workbenches to load. Defaults to None, which loads all workbenches.
+        """
         lbl = QLabel(translate("FreeCAD Ribbon", "Loading workbench … (…/…)"))
         lbl.setWindowFlags(Qt.WindowType.Dialog | Qt.WindowType.WindowStaysOnTopHint)
         lbl.setMinimumSize(300, 20)
@@ -5463,6 +5476,8 @@ class LoadDialog(Design_ui.Ui_Form):
             activeWorkbench = Gui.activeWorkbench().name()
             lbl.show()
             lst = Gui.listWorkbenches()
+            if WorkbenchList is not None:
+                lst = WorkbenchList
             for i, wb in enumerate(lst):
                 msg = (
                     translate("FreeCAD Ribbon", "Loading workbench ")
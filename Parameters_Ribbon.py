@@ -147,6 +147,15 @@ class Settings:
         Settings.SetBoolSetting("UseButtonBackGround", BUTTON_BACKGROUND_ENABLED)
 
         Settings.SetBoolSetting("DebugMode", DEBUG_MODE)
+        Settings.SetBoolSetting("TraceStartup", TRACE_STARTUP)
+
+        Settings.SetBoolSetting("CompactIcons", COMPACT_ICONS)
+        Settings.SetStringSetting("IconEncoding", ICON_ENCODING)
+
+        Settings.SetBoolSetting("PrebuildTabs", PREBUILD_TABS)
+        Settings.SetIntSetting("PrebuildBudget", PREBUILD_BUDGET)
+        Settings.SetStringSetting("PrebuildOrder", PREBUILD_ORDER)
+        Settings.SetIntSetting("MaxBuiltTabs", MAX_BUILT_TABS)
 
         Settings.SetBoolSetting("CustomIcons", CUSTOM_ICONS_ENABLED)
         Settings.SetStringSetting("ScrollLeftButton_Tab", SCROLL_LEFT_BUTTON_TAB)
@@ -206,6 +215,7 @@ DefaultSettings = {
     "ShowIconText_Large": bool(True),
     "MaxColumnsPerPanel": int(6),
     "DebugMode": bool(False),
+    "TraceStartup": bool(False),
     "ShowOnHover": bool(False),
     "TabBar_Scroll": int(1),
     "Ribbon_Scroll": int(1),
@@ -240,6 +250,12 @@ DefaultSettings = {
     "FontSize_Panels": int(11),
     "Toolbar_Position": int(0),
     "Hide_Titlebar_FC": bool(True),
+    "CompactIcons": bool(True),
+    "IconEncoding": "ARGB32",
+    "PrebuildTabs": bool(True),
+    "PrebuildBudget": int(10),
+    "PrebuildOrder": "MostUsed",
+    "MaxBuiltTabs": int(0),
 }
 
 # region - Define the import location ----------------------------------------------------------------------------------
@@ -445,6 +461,56 @@ DEBUG_MODE = Settings.GetBoolSetting("DebugMode")
 if Settings.GetBoolSetting("DebugMode") is None:
     DEBUG_MODE = DefaultSettings["DebugMode"]
     Settings.SetBoolSetting("DebugMode", DEBUG_MODE)
+
+# Collect timing spans of the startup. Also enabled in debug mode
+TRACE_STARTUP = Settings.GetBoolSetting("TraceStartup")
+if Settings.GetBoolSetting("TraceStartup") is None:
+    TRACE_STARTUP = DefaultSettings["TraceStartup"]
+    Settings.SetBoolSetting("TraceStartup", TRACE_STARTUP)
+# endregion ------------------------------------------------------------------------------------------------------------
+
+# region - Data file settings ------------------------------------------------------------------------------------------
+# Store only the distinct pixmaps of the icons in the data file
+COMPACT_ICONS = Settings.GetBoolSetting("CompactIcons")
+if Settings.GetBoolSetting("CompactIcons") is None:
+    COMPACT_ICONS = DefaultSettings["CompactIcons"]
+    Settings.SetBoolSetting("CompactIcons", COMPACT_ICONS)
+
+# Encoding of the pixmaps in the data file. "PNG" or "ARGB32" (zlib compressed raw pixels, faster to decode)
+ICON_ENCODING = Settings.GetStringSetting("IconEncoding")
+if ICON_ENCODING not in ["PNG", "ARGB32"]:
+    ICON_ENCODING = DefaultSettings["IconEncoding"]
+    Settings.SetStringSetting("IconEncoding", ICON_ENCODING)
+# endregion ------------------------------------------------------------------------------------------------------------
+
+# region - Prebuild settings -------------------------------------------------------------------------------------------
+# Build the tabs of loaded workbenches in the background, when FreeCAD is idle
+PREBUILD_TABS = Settings.GetBoolSetting("PrebuildTabs")
+if Settings.GetBoolSetting("PrebuildTabs") is None:
+    PREBUILD_TABS = DefaultSettings["PrebuildTabs"]
+    Settings.SetBoolSetting("PrebuildTabs", PREBUILD_TABS)
+
+# Time in ms that can be used per idle moment. At least one panel is build each time
+PREBUILD_BUDGET = Settings.GetIntSetting("PrebuildBudget")
+if (
+    Settings.GetIntSetting("PrebuildBudget") is None
+    or Settings.GetIntSetting("PrebuildBudget") <= 0
+):
+    PREBUILD_BUDGET = DefaultSettings["PrebuildBudget"]
+    Settings.SetIntSetting("PrebuildBudget", PREBUILD_BUDGET)
+
+# The order in which the tabs are build. "MostUsed" or "TabOrder"
+PREBUILD_ORDER = Settings.GetStringSetting("PrebuildOrder")
+if PREBUILD_ORDER not in ["MostUsed", "TabOrder"]:
+    PREBUILD_ORDER = DefaultSettings["PrebuildOrder"]
+    Settings.SetStringSetting("PrebuildOrder", PREBUILD_ORDER)
+
+# The maximum number of tabs with their panels in memory. The least recently used tabs are removed
+# and build again when they are activated. 0 is no maximum.
+MAX_BUILT_TABS = Settings.GetIntSetting("MaxBuiltTabs")
+if Settings.GetIntSetting("MaxBuiltTabs") is None or MAX_BUILT_TABS < 0:
+    MAX_BUILT_TABS = DefaultSettings["MaxBuiltTabs"]
+    Settings.SetIntSetting("MaxBuiltTabs", MAX_BUILT_TABS)
 # endregion ------------------------------------------------------------------------------------------------------------
 
 # region - Navigation settings -----------------------------------------------------------------------------------------
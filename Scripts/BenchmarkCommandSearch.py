@@ -0,0 +1,288 @@
+# *************************************************************************
+# *                                                                       *
+# * Copyright (c) 2019-2024 Hakan Seven, Geolta, Paul Ebbers              *
+# *                                                                       *
+# * This program is free software; you can redistribute it and/or modify  *
+# * it under the terms of the GNU Lesser General Public License (LGPL)    *
+# * as published by the Free Software Foundation; either version 3 of     *
+# * the License, or (at your option) any later version.                   *
+# * for detail see the LICENCE text file.                                 *
+# *                                                                       *
+# * This program is distributed in the hope that it will be useful,       *
+# * but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# * GNU Library General Public License for more details.                  *
+# *                                                                       *
+# * You should have received a copy of the GNU Library General Public     *
+# * License along with this program; if not, write to the Free Software   *
+# * Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# * USA                                                                   *
+# *                                                                       *
+# *************************************************************************
+
+# This script measures the latency per keystroke of the command search in the layout dialog
+# on a list with synthetic commands. It compares:
+#   - rebuild: go through all commands on every keystroke, like the searchbar did before
+#     (without the calls for the icons and workbench titles, which need FreeCAD)
+#   - index: ranked fuzzy search with the index of CommandSearch_Ribbon and filter the rows on the matches,
+#     like the filter of the command lists does
+# It also measures the ranked search alone for a list with search texts with typos. The target is
+# less than 5 ms per search for 10,000 commands.
+#
+# It does not need FreeCAD or Qt. Run it with python from the command line:
+#
+#   python Scripts/BenchmarkCommandSearch.py [number of commands]
+
+import os
+import sys
+import time
+import random
+
+ParentPath = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ParentPath)
+
+import CommandSearch_Ribbon
+
+# Default number of synthetic commands
+NoCommands = 5000
+
+# The texts that are typed, one character per keystroke
+SearchTexts = ["sketch", "line", "pad", "constraint", "export", "xyz"]
+
+# Search texts for the ranked search, with typos and workbench names
+RankedSearchTexts = [
+    "skech pad",
+    "constrant horizontal",
+    "mesure distance",
+    "workbench12 fillet",
+    "chamfr",
+    "arry mirror",
+    "bolean fuse",
+    "create",
+    "xyz",
+]
+
+# Default number of commands for the ranked search
+NoCommandsRanked = 10000
+
+# Time between two keystrokes in milliseconds, when typing fast. Used for the debounced count.
+KeystrokeInterval = 100
+SearchDelay = 150
+
+# Use a fixed seed, so the commands are the same on every run
+Seed = 1
+
+Words = [
+    "Sketch",
+    "Line",
+    "Arc",
+    "Circle",
+    "Pad",
+    "Pocket",
+    "Fillet",
+    "Chamfer",
+    "Constraint",
+    "Horizontal",
+    "Vertical",
+    "Export",
+    "Import",
+    "Mesh",
+    "Shape",
+    "Boolean",
+    "Cut",
+    "Fuse",
+    "Common",
+    "Measure",
+    "Distance",
+    "Angle",
+    "Body",
+    "Part",
+    "Draft",
+    "Array",
+    "Mirror",
+    "Offset",
+    "Section",
+    "View",
+]
+
+
+def CreateCommands(NoCommands: int) -> list:
+    """Returns a list of commands with the same layout as List_Commands:
+    [CommandName, IconName, MenuText, WorkBenchName, MenuTextTranslated]
+    """
+    Random = random.Random(Seed)
+    List_Commands = []
+    for i in range(NoCommands):
+        WorkBenchName = f"Workbench{i % 40}"
+        MenuText = " ".join(Random.sample(Words, Random.randint(1, 3)))
+        MenuText = f"&{MenuText} {i}"
+        CommandName = f"WB{i % 40}_{MenuText.replace('&', '').replace(' ', '')}"
+        List_Commands.append(
+            [CommandName, "", MenuText, WorkBenchName, MenuText.replace("&", "")]
+        )
+    return List_Commands
+
+
+def Rebuild(List_Commands: list, SearchText: str, Selected: list) -> list:
+    """Go through all commands, like the searchbar did on every keystroke"""
+    SearchbarText = SearchText.lower()
+    Result = []
+    ShadowList = []
+    for ToolbarCommand in List_Commands:
+        CommandName = ToolbarCommand[0]
+        MenuNameTranslated = ToolbarCommand[4].replace("&", "")
+        if MenuNameTranslated != "":
+            if (
+                SearchbarText != ""
+                and MenuNameTranslated.lower().startswith(SearchbarText)
+            ) or SearchbarText == "":
+                if f"{MenuNameTranslated}" not in ShadowList:
+                    IsInList = False
+                    for item in Selected:
+                        if item == CommandName:
+                            IsInList = True
+                    if IsInList is False:
+                        Result.append([MenuNameTranslated, CommandName])
+        ShadowList.append(f"{MenuNameTranslated}")
+    return Result
+
+
+def CreateIndex(List_Commands: list):
+    """Returns a search index for the commands. The workbench name and a tooltip are the extra texts."""
+    Index = CommandSearch_Ribbon.SearchIndex()
+    Index.ExtraTextSource = lambda CommandName, WorkBenchName: [
+        WorkBenchName,
+        f"Runs the command {CommandName}",
+    ]
+    Index.setItems([[Item[0], Item[4], Item[3]] for Item in List_Commands])
+    # Some commands were used before
+    Random = random.Random(Seed)
+    Now = time.time()
+    for Item in Random.sample(List_Commands, min(100, len(List_Commands))):
+        Index.addUsage(
+            Item[0], Random.randint(1, 30), Now - Random.randint(0, 60) * 86400
+        )
+    return Index
+
+
+def FilterAcceptsRow(Rows, Row, Scores, Excluded):
+    """Same checks as CommandFilterModel.filterAcceptsRow"""
+    if Row not in Scores:
+        return False
+    if Rows[Row][0] in Excluded:
+        return False
+    return True
+
+
+def Filter(Index, Rows: list, SearchText: str, Excluded: set) -> list:
+    Scores = Index.ReturnScores(SearchText)
+    Result = [
+        Row for Row in range(len(Rows)) if FilterAcceptsRow(Rows, Row, Scores, Excluded)
+    ]
+    # Sort the matches like the filter of the command lists does
+    Result.sort(key=lambda Row: -Scores[Row])
+    return Result
+
+
+def RankedSearch(Size: int):
+    """Measure the ranked search alone and print the best match per search text"""
+    List_Commands = CreateCommands(Size)
+    Index = CreateIndex(List_Commands)
+
+    StartTime = time.perf_counter()
+    Index.BuildIndex()
+    IndexTime = time.perf_counter() - StartTime
+
+    print(f"\nRanked search: {Size} commands")
+    print(f"{'search text':<24}{'time (ms)':>10}{'matches':>9}  best match")
+    Durations = []
+    for SearchText in RankedSearchTexts:
+        Index.ClearLastSearch()
+        StartTime = time.perf_counter()
+        Scores = Index.ReturnScores(SearchText)
+        Duration = time.perf_counter() - StartTime
+        Durations.append(Duration)
+        Best = ""
+        if len(Scores) > 0:
+            Row = max(Scores, key=Scores.get)
+            Best = f"{Index.Items[Row][1]} ({Index.Items[Row][2]}, {Scores[Row]:.2f})"
+        print(f"{SearchText:<24}{Duration * 1000:>10.2f}{len(Scores):>9}  {Best}")
+    print(
+        f"mean {sum(Durations) / len(Durations) * 1000:.2f} ms, max {max(Durations) * 1000:.2f} ms"
+    )
+    print(f"index build: {IndexTime * 1000:.1f} ms (once)")
+
+    # The layout dialog builds the index in steps when it is idle, so the first search does not wait for it
+    Index.ClearIndex()
+    Steps = []
+    IsBuilt = False
+    while IsBuilt is False:
+        StartTime = time.perf_counter()
+        IsBuilt = Index.ContinueIndex(
+            StartTime + CommandSearch_Ribbon.INDEX_STEP_BUDGET / 1000
+        )
+        Steps.append(time.perf_counter() - StartTime)
+    print(
+        f"index build in idle steps: {len(Steps)} steps, max {max(Steps) * 1000:.1f} ms per step"
+    )
+    Index.ClearLastSearch()
+    StartTime = time.perf_counter()
+    Index.ReturnScores(RankedSearchTexts[0])
+    print(
+        f"first search after the idle steps: {(time.perf_counter() - StartTime) * 1000:.2f} ms"
+    )
+    return
+
+
+def main():
+    Arguments = sys.argv[1:]
+    Size = NoCommands
+    if len(Arguments) > 0:
+        Size = int(Arguments[0])
+
+    List_Commands = CreateCommands(Size)
+    Selected = [List_Commands[i][0] for i in range(0, Size, 250)]
+    Rows = [[Item[0], Item[4]] for Item in List_Commands]
+    print(f"Command search: {Size} commands, {len(Selected)} selected")
+
+    Index = CreateIndex(List_Commands)
+    StartTime = time.perf_counter()
+    Index.BuildIndex()
+    IndexTime = time.perf_counter() - StartTime
+
+    Results = {"rebuild": [], "index": []}
+    NoKeystrokes = 0
+    for SearchText in SearchTexts:
+        Index.ClearLastSearch()
+        for i in range(1, len(SearchText) + 1):
+            NoKeystrokes += 1
+            StartTime = time.perf_counter()
+            Rebuild(List_Commands, SearchText[:i], Selected)
+            Results["rebuild"].append(time.perf_counter() - StartTime)
+
+            StartTime = time.perf_counter()
+            Filter(Index, Rows, SearchText[:i], set(Selected))
+            Results["index"].append(time.perf_counter() - StartTime)
+
+    print(f"{'search':<12}{'mean (ms)':>12}{'max (ms)':>12}{'total (ms)':>12}")
+    for Name, Durations in Results.items():
+        print(
+            f"{Name:<12}{sum(Durations) / len(Durations) * 1000:>12.2f}"
+            f"{max(Durations) * 1000:>12.2f}{sum(Durations) * 1000:>12.1f}"
+        )
+    print(f"index build: {IndexTime * 1000:.1f} ms (once, in idle steps)")
+
+    # With a keystroke every KeystrokeInterval ms, the search runs once per word when the delay is longer
+    NoSearches = NoKeystrokes
+    if KeystrokeInterval < SearchDelay:
+        NoSearches = len(SearchTexts)
+    print(
+        f"{NoKeystrokes} keystrokes, {NoSearches} searches with a delay of {SearchDelay} ms"
+        f" when typing every {KeystrokeInterval} ms"
+    )
+
+    RankedSearch(max(Size, NoCommandsRanked))
+    return
+
+
+main()
@@ -0,0 +1,113 @@
+# *************************************************************************
+# *                                                                       *
+# * Copyright (c) 2019-2024 Hakan Seven, Geolta, Paul Ebbers              *
+# *                                                                       *
+# * This program is free software; you can redistribute it and/or modify  *
+# * it under the terms of the GNU Lesser General Public License (LGPL)    *
+# * as published by the Free Software Foundation; either version 3 of     *
+# * the License, or (at your option) any later version.                   *
+# * for detail see the LICENCE text file.                                 *
+# *                                                                       *
+# * This program is distributed in the hope that it will be useful,       *
+# * but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# * GNU Library General Public License for more details.                  *
+# *                                                                       *
+# * You should have received a copy of the GNU Library General Public     *
+# * License along with this program; if not, write to the Free Software   *
+# * Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# * USA                                                                   *
+# *                                                                       *
+# *************************************************************************
+
+# This script measures the deduplication in the list builders of the layout dialog on synthetic entries.
+# It compares:
+#   - list: check with "not in" on a list, like the list builders did before
+#   - set: check on a set with the keys that are already added
+# The keys are (command name, workbench name) tuples, like in the command list. About a quarter of the entries
+# are duplicates. Both ways keep the order in which the entries are added, which is checked as well.
+#
+# It does not need FreeCAD or Qt. Run it with python from the command line:
+#
+#   python Scripts/BenchmarkDedup.py [number of entries]
+
+import sys
+import time
+import random
+
+# Default number of synthetic entries
+NoEntries = 20000
+
+# The number of runs. The fastest run is reported.
+NoRuns = 3
+
+# Use a fixed seed, so the entries are the same on every run
+Seed = 1
+
+
+def CreateEntries(NoEntries: int) -> list:
+    """Returns a list of entries with the same layout as List_Commands:
+    [CommandName, IconName, MenuText, WorkBenchName, MenuTextTranslated]
+    About a quarter of the entries is a copy of an earlier entry.
+    """
+    Random = random.Random(Seed)
+    Entries = []
+    for i in range(NoEntries):
+        if i > 0 and Random.random() < 0.25:
+            Entries.append(list(Entries[Random.randrange(i)]))
+            continue
+        WorkBenchName = f"Workbench{i % 40}"
+        CommandName = f"WB{i % 40}_Command{i}"
+        Entries.append([CommandName, "", f"Command {i}", WorkBenchName, f"Command {i}"])
+    return Entries
+
+
+def DedupList(Entries: list) -> list:
+    """Deduplicate with a shadow list, like before"""
+    Result = []
+    ShadowList = []
+    for Entry in Entries:
+        if [Entry[0], Entry[3]] not in ShadowList:
+            Result.append(Entry)
+        ShadowList.append([Entry[0], Entry[3]])
+    return Result
+
+
+def DedupSet(Entries: list) -> list:
+    """Deduplicate with a set of keys"""
+    Result = []
+    ShadowList = set()
+    for Entry in Entries:
+        Key = (Entry[0], Entry[3])
+        if Key not in ShadowList:
+            Result.append(Entry)
+            ShadowList.add(Key)
+    return Result
+
+
+def main():
+    Arguments = sys.argv[1:]
+    Size = NoEntries
+    if len(Arguments) > 0:
+        Size = int(Arguments[0])
+
+    Entries = CreateEntries(Size)
+    Results = {"list": [], "set": []}
+    Outputs = {}
+    for i in range(NoRuns):
+        for Name, Function in [("list", DedupList), ("set", DedupSet)]:
+            StartTime = time.perf_counter()
+            Outputs[Name] = Function(Entries)
+            Results[Name].append(time.perf_counter() - StartTime)
+
+    print(
+        f"Deduplication: {Size} entries, {len(Outputs['set'])} unique, fastest of {NoRuns} runs"
+    )
+    print(f"{'dedup':<12}{'time (ms)':>12}")
+    for Name, Durations in Results.items():
+        print(f"{Name:<12}{min(Durations) * 1000:>12.1f}")
+    print(f"same entries in the same order: {Outputs['list'] == Outputs['set']}")
+    return
+
+
+main()
@@ -0,0 +1,374 @@
+# *************************************************************************
+# *                                                                       *
+# * Copyright (c) 2019-2024 Hakan Seven, Geolta, Paul Ebbers              *
+# *                                                                       *
+# * This program is free software; you can redistribute it and/or modify  *
+# * it under the terms of the GNU Lesser General Public License (LGPL)    *
+# * as published by the Free Software Foundation; either version 3 of     *
+# * the License, or (at your option) any later version.                   *
+# * for detail see the LICENCE text file.                                 *
+# *                                                                       *
+# * This program is distributed in the hope that it will be useful,       *
+# * but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# * GNU Library General Public License for more details.                  *
+# *                                                                       *
+# * You should have received a copy of the GNU Library General Public     *
+# * License along with this program; if not, write to the Free Software   *
+# * Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# * USA                                                                   *
+# *                                                                       *
+# *************************************************************************
+
+# This script measures the time to open the layout dialog and the time to open each tab for the first time.
+# The tabs are filled when they are opened for the first time. Opening all tabs takes about as long as
+# opening the dialog took when every tab was filled before the dialog was shown.
+#
+# It runs without FreeCAD. Qt runs with the offscreen platform and small stand-in modules for FreeCAD and
+# FreeCADGui provide the parameters, the commands and the workbenches. The data files and the ribbon structure
+# are synthetic and are written to a temporary folder. PySide6 must be installed. Run it with python:
+#
+#   python Scripts/BenchmarkLayoutDialog.py [number of commands]
+
+import os
+import sys
+import json
+import time
+import types
+import tempfile
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import PySide6
+from PySide6 import QtCore, QtGui, QtWidgets
+from PySide6.QtCore import QCoreApplication
+from PySide6.QtGui import QIcon
+from PySide6.QtWidgets import QApplication, QMainWindow, QWidget
+
+ParentPath = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ParentPath)
+
+# Default number of synthetic commands. These are divided over the workbenches and toolbars.
+NoCommands = 5000
+NoWorkbenches = 40
+NoToolbars = 5
+
+# The number of runs. The fastest run is reported.
+NoRuns = 3
+
+
+# region - Stand-in modules
+#
+# FreeCAD has its own PySide package, which maps to PySide6
+sys.modules["PySide"] = PySide6
+sys.modules["PySide.QtCore"] = QtCore
+sys.modules["PySide.QtGui"] = QtGui
+sys.modules["PySide.QtWidgets"] = QtWidgets
+
+
+class ParameterGroup:
+    """Stand-in for a FreeCAD parameter group. The values are kept in memory."""
+
+    def __init__(self):
+        self.Values = {}
+        self.Groups = {}
+        return
+
+    def Get(self, Type: str, Name: str, Default):
+        return self.Values.get((Type, Name), Default)
+
+    def Set(self, Type: str, Name: str, Value):
+        self.Values[(Type, Name)] = Value
+        return
+
+    def Names(self, Type: str) -> list:
+        return [Name for ValueType, Name in self.Values if ValueType == Type]
+
+    def GetString(self, Name, Default=""):
+        return self.Get("String", Name, Default)
+
+    def GetInt(self, Name, Default=0):
+        return self.Get("Integer", Name, Default)
+
+    def GetUnsigned(self, Name, Default=0):
+        return self.Get("Unsigned Long", Name, Default)
+
+    def GetFloat(self, Name, Default=0.0):
+        return self.Get("Float", Name, Default)
+
+    def GetBool(self, Name, Default=False):
+        return self.Get("Boolean", Name, Default)
+
+    def SetString(self, Name, Value):
+        self.Set("String", Name, Value)
+
+    def SetInt(self, Name, Value):
+        self.Set("Integer", Name, Value)
+
+    def SetUnsigned(self, Name, Value):
+        self.Set("Unsigned Long", Name, Value)
+
+    def SetFloat(self, Name, Value):
+        self.Set("Float", Name, Value)
+
+    def SetBool(self, Name, Value):
+        self.Set("Boolean", Name, Value)
+
+    def GetInts(self):
+        return self.Names("Integer")
+
+    def GetStrings(self):
+        return self.Names("String")
+
+    def GetContents(self):
+        return [(Type, Name, Value) for (Type, Name), Value in self.Values.items()]
+
+    def GetGroup(self, Name):
+        return self.Groups.setdefault(Name, ParameterGroup())
+
+    def GetGroups(self):
+        return list(self.Groups)
+
+    def RemGroup(self, Name):
+        self.Groups.pop(Name, None)
+
+    def Attach(self, Observer):
+        return
+
+
+class StandInCommand:
+    """Stand-in for a FreeCAD command"""
+
+    def __init__(self, CommandItem: list):
+        self.Info = {
+            "name": CommandItem[0],
+            "menuText": CommandItem[2],
+            "toolTip": f"Runs {CommandItem[2]}",
+            "whatsThis": CommandItem[0],
+            "statusTip": f"Runs {CommandItem[2]}",
+            "pixmap": CommandItem[1],
+        }
+        return
+
+    def getInfo(self):
+        return dict(self.Info)
+
+    def getAction(self):
+        return []
+
+
+class StandInWorkbench:
+    """Stand-in for a FreeCAD workbench"""
+
+    def __init__(self, WorkBenchItem: list):
+        self.Item = WorkBenchItem
+        self.MenuText = WorkBenchItem[2]
+        self.Icon = WorkBenchItem[1]
+        return
+
+    def name(self):
+        return self.Item[0]
+
+    def listToolbars(self):
+        return list(self.Item[3])
+
+    def getToolbarItems(self):
+        return self.Item[3]
+
+
+def CreateStandInModules(Data: dict) -> None:
+    """Create the modules FreeCAD and FreeCADGui with the commands and workbenches of the synthetic data"""
+    Parameters = {}
+    Commands = {Item[0]: StandInCommand(Item) for Item in Data["List_Commands"]}
+    Workbenches = {Item[0]: StandInWorkbench(Item) for Item in Data["List_Workbenches"]}
+    ActiveWorkbench = next(iter(Workbenches.values()))
+
+    # The main window with a help menu, like FreeCAD
+    MainWindow = QMainWindow()
+    HelpMenu = MainWindow.menuBar().addMenu("&Help")
+    HelpMenu.setObjectName("&Help")
+    HelpMenu.addAction("Help")
+
+    App = types.ModuleType("FreeCAD")
+    App.ParamGet = lambda Path: Parameters.setdefault(Path, ParameterGroup())
+    App.Qt = types.SimpleNamespace(
+        translate=lambda Context, Text, *args: QCoreApplication.translate(Context, Text)
+    )
+    App.Console = types.SimpleNamespace(
+        PrintMessage=print, PrintWarning=print, PrintError=print, PrintLog=print
+    )
+    App.Version = lambda: ["1", "0", "0", "0"]
+    App.getHomePath = lambda: tempfile.gettempdir()
+    App.getUserAppDataDir = lambda: tempfile.gettempdir()
+    App.saveParameter = lambda *args: None
+
+    Gui = types.ModuleType("FreeCADGui")
+    Gui.getMainWindow = lambda: MainWindow
+    Gui.getIcon = lambda Name: QIcon()
+    Gui.updateGui = QApplication.processEvents
+    Gui.listCommands = lambda: list(Commands)
+    Gui.Command = types.SimpleNamespace(
+        get=Commands.get, listByShortcut=lambda ShortCut: []
+    )
+    Gui.listWorkbenches = lambda: dict(Workbenches)
+    Gui.getWorkbench = Workbenches.get
+    Gui.activeWorkbench = lambda: ActiveWorkbench
+    Gui.activateWorkbench = lambda Name: None
+    Gui.PySideUic = types.SimpleNamespace(loadUi=LoadUi)
+
+    sys.modules["FreeCAD"] = App
+    sys.modules["FreeCADGui"] = Gui
+    return
+
+
+def LoadUi(UiFile: str):
+    """Create the form from the generated ui module. Like in FreeCAD, the controls are attributes of the form."""
+    import Design_ui
+
+    Form = QWidget()
+    Ui = Design_ui.Ui_Form()
+    Ui.setupUi(Form)
+    for Name, Control in vars(Ui).items():
+        setattr(Form, Name, Control)
+    return Form
+
+
+# endregion
+
+
+def CreateData(Size: int) -> dict:
+    """Returns the data of a synthetic data file with Size commands"""
+    List_Workbenches = []
+    StringList_Toolbars = []
+    List_Commands = []
+    NoCommandsPerToolbar = max(1, Size // (NoWorkbenches * NoToolbars))
+    for i in range(NoWorkbenches):
+        WorkBenchName = f"Workbench{i}Workbench"
+        WorkBenchTitle = f"Workbench {i}"
+        ToolbarItems = {}
+        for j in range(NoToolbars):
+            Toolbar = f"Toolbar {i}.{j}"
+            ToolbarItems[Toolbar] = []
+            StringList_Toolbars.append(
+                [Toolbar, WorkBenchTitle, WorkBenchName, Toolbar]
+            )
+            for k in range(NoCommandsPerToolbar):
+                CommandName = f"WB{i}_Command{j}_{k}"
+                MenuText = f"Command {i}.{j}.{k}"
+                ToolbarItems[Toolbar].append(CommandName)
+                List_Commands.append(
+                    [CommandName, CommandName, MenuText, WorkBenchName, MenuText]
+                )
+        List_Workbenches.append(
+            [WorkBenchName, "", WorkBenchTitle, ToolbarItems, WorkBenchTitle]
+        )
+    return {
+        "dataVersion": "1.1",
+        "Language": "",
+        "List_Workbenches": List_Workbenches,
+        "StringList_Toolbars": StringList_Toolbars,
+        "List_Commands": List_Commands,
+    }
+
+
+def CreateRibbonStructure(Data: dict) -> dict:
+    """Returns a ribbon structure with some quick access commands and excluded toolbars"""
+    return {
+        "ignoredToolbars": [Item[0] for Item in Data["StringList_Toolbars"][::10]],
+        "iconOnlyToolbars": [],
+        "quickAccessCommands": [Item[0] for Item in Data["List_Commands"][::500]],
+        "ignoredWorkbenches": [],
+        "customToolbars": {},
+        "dropdownButtons": {},
+        "newPanels": {},
+        "workbenches": {},
+    }
+
+
+def OpenDialog(LoadDesign_Ribbon) -> list:
+    """Opens the dialog and then every tab. Returns the time in seconds to open the dialog and each tab."""
+    StartTime = time.perf_counter()
+    Dialog = LoadDesign_Ribbon.LoadDialog()
+    Dialog.form.show()
+    QApplication.processEvents()
+    Durations = [time.perf_counter() - StartTime]
+
+    TabWidget = Dialog.form.tabWidget
+    for i in range(1, TabWidget.count()):
+        StartTime = time.perf_counter()
+        TabWidget.setCurrentIndex(i)
+        QApplication.processEvents()
+        Durations.append(time.perf_counter() - StartTime)
+
+    # A tab that failed to fill is only partly filled, so its time would be wrong
+    if len(Dialog.FailedTabParts) > 0:
+        raise RuntimeError(
+            f"Filling the tabs failed: {', '.join(sorted(Dialog.FailedTabParts))}"
+        )
+
+    Dialog.form.close()
+    Dialog.form.deleteLater()
+    QApplication.processEvents()
+    return Durations
+
+
+def main():
+    Arguments = sys.argv[1:]
+    Size = NoCommands
+    if len(Arguments) > 0:
+        Size = int(Arguments[0])
+
+    Application = QApplication.instance() or QApplication(sys.argv)
+
+    # Write the synthetic data and ribbon structure to a temporary folder
+    Folder = tempfile.mkdtemp()
+    Data = CreateData(Size)
+    DataFile = os.path.join(Folder, "RibbonDataFile.dat")
+    with open(DataFile, "w") as file:
+        json.dump(Data, file)
+    JsonFile = os.path.join(Folder, "RibbonStructure.json")
+    with open(JsonFile, "w") as file:
+        json.dump(CreateRibbonStructure(Data), file)
+
+    CreateStandInModules(Data)
+    import FreeCAD as App
+
+    App.ParamGet("User parameter:BaseApp/Preferences/Mod/FreeCAD-Ribbon").SetString(
+        "RibbonStructure", JsonFile
+    )
+
+    import Catalog_Ribbon
+    import Standard_Functions_RIbbon as StandardFunctions
+
+    # Use the synthetic data and answer "no" to the questions of the dialog
+    Catalog_Ribbon._SharedCatalog = Catalog_Ribbon.CommandCatalog(
+        DataFile, os.path.join(Folder, "RibbonDataFile2.dat")
+    )
+    StandardFunctions.Mbox = lambda *args, **kwargs: "no"
+
+    import LoadDesign_Ribbon
+
+    Results = []
+    for i in range(NoRuns):
+        Results.append(OpenDialog(LoadDesign_Ribbon))
+
+    # Get the tab names from a form
+    Form = LoadUi("")
+    TabNames = ["open dialog"] + [
+        f"tab: {Form.tabWidget.tabText(i)}" for i in range(1, Form.tabWidget.count())
+    ]
+    Form.deleteLater()
+
+    print(
+        f"Layout dialog: {len(Data['List_Commands'])} commands, {NoWorkbenches} workbenches, "
+        f"fastest of {NoRuns} runs"
+    )
+    print(f"{'':<32}{'time (ms)':>12}")
+    Fastest = [min(Durations) for Durations in zip(*Results)]
+    for Name, Duration in zip(TabNames, Fastest):
+        print(f"{Name:<32}{Duration * 1000:>12.1f}")
+    print(f"{'open dialog and all tabs':<32}{sum(Fastest) * 1000:>12.1f}")
+    return
+
+
+main()
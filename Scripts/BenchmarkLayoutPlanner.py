@@ -0,0 +1,208 @@
+# *************************************************************************
+# *                                                                       *
+# * Copyright (c) 2024 Paul Ebbers                                        *
+# *                                                                       *
+# * This program is free software; you can redistribute it and/or modify  *
+# * it under the terms of the GNU Lesser General Public License (LGPL)    *
+# * as published by the Free Software Foundation; either version 3 of     *
+# * the License, or (at your option) any later version.                   *
+# * for detail see the LICENCE text file.                                 *
+# *                                                                       *
+# * This program is distributed in the hope that it will be useful,       *
+# * but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# * GNU Library General Public License for more details.                  *
+# *                                                                       *
+# * You should have received a copy of the GNU Library General Public     *
+# * License along with this program; if not, write to the Free Software   *
+# * Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# * USA                                                                   *
+# *                                                                       *
+# *************************************************************************
+
+# This script measures the layout planner on a large synthetic ribbon structure.
+# It does not need FreeCAD or Qt. Run it with python from the command line:
+#
+#   python Scripts/BenchmarkLayoutPlanner.py [workbenches] [toolbars per workbench] [commands per toolbar]
+#
+# With the option --write <file>, the plans are written as json. Compare two of these files to check
+# a change of the planner for layout regressions.
+
+import os
+import sys
+import json
+import time
+import random
+
+ParentPath = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ParentPath)
+
+import LayoutPlanner_Ribbon
+
+# Default size of the synthetic structure
+NoWorkbenches = 40
+NoToolbars = 12
+NoCommands = 25
+
+# Use a fixed seed, so the structure is the same on every run
+Seed = 1
+
+
+def CreateStructure(NoWorkbenches: int, NoToolbars: int, NoCommands: int):
+    """Returns a ribbon structure and the button info per workbench and toolbar"""
+    Random = random.Random(Seed)
+    Structure = {
+        "workbenches": {},
+        "customToolbars": {},
+        "newPanels": {},
+        "ignoredToolbars": [],
+        "iconOnlyToolbars": [],
+    }
+    Buttons = {}
+
+    for w in range(NoWorkbenches):
+        WorkBenchName = f"Workbench{w}"
+        Toolbars = {}
+        Buttons[WorkBenchName] = {}
+        for t in range(NoToolbars):
+            Toolbar = f"{WorkBenchName} - Toolbar {t}"
+            Commands = {}
+            Order = []
+            ButtonList = []
+            for c in range(NoCommands):
+                CommandName = f"WB{w}_Command{t}_{c}"
+                MenuText = f"Command {t} {c} of {WorkBenchName}"
+                Commands[CommandName] = {
+                    "size": Random.choice(["small", "small", "medium", "large"]),
+                    "text": Random.choice(["", MenuText, f"Alternative {c}"]),
+                    "icon": "",
+                }
+                Order.append(MenuText)
+                if c % 8 == 7:
+                    Order.append(f"separator_{c}")
+                ButtonList.append(
+                    {
+                        "Key": CommandName,
+                        "HasAction": True,
+                        "ButtonText": MenuText,
+                        "SortText": MenuText,
+                        "HasMenu": c % 10 == 0,
+                        "ActionText": f"&{MenuText}",
+                        "CommandText": f"&{MenuText}",
+                        "MenuText": MenuText,
+                        "IsLoaded": True,
+                    }
+                )
+            # Shuffle the buttons, the planner has to sort them
+            Random.shuffle(ButtonList)
+            Toolbars[Toolbar] = {"order": Order, "commands": Commands}
+            Buttons[WorkBenchName][Toolbar] = ButtonList
+            if t % 5 == 4:
+                Structure["iconOnlyToolbars"].append(Toolbar)
+        Toolbars["order"] = list(reversed(list(Toolbars.keys())))
+        Structure["workbenches"][WorkBenchName] = {"toolbars": Toolbars}
+    return Structure, Buttons
+
+
+def PlanAll(
+    Structure: dict,
+    Buttons: dict,
+    Settings: dict,
+    Cached: bool,
+    StructureHash: str = "",
+):
+    Plans = {}
+    for WorkBenchName, Toolbars in Buttons.items():
+        ListToolbars = LayoutPlanner_Ribbon.ReturnToolbars(
+            Structure, WorkBenchName, list(Toolbars.keys()), Settings
+        )
+        Plans[WorkBenchName] = []
+        for Toolbar in ListToolbars:
+            if LayoutPlanner_Ribbon.IsIgnored(Structure, Toolbar) is True:
+                continue
+            Arguments = [
+                Structure,
+                WorkBenchName,
+                WorkBenchName,
+                Toolbar,
+                Toolbar,
+                Toolbars.get(Toolbar, []),
+                Settings,
+            ]
+            if Cached is True:
+                Plan = LayoutPlanner_Ribbon.ReturnPanelPlan(
+                    *Arguments, StructureHash=StructureHash
+                )
+            else:
+                Plan = LayoutPlanner_Ribbon.PlanPanel(*Arguments)
+            Plans[WorkBenchName].append(Plan)
+    return Plans
+
+
+def main():
+    Arguments = sys.argv[1:]
+    OutputFile = ""
+    if "--write" in Arguments:
+        Index = Arguments.index("--write")
+        OutputFile = Arguments[Index + 1]
+        del Arguments[Index : Index + 2]
+    Sizes = [NoWorkbenches, NoToolbars, NoCommands]
+    for i in range(min(len(Arguments), 3)):
+        Sizes[i] = int(Arguments[i])
+
+    Structure, Buttons = CreateStructure(*Sizes)
+    Settings = dict(LayoutPlanner_Ribbon.DefaultSettings)
+    Settings["MaxColumns"] = 6
+    NoButtons = Sizes[0] * Sizes[1] * Sizes[2]
+    print(
+        f"Layout planner: {Sizes[0]} workbenches, {Sizes[0] * Sizes[1]} panels, {NoButtons} buttons"
+    )
+
+    StartTime = time.perf_counter()
+    Plans = PlanAll(Structure, Buttons, Settings, False)
+    PlanTime = time.perf_counter() - StartTime
+
+    # The structure hash is calculated once, when the ribbon is created
+    StartTime = time.perf_counter()
+    StructureHash = LayoutPlanner_Ribbon.ReturnStructureHash(Structure)
+    HashTime = time.perf_counter() - StartTime
+
+    LayoutPlanner_Ribbon.ClearPlanCache()
+    StartTime = time.perf_counter()
+    PlanAll(Structure, Buttons, Settings, True, StructureHash)
+    ColdTime = time.perf_counter() - StartTime
+
+    StartTime = time.perf_counter()
+    CachedPlans = PlanAll(Structure, Buttons, Settings, True, StructureHash)
+    WarmTime = time.perf_counter() - StartTime
+
+    if CachedPlans != Plans:
+        print("Error: the cached plans are different from the planned ones")
+
+    NoItems = sum(
+        len(Plan["Items"]) for PlanList in Plans.values() for Plan in PlanList
+    )
+    NoOverflow = sum(
+        len(Plan["Overflow"]) for PlanList in Plans.values() for Plan in PlanList
+    )
+    print(f"{'run':<24}{'total (ms)':>12}{'per panel (us)':>16}")
+    for Name, Duration in [
+        ("plan", PlanTime),
+        ("plan + cache (cold)", ColdTime),
+        ("cached (warm)", WarmTime),
+    ]:
+        print(
+            f"{Name:<24}{Duration * 1000:>12.1f}{Duration * 1e6 / (Sizes[0] * Sizes[1]):>16.1f}"
+        )
+    print(f"structure hash: {HashTime * 1000:.1f} ms")
+    print(f"{NoItems} items planned, {NoOverflow} buttons in option menus")
+
+    if OutputFile != "":
+        with open(OutputFile, "w") as outfile:
+            json.dump(Plans, outfile, indent=1)
+        outfile.close()
+        print(f"Plans written to {OutputFile}")
+    return
+
+
+main()
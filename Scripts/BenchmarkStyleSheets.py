@@ -0,0 +1,158 @@
+# *************************************************************************
+# *                                                                       *
+# * Copyright (c) 2019-2024 Hakan Seven, Geolta, Paul Ebbers              *
+# *                                                                       *
+# * This program is free software; you can redistribute it and/or modify  *
+# * it under the terms of the GNU Lesser General Public License (LGPL)    *
+# * as published by the Free Software Foundation; either version 3 of     *
+# * the License, or (at your option) any later version.                   *
+# * for detail see the LICENCE text file.                                 *
+# *                                                                       *
+# * This program is distributed in the hope that it will be useful,       *
+# * but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# * GNU Library General Public License for more details.                  *
+# *                                                                       *
+# * You should have received a copy of the GNU Library General Public     *
+# * License along with this program; if not, write to the Free Software   *
+# * Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# * USA                                                                   *
+# *                                                                       *
+# *************************************************************************
+
+# This script compares the build time of a tab with 200 custom buttons for two ways of styling:
+#   - per widget: every button, command button, arrow button and label gets its own stylesheet
+#     (the way the buttons were styled before)
+#   - ribbon stylesheet: one stylesheet on the parent, the buttons only get properties
+#
+# Run it as a macro in FreeCAD (the ribbon addon must be installed). The results are printed in the report view.
+
+import FreeCAD as App
+import FreeCADGui as Gui
+import os
+import sys
+import time
+
+from PySide.QtGui import QAction, QIcon
+from PySide.QtWidgets import QApplication, QGridLayout, QMenu, QWidget
+from PySide.QtCore import QSize
+
+ParentPath = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ParentPath)
+
+import StyleMapping_Ribbon
+from CustomWidgets import CustomControls
+
+# The number of buttons in the tab and the number of runs. The fastest run is reported.
+NoButtons = 200
+NoRuns = 3
+
+
+def ReturnPerWidgetStyleSheets() -> dict:
+    """Returns the stylesheets per widget role, like they were set before the ribbon stylesheet"""
+    Background = StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
+    StyleSheet = StyleMapping_Ribbon.CreateStyleSheet(
+        control="toolbutton", radius="2px"
+    )
+    Addition = (
+        "QToolButton, QTextEdit {background-color: "
+        + Background
+        + ";border: 0.5px solid"
+        + Background
+        + ";border-top: 0px solid"
+        + Background
+        + ";border-radius: 2px;margin: 0px;spacing: 0px;}"
+    )
+    return {
+        "button": "QToolButton, QToolButton:hover {background-color: "
+        + Background
+        + ";border: none;}"
+        + StyleSheet,
+        "command": Addition + StyleSheet,
+        "label": Addition + StyleSheet,
+        "arrow": Addition
+        + """QToolButton::menu-indicator {
+                subcontrol-origin: padding;
+                subcontrol-position: center top;
+            }"""
+        + StyleSheet,
+    }
+
+
+def CreateButton(Index: int, Parent: QWidget):
+    """Creates a large or small custom button. Every fifth button has a menu."""
+    Action = QAction(f"Command {Index}", Parent)
+    Action.setIcon(QIcon(Gui.getIcon("Std_New")))
+    Menu = QMenu(Parent)
+    if Index % 5 == 0:
+        for i in range(3):
+            Menu.addAction(QAction(f"Command {Index}.{i}", Parent))
+    if Index % 3 == 0:
+        return CustomControls.LargeCustomToolButton(
+            Text=f"Large command {Index}",
+            Action=Action,
+            Icon=Action.icon(),
+            IconSize=QSize(32, 32),
+            ButtonSize=QSize(32, 32),
+            Menu=Menu,
+        )
+    return CustomControls.CustomToolButton(
+        Text=f"Small command {Index}",
+        Action=Action,
+        Icon=Action.icon(),
+        IconSize=QSize(16, 16),
+        ButtonSize=QSize(16, 16),
+        Menu=Menu,
+    )
+
+
+def BuildTab(PerWidget: bool) -> float:
+    """Builds and shows a tab with custom buttons. Returns the time in seconds."""
+    StyleSheets = ReturnPerWidgetStyleSheets()
+    Tab = QWidget()
+    Layout = QGridLayout(Tab)
+
+    StartTime = time.perf_counter()
+    if PerWidget is False:
+        Tab.setStyleSheet(StyleMapping_Ribbon.ReturnRibbonStyleSheet())
+    for Index in range(NoButtons):
+        btn = CreateButton(Index, Tab)
+        if PerWidget is True:
+            # Set the stylesheets per widget, like before
+            btn.setStyleSheet(StyleSheets["button"])
+            for Widget in btn.findChildren(QWidget):
+                Role = Widget.property("ribbonRole")
+                if Role in StyleSheets:
+                    Widget.setStyleSheet(StyleSheets[Role])
+        Layout.addWidget(btn, Index % 3, Index // 3)
+    # Styles are applied when the widgets are polished. This happens when they are shown.
+    Tab.show()
+    QApplication.processEvents()
+    Duration = time.perf_counter() - StartTime
+
+    Tab.hide()
+    Tab.deleteLater()
+    QApplication.processEvents()
+    return Duration
+
+
+def main():
+    Results = {"per widget": [], "ribbon stylesheet": []}
+    for i in range(NoRuns):
+        Results["per widget"].append(BuildTab(True))
+        Results["ribbon stylesheet"].append(BuildTab(False))
+
+    Lines = [
+        f"Stylesheet benchmark: {NoButtons} buttons, fastest of {NoRuns} runs",
+        f"{'styling':<24}{'build (ms)':>12}{'per button (us)':>18}",
+    ]
+    for Name, Durations in Results.items():
+        Duration = min(Durations)
+        Lines.append(
+            f"{Name:<24}{Duration * 1000:>12.1f}{Duration * 1e6 / NoButtons:>18.1f}"
+        )
+    App.Console.PrintMessage("\n".join(Lines) + "\n")
+    return
+
+
+main()
@@ -0,0 +1,141 @@
+# *************************************************************************
+# *                                                                       *
+# * Copyright (c) 2024 Paul Ebbers                                        *
+# *                                                                       *
+# * This program is free software; you can redistribute it and/or modify  *
+# * it under the terms of the GNU Lesser General Public License (LGPL)    *
+# * as published by the Free Software Foundation; either version 3 of     *
+# * the License, or (at your option) any later version.                   *
+# * for detail see the LICENCE text file.                                 *
+# *                                                                       *
+# * This program is distributed in the hope that it will be useful,       *
+# * but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# * GNU Library General Public License for more details.                  *
+# *                                                                       *
+# * You should have received a copy of the GNU Library General Public     *
+# * License along with this program; if not, write to the Free Software   *
+# * Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# * USA                                                                   *
+# *                                                                       *
+# *************************************************************************
+
+# This script compares the size and speed of the icon serialization formats.
+# Run it as a macro in FreeCAD. It uses the icons of all commands that are currently loaded.
+# Load the workbenches you want to include first, for a realistic comparison.
+#
+# The results are printed to the report view.
+
+import FreeCAD as App
+import FreeCADGui as Gui
+import os
+import sys
+import json
+import time
+import tempfile
+
+ParentPath = os.path.dirname(os.path.dirname(__file__))
+sys.path.append(ParentPath)
+
+import Serialize_Ribbon
+import IconStore_Ribbon
+import Standard_Functions_RIbbon as StandardFunctions
+
+# Set the maximum number of icons to use. Set to 0 to use all icons
+MaxIcons = 0
+
+
+def main():
+    Icons = CollectIcons()
+    print(f"Ribbon UI: comparing icon serialization for {len(Icons)} icons")
+
+    Results = []
+    for Encoding in [Serialize_Ribbon.ENCODING_PNG, Serialize_Ribbon.ENCODING_ARGB32]:
+        Results.append(Measure(f"full/{Encoding}", Icons, False, Encoding))
+        Results.append(Measure(f"compact/{Encoding}", Icons, True, Encoding))
+
+    print(
+        f"{'format':<16}{'json (kB)':>12}{'store (kB)':>12}"
+        f"{'pixmaps':>10}{'encode (s)':>12}{'decode (s)':>12}"
+    )
+    for Result in Results:
+        print(
+            f"{Result['format']:<16}"
+            f"{Result['json'] / 1024:>12.1f}"
+            f"{Result['store'] / 1024:>12.1f}"
+            f"{Result['pixmaps']:>10}"
+            f"{Result['encode']:>12.3f}"
+            f"{Result['decode']:>12.3f}"
+        )
+    return
+
+
+def CollectIcons():
+    Icons = []
+    for CommandName in Gui.listCommands():
+        try:
+            IconName = StandardFunctions.CommandInfoCorrections(CommandName)["pixmap"]
+            Icon = StandardFunctions.returnQiCons_Commands(CommandName, IconName)
+            if Icon is not None and Icon.isNull() is False:
+                Icons.append([CommandName, Icon])
+        except Exception:
+            continue
+        if MaxIcons > 0 and len(Icons) >= MaxIcons:
+            break
+    return Icons
+
+
+def Measure(Format: str, Icons: list, Compact: bool, Encoding: str):
+    Pool = {}
+
+    # Serialize
+    StartTime = time.perf_counter()
+    SerializedIcons = []
+    for CommandName, Icon in Icons:
+        SerializedIcons.append(
+            [CommandName, Serialize_Ribbon.serializeIcon(Icon, Compact, Pool, Encoding)]
+        )
+    EncodeTime = time.perf_counter() - StartTime
+
+    # Size as it was stored in the json data file
+    JsonData = {"Command_Icons": SerializedIcons}
+    if Compact is True:
+        JsonData["Pixmaps"] = Pool
+    JsonSize = len(json.dumps(JsonData, indent=4))
+
+    # Size in the binary icon store
+    StoreFile = os.path.join(
+        tempfile.gettempdir(), f"RibbonIconStore_{Format.replace('/', '_')}.dat"
+    )
+    IconStore_Ribbon.WriteIconStore([], SerializedIcons, StoreFile, Pixmaps=Pool)
+    StoreSize = os.path.getsize(StoreFile)
+    os.remove(StoreFile)
+
+    # Deserialize
+    StartTime = time.perf_counter()
+    for CommandName, SerializedIcon in SerializedIcons:
+        Serialize_Ribbon.deserializeIcon(SerializedIcon, Pool)
+    DecodeTime = time.perf_counter() - StartTime
+
+    # Count the stored pixmaps
+    if Compact is True:
+        PixmapCount = len(Pool)
+    else:
+        PixmapCount = 0
+        for CommandName, SerializedIcon in SerializedIcons:
+            for wPixmaps in SerializedIcon.values():
+                for hPixmaps in wPixmaps.values():
+                    for modePixmaps in hPixmaps.values():
+                        PixmapCount = PixmapCount + len(modePixmaps)
+
+    return {
+        "format": Format,
+        "json": JsonSize,
+        "store": StoreSize,
+        "pixmaps": PixmapCount,
+        "encode": EncodeTime,
+        "decode": DecodeTime,
+    }
+
+
+main()
@@ -26,28 +26,26 @@
 
 import json
 import os
+import sys
 
 ParentPath = os.path.dirname(os.path.dirname(__file__))
 JsonName = "RibbonStructure.json"
 # get the path for the Json file
 JsonFile = os.path.join(ParentPath, JsonName)
 
-# Check if there is a datafile. if not, ask the user to create one.
-DataFile = os.path.join(ParentPath, "RibbonDataFile.dat")
+# Get the data from the catalog. This reads the data files.
+sys.path.append(ParentPath)
+import Catalog_Ribbon
 
-Data = {}
-# read ribbon structure from JSON file
-with open(DataFile, "r") as file:
-    Data.update(json.load(file))
-file.close()
+Catalog = Catalog_Ribbon.ReturnCatalog(LoadAll=True)
 ListWorkbenchesData = []
-for item in Data["List_Workbenches"]:
+for item in Catalog.List_Workbenches:
     ListWorkbenchesData.append([item[0], item[3]])
 
 # Load the standard lists for Workbenches, toolbars and commands
-List_Workbenches = Data["List_Workbenches"]
-StringList_Toolbars = Data["StringList_Toolbars"]
-List_Commands = Data["List_Commands"]
+List_Workbenches = Catalog.List_Workbenches
+StringList_Toolbars = Catalog.StringList_Toolbars
+List_Commands = Catalog.List_Commands
 
 # Create two identical dicts from the json file
 RibbonData = {}
@@ -0,0 +1,213 @@
+# *************************************************************************
+# *                                                                       *
+# * Copyright (c) 2019-2024 Hakan Seven, Geolta, Paul Ebbers              *
+# *                                                                       *
+# * This program is free software; you can redistribute it and/or modify  *
+# * it under the terms of the GNU Lesser General Public License (LGPL)    *
+# * as published by the Free Software Foundation; either version 3 of     *
+# * the License, or (at your option) any later version.                   *
+# * for detail see the LICENCE text file.                                 *
+# *                                                                       *
+# * This program is distributed in the hope that it will be useful,       *
+# * but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# * GNU Library General Public License for more details.                  *
+# *                                                                       *
+# * You should have received a copy of the GNU Library General Public     *
+# * License along with this program; if not, write to the Free Software   *
+# * Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# * USA                                                                   *
+# *                                                                       *
+# *************************************************************************
+
+# This script checks the update check of the ribbon against a local http server, which stands in for GitHub.
+# It checks:
+#   - 200: the version is read from the package.xml and the ETag and Last-Modified are cached
+#   - TTL: within the TTL no request is made
+#   - 304: after the TTL a conditional request is made (If-None-Match / If-Modified-Since)
+#     and the cached version is kept
+#   - a changed package.xml is downloaded again
+#   - timeout: a server that does not answer in time does not block longer than the timeout,
+#     and the failed request is cached
+#
+# It does not need FreeCAD. requests_local needs urllib3, like in FreeCAD. PySide6 is used when PySide is
+# not available. Run it with python from the command line:
+#
+#   python Scripts/TestUpdateCheck.py
+
+import os
+import sys
+import time
+import tempfile
+import importlib.util
+import threading
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ParentPath = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ParentPath)
+sys.path.append(os.path.join(ParentPath, "Resources", "packages"))
+
+# FreeCAD has its own PySide package, which maps to PySide6
+if importlib.util.find_spec("PySide") is None:
+    import PySide6
+    from PySide6 import QtCore
+
+    sys.modules["PySide"] = PySide6
+    sys.modules["PySide.QtCore"] = QtCore
+
+import UpdateCheck_Ribbon
+
+# Time in seconds that the slow path waits before answering. Longer than the timeout of the check.
+SlowDelay = 3
+Timeout = (0.5, 0.5)
+
+
+class PackageServer(BaseHTTPRequestHandler):
+    """Serves a package.xml like raw.githubusercontent.com. /slow answers after SlowDelay seconds."""
+
+    # Shared by all requests
+    Version = "1.0.0"
+    ETag = '"v1"'
+    LastModified = formatdate(0, usegmt=True)
+    UseETag = True
+    # per answered request: [path, status, If-None-Match, If-Modified-Since]
+    Requests = []
+    Arrivals = 0  # number of requests, counted when they arrive
+
+    def do_GET(self):
+        PackageServer.Arrivals += 1
+        IfNoneMatch = self.headers.get("If-None-Match", "")
+        IfModifiedSince = self.headers.get("If-Modified-Since", "")
+        if self.path == "/slow":
+            time.sleep(SlowDelay)
+
+        Status = 200
+        if PackageServer.UseETag is True and IfNoneMatch == PackageServer.ETag:
+            Status = 304
+        if (
+            PackageServer.UseETag is False or IfNoneMatch == ""
+        ) and IfModifiedSince == PackageServer.LastModified:
+            Status = 304
+        PackageServer.Requests.append([self.path, Status, IfNoneMatch, IfModifiedSince])
+
+        try:
+            self.send_response(Status)
+            if PackageServer.UseETag is True:
+                self.send_header("ETag", PackageServer.ETag)
+            self.send_header("Last-Modified", PackageServer.LastModified)
+            if Status == 304:
+                self.end_headers()
+                return
+            Body = (
+                '<?xml version="1.0" encoding="UTF-8"?>\n'
+                '<package format="1" xmlns="https://wiki.freecad.org/Package_Metadata">\n'
+                f"  <name>FreeCAD Ribbon</name>\n  <version>{PackageServer.Version}</version>\n"
+                "</package>\n"
+            ).encode("utf-8")
+            self.send_header("Content-Type", "application/xml")
+            self.send_header("Content-Length", str(len(Body)))
+            self.end_headers()
+            self.wfile.write(Body)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client of the slow path gave up already
+            pass
+        return
+
+    def log_message(self, format, *args):
+        return
+
+
+Failures = []
+
+
+def Check(Name: str, Condition: bool, Detail=""):
+    print(f"{'ok' if Condition else 'FAILED':<8}{Name} {Detail}")
+    if Condition is False:
+        Failures.append(Name)
+    return
+
+
+def main():
+    Server = ThreadingHTTPServer(("127.0.0.1", 0), PackageServer)
+    threading.Thread(target=Server.serve_forever, daemon=True).start()
+    Url = f"http://127.0.0.1:{Server.server_address[1]}/package.xml"
+    CacheFile = os.path.join(tempfile.mkdtemp(), "RibbonUpdateCheck.json")
+    Requests = PackageServer.Requests
+
+    # 200: the first check downloads the package.xml
+    Version = UpdateCheck_Ribbon.ReturnLatestVersion(Url, CacheFile, 3600, Timeout)
+    Cache = UpdateCheck_Ribbon.ReadCache(CacheFile)
+    Check("200", Version == "1.0.0" and len(Requests) == 1, f"(version {Version})")
+    Check(
+        "200 caches the ETag",
+        Cache.get("ETag") == PackageServer.ETag,
+        f"({Cache.get('ETag')})",
+    )
+
+    # TTL: within the TTL, no request is made
+    Version = UpdateCheck_Ribbon.ReturnLatestVersion(Url, CacheFile, 3600, Timeout)
+    Check(
+        "TTL", Version == "1.0.0" and len(Requests) == 1, f"({len(Requests)} requests)"
+    )
+
+    # 304 with ETag: after the TTL, the request is conditional and the cached version is kept
+    Version = UpdateCheck_Ribbon.ReturnLatestVersion(Url, CacheFile, 0, Timeout)
+    Check(
+        "304 (If-None-Match)",
+        Version == "1.0.0"
+        and Requests[-1][1] == 304
+        and Requests[-1][2] == PackageServer.ETag,
+        f"(status {Requests[-1][1]}, If-None-Match {Requests[-1][2]})",
+    )
+
+    # 304 with Last-Modified only: a server without ETag
+    PackageServer.UseETag = False
+    UpdateCheck_Ribbon.WriteCache(
+        dict(UpdateCheck_Ribbon.ReadCache(CacheFile), ETag=""), CacheFile
+    )
+    Version = UpdateCheck_Ribbon.ReturnLatestVersion(Url, CacheFile, 0, Timeout)
+    Check(
+        "304 (If-Modified-Since)",
+        Version == "1.0.0"
+        and Requests[-1][1] == 304
+        and Requests[-1][3] == PackageServer.LastModified,
+        f"(status {Requests[-1][1]}, If-Modified-Since {Requests[-1][3]})",
+    )
+    PackageServer.UseETag = True
+
+    # A new version: the ETag does not match anymore, so the package.xml is downloaded again
+    PackageServer.Version = "1.1.0"
+    PackageServer.ETag = '"v2"'
+    PackageServer.LastModified = formatdate(3600, usegmt=True)
+    Version = UpdateCheck_Ribbon.ReturnLatestVersion(Url, CacheFile, 0, Timeout)
+    Check(
+        "changed file",
+        Version == "1.1.0" and Requests[-1][1] == 200,
+        f"(version {Version})",
+    )
+
+    # Timeout: the check returns within the timeout and the failed request is cached
+    SlowUrl = Url.replace("/package.xml", "/slow")
+    SlowCache = os.path.join(os.path.dirname(CacheFile), "RibbonUpdateCheck_Slow.json")
+    StartTime = time.perf_counter()
+    Version = UpdateCheck_Ribbon.ReturnLatestVersion(SlowUrl, SlowCache, 3600, Timeout)
+    Duration = time.perf_counter() - StartTime
+    Check("timeout", Version is None and Duration < SlowDelay, f"({Duration:.2f} s)")
+    NoArrivals = PackageServer.Arrivals
+    Version = UpdateCheck_Ribbon.ReturnLatestVersion(SlowUrl, SlowCache, 3600, Timeout)
+    Check(
+        "timeout is cached",
+        Version is None and PackageServer.Arrivals == NoArrivals,
+        f"({PackageServer.Arrivals - NoArrivals} new requests)",
+    )
+
+    Server.shutdown()
+    if len(Failures) > 0:
+        print(f"{len(Failures)} checks failed")
+        sys.exit(1)
+    print("all checks passed")
+    return
+
+
+main()
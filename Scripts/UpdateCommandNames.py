@@ -121,16 +121,15 @@ def UpdateCommands():
                 for Command in Dict_RibbonCommandPanel["workbenches"][WorkBench][
                     "toolbars"
                 ][ToolBar]["commands"]:
-                    # Get the command (key) and its custom name (value) from the commandlist
-                    # And compare them with the command in the Dict_RibbonCommandPanel
-                    for key, value in list(Dict_Commands.items()):
-                        # If the command and key are equal and value is not empty or three dots,
-                        # Get the custom name and change the text in the Dict_RibbonCommandPanel
-                        if Command == key:
-                            if value[2] != "" and value[2] != "...":
-                                Dict_RibbonCommandPanel["workbenches"][WorkBench][
-                                    "toolbars"
-                                ][ToolBar]["commands"][Command]["text"] = value[2]
+                    # Get the custom name (value) of the command from the commandlist
+                    value = Dict_Commands.get(Command)
+                    # If the value is not empty or three dots,
+                    # Get the custom name and change the text in the Dict_RibbonCommandPanel
+                    if value is not None:
+                        if value[2] != "" and value[2] != "...":
+                            Dict_RibbonCommandPanel["workbenches"][WorkBench][
+                                "toolbars"
+                            ][ToolBar]["commands"][Command]["text"] = value[2]
 
 
 def WriteJson():
@@ -22,7 +22,11 @@
 
 # This code is based on the serialize function of the SearBar Addon.
 # Original developer for the SearchBar addon is Suzanne Soy.
-from PySide.QtGui import QIcon, QPixmap
+import zlib
+import struct
+import hashlib
+import binascii
+from PySide.QtGui import QIcon, QIconEngine, QPixmap, QImage
 from PySide.QtCore import (
     Qt,
     QSize,
@@ -30,7 +34,11 @@ from PySide.QtCore import (
     QIODevice,
     QTextStream,
     QByteArray,
+    QRunnable,
+    QThreadPool,
 )
+import Parameters_Ribbon
+import Standard_Functions_RIbbon as StandardFunctions
 
 
 def iconToBase64(
@@ -65,46 +73,380 @@ def iconToBase64(
     return base64_data
 
 
-def serializeIcon(icon):
-    iconPixmaps = {}
+# Mapping between the names used in the serialized data and the Qt enums
+MODES = {
+    "normal": QIcon.Mode.Normal,
+    "disabled": QIcon.Mode.Disabled,
+    "active": QIcon.Mode.Active,
+    "selected": QIcon.Mode.Selected,
+}
+STATES = {"off": QIcon.State.Off, "on": QIcon.State.On}
+
+# Encodings for the pixmap data
+ENCODING_PNG = "PNG"
+ENCODING_ARGB32 = "ARGB32"
+
+# Header of raw pixmap data: magic, width, height. Followed by the zlib compressed premultiplied ARGB32 pixels
+RAW_MAGIC = b"RBZ1"
+RAW_HEADER = struct.Struct("<4sHH")
+
+# The images that Qt's icon engine returns for a missing normal or active image, in the order it tries them.
+# A missing disabled or selected image is generated by the style from another image, so these are always stored.
+ICON_FALLBACKS = {
+    ("normal", "off"): [("active", "off"), ("normal", "on"), ("active", "on")],
+    ("normal", "on"): [("active", "on"), ("normal", "off"), ("active", "off")],
+    ("active", "off"): [("normal", "off"), ("active", "on"), ("normal", "on")],
+    ("active", "on"): [("normal", "on"), ("active", "off"), ("normal", "off")],
+}
+
+# The sizes that a lazy icon reports before it is decoded
+LAZY_ICON_SIZES = [16, 24, 32, 48, 64]
+
+
+def serializeIcon(icon, Compact=False, Pool=None, Encoding=ENCODING_PNG):
+    """
+    Serializes a QIcon to a dict: {width: {height: {mode: {state: data}}}}.
+
+    Args:
+        icon (QIcon): The icon to serialize.
+        Compact (bool, optional): Store only the distinct pixmaps. Defaults to False.
+        Pool (dict, optional): Shared dict for the pixmaps of the compact format,
+            to deduplicate across icons. If None, the pixmaps are stored in the icon itself.
+        Encoding (str, optional): ENCODING_PNG or ENCODING_ARGB32. Defaults to ENCODING_PNG.
+
+    Returns:
+        dict: The serialized icon.
+    """
+    return encodeIcon(rasterizeIcon(icon), Compact, Pool, Encoding)
+
+
+def serializeIcons(
+    Icons: list, Compact=False, Pool=None, Encoding=ENCODING_PNG, ThreadPool=None
+):
+    """
+    Serializes a list of icons. The icons are rasterized on the calling (GUI) thread,
+    the hashing, deduplication and encoding are done on a thread pool.
+
+    Args:
+        Icons (list): list of [Name, QIcon]
+        Compact, Pool, Encoding: see serializeIcon.
+        ThreadPool (QThreadPool, optional): The thread pool to use. Defaults to a private thread pool,
+            so only the tasks for these icons are waited for.
+
+    Returns:
+        list: list of [Name, SerializedIcon], in the same order as Icons.
+            Icons that failed to serialize are left out.
+    """
+    if ThreadPool is None:
+        ThreadPool = QThreadPool()
+
+    Results = [None] * len(Icons)
+    # Keep the tasks until they are done. If the pool deletes a task that is owned by Python, PySide can crash
+    Tasks = []
+    for i in range(len(Icons)):
+        Name, Icon = Icons[i]
+        try:
+            # QIcon and QPixmap can only be used on the GUI thread
+            Images = rasterizeIcon(Icon)
+        except Exception as e:
+            Results[i] = e
+            continue
+        Task = EncodeIconTask(Name, Images, Compact, Pool, Encoding, Results, i)
+        Task.setAutoDelete(False)
+        Tasks.append(Task)
+        ThreadPool.start(Task)
+
+    # Wait for the workers. Events are not processed here, because timers could run code of the dialog again.
+    ThreadPool.waitForDone()
+
+    SerializedIcons = []
+    for i in range(len(Icons)):
+        Result = Results[i]
+        if isinstance(Result, Exception) or Result is None:
+            if Parameters_Ribbon.DEBUG_MODE is True:
+                StandardFunctions.Print(
+                    f"Icon for {Icons[i][0]} could not be serialized: {Result}",
+                    "Warning",
+                )
+            continue
+        SerializedIcons.append(Result)
+    return SerializedIcons
+
+
+class EncodeIconTask(QRunnable):
+    """Hashes, deduplicates and encodes the rasterized images of one icon on a worker thread."""
+
+    def __init__(self, Name, Images, Compact, Pool, Encoding, Results, Index):
+        super().__init__()
+        self.Name = Name
+        self.Images = Images
+        self.Compact = Compact
+        self.Pool = Pool
+        self.Encoding = Encoding
+        self.Results = Results
+        self.Index = Index
+
+    def run(self):
+        # Each task writes only its own item of the result list
+        try:
+            self.Results[self.Index] = [
+                self.Name,
+                encodeIcon(self.Images, self.Compact, self.Pool, self.Encoding),
+            ]
+        except Exception as e:
+            self.Results[self.Index] = e
+        return
+
+
+def rasterizeIcon(icon: QIcon) -> list:
+    """
+    Returns the images of an icon for every size, mode and state, as a list of [width, height, mode, state, QImage].
+    Must run on the GUI thread. Only the pixmaps are converted to images here,
+    the returned images can be hashed and encoded on any thread.
+    """
+    Images = []
     for sz in icon.availableSizes():
         strW = str(sz.width())
         strH = str(sz.height())
-        iconPixmaps[strW] = {}
-        iconPixmaps[strW][strH] = {}
-        for strMode, mode in {
-            "normal": QIcon.Mode.Normal,
-            "disabled": QIcon.Mode.Disabled,
-            "active": QIcon.Mode.Active,
-            "selected": QIcon.Mode.Selected,
-        }.items():
-            iconPixmaps[strW][strH][strMode] = {}
-            for strState, state in {
-                "off": QIcon.State.Off,
-                "on": QIcon.State.On,
-            }.items():
-                iconPixmaps[strW][strH][strMode][strState] = iconToBase64(
-                    icon, sz, mode, state
-                )
+        for strMode, mode in MODES.items():
+            for strState, state in STATES.items():
+                image = icon.pixmap(sz, mode, state).toImage()
+                Images.append([strW, strH, strMode, strState, image])
+    return Images
+
+
+def compactKeys(Hashes: dict) -> list:
+    """
+    Returns the (mode, state) keys of the images to store in the compact format.
+    An image is skipped when Qt's icon engine returns the same pixels from the stored images.
+    Only uses the hashes, so this is safe to run on a worker thread.
+
+    Args:
+        Hashes (dict): (mode, state) -> tuple with the hash of the image per size. An empty hash is a null image.
+
+    Returns:
+        list: the keys to store.
+    """
+    # Add images until every image is returned by the stored ones.
+    # Adding an image can change the fallback of the others, so check again after each image.
+    Stored = []
+    IsComplete = False
+    while IsComplete is False:
+        IsComplete = True
+        for Key, Hash in Hashes.items():
+            if Key in Stored or any(Hash) is False:
+                continue
+            Fallback = None
+            for FallbackKey in ICON_FALLBACKS.get(Key, []):
+                if FallbackKey in Stored:
+                    Fallback = FallbackKey
+                    break
+            if Fallback is None or Hashes[Fallback] != Hash:
+                Stored.append(Key)
+                IsComplete = False
+                break
+    return Stored
+
+
+def encodeIcon(Images: list, Compact=False, Pool=None, Encoding=ENCODING_PNG):
+    """
+    Encodes the images returned by rasterizeIcon. Uses only QImage, so this is safe to run on a worker thread.
+
+    Returns:
+        dict: In the full format: {width: {height: {mode: {state: data}}}}.
+        In the compact format: {"compact": {width: {height: {mode: {state: hash}}}}, "pixmaps": {hash: data}}
+        When a pool is given, the pixmaps are added to the pool instead.
+    """
+    if Compact is False:
+        iconPixmaps = {}
+        for strW, strH, strMode, strState, image in Images:
+            iconPixmaps.setdefault(strW, {}).setdefault(strH, {}).setdefault(
+                strMode, {}
+            )[strState] = imageToBase64(image, Encoding)
+        return iconPixmaps
+
+    InlinePool = Pool is None
+    if InlinePool is True:
+        Pool = {}
+
+    # Qt prefers an image of the same mode and state in another size over a fallback.
+    # So a mode and state is stored for all sizes or for none, and is compared on the hashes of all sizes.
+    ImageHashes = [imageHash(Image[4]) for Image in Images]
+    Hashes = {}
+    for Image, Hash in zip(Images, ImageHashes):
+        Hashes.setdefault((Image[2], Image[3]), []).append(Hash)
+    StoredKeys = compactKeys({Key: tuple(Hash) for Key, Hash in Hashes.items()})
+
+    Sizes = {}
+    for (strW, strH, strMode, strState, image), Hash in zip(Images, ImageHashes):
+        if (strMode, strState) not in StoredKeys or Hash == "":
+            continue
+        Sizes.setdefault(strW, {}).setdefault(strH, {}).setdefault(strMode, {})[
+            strState
+        ] = Hash
+        # Another worker can add the same hash at the same time. Both write identical data, so that is harmless
+        if Hash not in Pool:
+            Pool[Hash] = imageToBase64(image, Encoding)
+
+    iconPixmaps = {"compact": Sizes}
+    if InlinePool is True:
+        iconPixmaps["pixmaps"] = Pool
     return iconPixmaps
 
 
-def deserializeIcon(iconPixmaps):
+def pixmapToBase64(pixmap: QPixmap, Encoding=ENCODING_PNG):
+    return imageToBase64(pixmap.toImage(), Encoding)
+
+
+def imageToBase64(image: QImage, Encoding=ENCODING_PNG):
+    if image.isNull():
+        return ""
+
+    if Encoding == ENCODING_ARGB32:
+        return binascii.b2a_base64(imageToRaw(image), newline=False).decode("utf-8")
+
+    buf = QBuffer()
+    buf.open(QIODevice.OpenModeFlag.WriteOnly)
+    image.save(buf, "PNG")
+    base64_data = buf.data().toBase64().data().decode("utf-8")
+    buf.close()
+    return base64_data
+
+
+def pixmapToRaw(pixmap: QPixmap) -> bytes:
+    return imageToRaw(pixmap.toImage())
+
+
+def imageToRaw(image: QImage) -> bytes:
+    """
+    Encodes an image as zlib compressed premultiplied ARGB32 pixels.
+    This is the native format of Qt's raster pixmaps, so decoding needs no PNG decoder and no pixel conversion.
+
+    Returns:
+        bytes: RAW_HEADER followed by the compressed pixels.
+    """
+    image = image.convertToFormat(QImage.Format.Format_ARGB32_Premultiplied)
+    # ARGB32 rows are always 32-bit aligned, so there is no padding between the rows
+    data = bytes(image.constBits())[: image.sizeInBytes()]
+    header = RAW_HEADER.pack(RAW_MAGIC, image.width(), image.height())
+    return header + zlib.compress(data)
+
+
+def imageFromRaw(data) -> QImage:
+    """Decodes the data created by imageToRaw into a QImage"""
+    Magic, Width, Height = RAW_HEADER.unpack_from(data, 0)
+    pixels = zlib.decompress(data[RAW_HEADER.size :])
+    image = QImage(
+        pixels, Width, Height, Width * 4, QImage.Format.Format_ARGB32_Premultiplied
+    )
+    # The image does not own the buffer. Make a copy before the buffer goes out of scope
+    return image.copy()
+
+
+def pixmapHash(pixmap: QPixmap) -> str:
+    """Returns a hash of the pixel data of a pixmap. Used to find identical pixmaps."""
+    return imageHash(pixmap.toImage())
+
+
+def imageHash(image: QImage) -> str:
+    """Returns a hash of the pixel data of an image. Uses only QImage, so this is safe to run on a worker thread."""
+    if image.isNull():
+        return ""
+    image = image.convertToFormat(QImage.Format.Format_ARGB32)
+    data = bytes(image.constBits())[: image.sizeInBytes()]
+    header = f"{image.width()}x{image.height()}:".encode("utf-8")
+    return hashlib.sha1(header + data).hexdigest()
+
+
+def pixmapFromData(data) -> QPixmap:
+    """Returns a pixmap from base64 encoded (str) or raw (bytes) image data.
+    Both PNG and the raw ARGB32 encoding are supported."""
+    if isinstance(data, str):
+        data = binascii.a2b_base64(data)
+    if data[: len(RAW_MAGIC)] == RAW_MAGIC:
+        return QPixmap.fromImage(imageFromRaw(data))
+
+    pxm = QPixmap()
+    pxm.loadFromData(QByteArray(data))
+    return pxm
+
+
+def deserializeIcon(iconPixmaps, Pool=None):
+    """
+    Rebuilds a QIcon from a serialized icon.
+
+    Args:
+        iconPixmaps (dict): The serialized icon. Both the full and the compact format are supported.
+        Pool (optional): The shared pixmaps for the compact format. Anything with a get(hash) method.
+
+    Returns:
+        QIcon: The icon.
+    """
     ico = QIcon()
+    if "compact" in iconPixmaps:
+        if "pixmaps" in iconPixmaps:
+            Pool = iconPixmaps["pixmaps"]
+        # Without shared pixmaps, the icon cannot be rebuilt
+        if Pool is None:
+            return ico
+        # Only the stored pixmaps are added. The other modes and states are derived by Qt when needed.
+        for strW, wPixmaps in iconPixmaps["compact"].items():
+            for strH, hPixmaps in wPixmaps.items():
+                for strMode, modePixmaps in hPixmaps.items():
+                    for strState, Hash in modePixmaps.items():
+                        data = Pool.get(Hash)
+                        if data is not None:
+                            ico.addPixmap(
+                                pixmapFromData(data), MODES[strMode], STATES[strState]
+                            )
+        return ico
+
     for strW, wPixmaps in iconPixmaps.items():
         for strH, hPixmaps in wPixmaps.items():
             for strMode, modePixmaps in hPixmaps.items():
-                mode = {
-                    "normal": QIcon.Mode.Normal,
-                    "disabled": QIcon.Mode.Disabled,
-                    "active": QIcon.Mode.Active,
-                    "selected": QIcon.Mode.Selected,
-                }[strMode]
+                mode = MODES[strMode]
                 for strState, statePixmap in modePixmaps.items():
-                    state = {"off": QIcon.State.Off, "on": QIcon.State.On}[strState]
-                    pxm = QPixmap()
-                    pxm.loadFromData(
-                        QByteArray.fromBase64(bytearray(statePixmap.encode("utf-8")))
-                    )
-                    ico.addPixmap(pxm, mode, state)
+                    state = STATES[strState]
+                    ico.addPixmap(pixmapFromData(statePixmap), mode, state)
     return ico
+
+
+class LazyIconEngine(QIconEngine):
+    """
+    Icon engine that gets the real icon only when the icon is painted.
+    Used for icons in list and table widgets, so that only icons of visible rows are decoded.
+    The sizes are answered without decoding, because views ask them for every row.
+    """
+
+    def __init__(self, Loader):
+        super().__init__()
+        # Loader is a function that returns the decoded QIcon or None.
+        # The decoded icon is not kept here. The loader gets it from the small LRU cache of the catalog,
+        # so only the most recently painted icons stay decoded.
+        self.Loader = Loader
+
+    def Icon(self) -> QIcon:
+        Icon = self.Loader()
+        if Icon is None:
+            Icon = QIcon()
+        return Icon
+
+    def paint(self, painter, rect, mode, state):
+        self.Icon().paint(painter, rect, Qt.AlignmentFlag.AlignCenter, mode, state)
+
+    def pixmap(self, size, mode, state):
+        return self.Icon().pixmap(size, mode, state)
+
+    def actualSize(self, size, mode, state):
+        return size
+
+    def availableSizes(self, mode=QIcon.Mode.Normal, state=QIcon.State.Off):
+        return [QSize(Size, Size) for Size in LAZY_ICON_SIZES]
+
+    def clone(self):
+        return LazyIconEngine(self.Loader)
+
+
+def ReturnLazyIcon(Loader) -> QIcon:
+    """Returns a QIcon that calls Loader to get the real icon when it is painted."""
+    return QIcon(LazyIconEngine(Loader))
@@ -458,6 +458,87 @@ def RemoveWorkBenchToolbars(Name: str, WorkBenchName: str = "Global") -> None:
     return
 
 
+def ReturnProcessMemory() -> int:
+    """
+    Returns the resident memory of FreeCAD in bytes.
+    Only available on Linux. Returns -1 when it is unknown.
+    """
+    import os
+
+    try:
+        with open("/proc/self/statm", "r") as file:
+            Pages = int(file.read().split()[1])
+        file.close()
+        return Pages * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        return -1
+
+
+def WriteFileAtomic(FileName: str, Text: str):
+    """
+    Writes a text file atomically: the text is written to a temporary file,
+    flushed to disk and then renamed to the file name.
+    A crash during writing leaves the original file intact.
+
+    Args:
+        FileName (str): The file to write.
+        Text (str): The text to write.
+    """
+    import os
+
+    TempFile = FileName + ".tmp"
+    with open(TempFile, "w", encoding="utf-8") as outfile:
+        outfile.write(Text)
+        outfile.flush()
+        os.fsync(outfile.fileno())
+    os.replace(TempFile, FileName)
+
+    # Make the rename itself durable. Not possible on Windows
+    try:
+        DirectoryHandle = os.open(
+            os.path.dirname(os.path.abspath(FileName)), os.O_RDONLY
+        )
+        try:
+            os.fsync(DirectoryHandle)
+        finally:
+            os.close(DirectoryHandle)
+    except Exception:
+        pass
+    return
+
+
+def WriteJsonFile(Data: dict, FileName: str, StoredData: dict = None, indent=4) -> bool:
+    """
+    Writes a dict to a json file, but only when it differs from the data in the file.
+    The file is written atomically.
+
+    Args:
+        Data (dict): The data to write.
+        FileName (str): The json file.
+        StoredData (dict, optional): The data as it is currently in the file.
+            If None, the file is read to compare. Defaults to None.
+        indent (int, optional): The indent of the json file. Defaults to 4.
+
+    Returns:
+        bool: True if the file is written.
+    """
+    import json
+
+    if StoredData is None:
+        try:
+            with open(FileName, "r", encoding="utf-8") as file:
+                StoredData = json.load(file)
+            file.close()
+        except Exception:
+            StoredData = None
+
+    if StoredData is not None and StoredData == Data:
+        return False
+
+    WriteFileAtomic(FileName, json.dumps(Data, indent=indent))
+    return True
+
+
 def ReturnXML_Value(
     path: str, ElementName: str, attribKey: str = "", attribValue: str = ""
 ):
@@ -485,6 +566,42 @@ def ReturnXML_Value(
     return result
 
 
+def ReturnWorkbenchVersions():
+    """
+    Returns the versions of the workbenches, read from the package.xml files in the Mod folders.
+
+    Returns:
+        dict: {WorkBenchName: version}. Workbenches without a package.xml are not included.
+    """
+    import os
+
+    # Get the folders of all modules
+    ModDirs = list(getattr(App, "__ModDirs__", []))
+    for ModFolder in [
+        os.path.join(App.getHomePath(), "Mod"),
+        os.path.join(App.getUserAppDataDir(), "Mod"),
+    ]:
+        if os.path.isdir(ModFolder) is True:
+            for Folder in os.listdir(ModFolder):
+                ModDirs.append(os.path.join(ModFolder, Folder))
+
+    Versions = {}
+    for ModDir in ModDirs:
+        PackageXML = os.path.join(ModDir, "package.xml")
+        if os.path.exists(PackageXML) is False:
+            continue
+        try:
+            Metadata = App.Metadata(PackageXML)
+            for Workbench in Metadata.Content.get("workbench", []):
+                Version = Workbench.Version
+                if Version == "":
+                    Version = Metadata.Version
+                Versions[Workbench.Classname] = Version
+        except Exception:
+            continue
+    return Versions
+
+
 def ReturnXML_Value_Git(
     User="APEbbers",
     Repository="FreeCAD-Ribbon",
@@ -718,7 +835,199 @@ def add_keys_nested_dict(dict, keys, default=1):
     return result
 
 
-def CommandInfoCorrections(CommandName):
+# region - Command info cache -------------------------------------------------------------------------------
+#
+# CommandInfoCorrections is called for every command in a lot of loops. The result is stored per command name.
+# The cache is cleared when a workbench is activated (new commands can be added) or when the language changes.
+CommandInfoCache = {}
+CommandInfoStats = {"hits": 0, "misses": 0}
+CommandInfoObserver = None
+
+
+class CommandInfoCacheObserver:
+    """Clears the command info cache when the language is changed in the preferences"""
+
+    def onChange(self, ParameterGroup, ParameterName):
+        if ParameterName == "Language":
+            ClearCommandInfoCache()
+            ResetMenuTextIndex()
+        return
+
+
+def ConnectCommandInfoCache():
+    """Connects the signals that invalidate the cache. Only done once."""
+    global CommandInfoObserver
+
+    if CommandInfoObserver is not None:
+        return
+    CommandInfoObserver = CommandInfoCacheObserver()
+    try:
+        App.ParamGet("User parameter:BaseApp/Preferences/General").Attach(
+            CommandInfoObserver
+        )
+    except Exception:
+        pass
+    try:
+        if mw is not None:
+            mw.workbenchActivated.connect(OnWorkbenchActivated)
+    except Exception:
+        pass
+    return
+
+
+def ClearCommandInfoCache():
+    CommandInfoCache.clear()
+    return
+
+
+def OnWorkbenchActivated():
+    # A workbench can add new commands and create the actions of its commands
+    ClearCommandInfoCache()
+    MenuTextIndexState["Dirty"] = True
+    return
+
+
+def ReturnCommandInfoStats() -> dict:
+    """Returns the hits, misses and size of the command info cache"""
+    return {
+        "hits": CommandInfoStats["hits"],
+        "misses": CommandInfoStats["misses"],
+        "size": len(CommandInfoCache),
+    }
+
+
+def CommandInfoCorrections(CommandName, UseCache: bool = True):
+    """_summary_
+    Returns the command info with corrections for some commands and an extra key "ActionText".
+
+    Args:
+        CommandName (str): Name of the command
+        UseCache (bool, optional): Use the cached info. Defaults to True.
+
+    Returns:
+        dict: the command info. All values are empty when the command does not exist.
+    """
+    if UseCache is False:
+        return LoadCommandInfo(CommandName)
+
+    CommandInfo = CommandInfoCache.get(CommandName)
+    if CommandInfo is None:
+        ConnectCommandInfoCache()
+        CommandInfoStats["misses"] += 1
+        CommandInfo = LoadCommandInfo(CommandName)
+        CommandInfoCache[CommandName] = CommandInfo
+    else:
+        CommandInfoStats["hits"] += 1
+    # Return a copy, so the cached info cannot be modified by the caller
+    return dict(CommandInfo)
+
+
+# endregion
+
+
+# region - Menu text index ----------------------------------------------------------------------------------
+#
+# Reverse index of the menu texts (untranslated and translated) to the command names of the loaded commands.
+# It is built once per language. When a workbench is activated, only the new commands and the commands
+# without an action are added.
+MenuTextIndex = {}
+# The commands that are indexed with the text of their action. These are not indexed again.
+MenuTextIndexComplete = set()
+MenuTextIndexState = {"Dirty": True}
+
+
+def ResetMenuTextIndex():
+    MenuTextIndex.clear()
+    MenuTextIndexComplete.clear()
+    MenuTextIndexState["Dirty"] = True
+    return
+
+
+def UpdateMenuTextIndex():
+    """Adds the new commands to the menu text index"""
+    if MenuTextIndexState["Dirty"] is False:
+        return
+    ConnectCommandInfoCache()
+
+    for CommandName in Gui.listCommands():
+        if CommandName in MenuTextIndexComplete:
+            continue
+        try:
+            Command = Gui.Command.get(CommandName)
+            if Command is None:
+                continue
+            CommandInfo = CommandInfoCorrections(CommandName)
+            for Text in [CommandInfo["menuText"], CommandInfo["ActionText"]]:
+                for MenuText in [Text, Text.replace("&", "")]:
+                    if MenuText == "":
+                        continue
+                    CommandNames = MenuTextIndex.setdefault(MenuText, [])
+                    if CommandName not in CommandNames:
+                        CommandNames.append(CommandName)
+            # Without an action, the translated text can still change when the workbench is loaded
+            if len(Command.getAction()) > 0:
+                MenuTextIndexComplete.add(CommandName)
+        except Exception:
+            continue
+
+    MenuTextIndexState["Dirty"] = False
+    return
+
+
+def ReturnCommandsByMenuText(MenuText: str) -> list:
+    """_summary_
+    Returns the names of the loaded commands with this menu text.
+
+    Args:
+        MenuText (str): The menu text. Translated or untranslated, with or without "&".
+
+    Returns:
+        list: the command names.
+    """
+    UpdateMenuTextIndex()
+    return list(MenuTextIndex.get(MenuText, []))
+
+
+class CommandListIndex:
+    """Menu text index for a list of command items.
+    Items are [CommandName, IconName, MenuText, WorkBenchName, MenuTextTranslated].
+    Appended items are added to the index. When the list becomes shorter, it is indexed again.
+    """
+
+    def __init__(self, List_Commands: list):
+        self.List_Commands = List_Commands
+        self.Index = {}
+        self.Count = 0
+
+    def Reset(self, List_Commands: list = None):
+        if List_Commands is not None:
+            self.List_Commands = List_Commands
+        self.Index.clear()
+        self.Count = 0
+        return
+
+    def Update(self):
+        if len(self.List_Commands) < self.Count:
+            self.Reset()
+        for CommandItem in self.List_Commands[self.Count :]:
+            MenuTexts = [CommandItem[2]]
+            if len(CommandItem) > 4 and CommandItem[4] != CommandItem[2]:
+                MenuTexts.append(CommandItem[4])
+            for MenuText in MenuTexts:
+                self.Index.setdefault(MenuText, []).append(CommandItem)
+        self.Count = len(self.List_Commands)
+        return
+
+    def ReturnItems(self, MenuText: str) -> list:
+        """Returns the command items with this menu text, in the order of the list"""
+        self.Update()
+        return self.Index.get(MenuText, [])
+
+
+# endregion
+
+
+def LoadCommandInfo(CommandName):
     try:
         Command = Gui.Command.get(CommandName)
         if Command is not None:
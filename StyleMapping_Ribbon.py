@@ -126,6 +126,15 @@ darkMode = DarkMode()
 
 
 def ReturnStyleItem(ControlName, ShowCustomIcon=False, IgnoreOverlay=False):
+    """
+    Returns the style item from the resolved theme. See ResolveStyleItem for the control names.
+    """
+    return ReturnTheme().Item(ControlName, ShowCustomIcon, IgnoreOverlay)
+
+
+def ResolveStyleItem(
+    ControlName, ShowCustomIcon=False, IgnoreOverlay=False, currentStyleSheet=None
+):
     """
     Enter one of the names below:
 
@@ -150,8 +159,11 @@ def ReturnStyleItem(ControlName, ShowCustomIcon=False, IgnoreOverlay=False):
     result = "none"
 
     # Get the current stylesheet for FreeCAD
-    FreeCAD_preferences = App.ParamGet("User parameter:BaseApp/Preferences/MainWindow")
-    currentStyleSheet = FreeCAD_preferences.GetString("StyleSheet")
+    if currentStyleSheet is None:
+        FreeCAD_preferences = App.ParamGet(
+            "User parameter:BaseApp/Preferences/MainWindow"
+        )
+        currentStyleSheet = FreeCAD_preferences.GetString("StyleSheet")
     IsInList = False
     for key, value in StyleMapping_default["Stylesheets"].items():
         if key == currentStyleSheet:
@@ -231,6 +243,31 @@ def ReturnStyleSheet(
     padding_bottom="0px",
     width="16px",
     HoverColor="",
+):
+    """
+    Returns the stylesheet from the resolved theme. See CreateStyleSheet for the controls.
+    """
+    return ReturnTheme().StyleSheet(
+        control,
+        radius,
+        padding_left,
+        padding_top,
+        padding_right,
+        padding_bottom,
+        width,
+        HoverColor,
+    )
+
+
+def CreateStyleSheet(
+    control,
+    radius="2px",
+    padding_left="0px",
+    padding_top="0px",
+    padding_right="0px",
+    padding_bottom="0px",
+    width="16px",
+    HoverColor="",
 ):
     """
     Enter one of the names below:
@@ -658,3 +695,243 @@ StyleMapping_default = {
         },
     }
 }
+
+
+# region - Resolved theme -----------------------------------------------------------------------------------
+#
+# The style items are resolved once per theme and stored in a snapshot. A parameter observer replaces the
+# snapshot when the FreeCAD stylesheet or one of the color or icon settings of the ribbon changes.
+# Every new snapshot gets a higher version, so callers can skip setStyleSheet when the theme is unchanged.
+
+# The parameters in "BaseApp/Preferences/MainWindow" and in the ribbon preferences that change the theme
+THEME_PARAMETERS_FREECAD = ["StyleSheet"]
+THEME_PARAMETERS_RIBBON = [
+    "UseFCOverlay",
+    "UseButtonBackGround",
+    "CustomIcons",
+    "CustomColors",
+    "BorderTransparant",
+    "Color_Borders",
+    "Color_Background_Hover",
+    "Color_Background_App",
+    "ScrollLeftButton_Tab",
+    "ScrollRightButton_Tab",
+    "ScrollLeftButton_Category",
+    "ScrollRightButton_Category",
+    "OptionButton",
+    "PinButton_open",
+    "PinButton_closed",
+]
+
+ThemeState = {"Snapshot": None, "Version": 0, "Observer": None}
+
+
+class ThemeSnapshot:
+    """The resolved theme. Do not modify it; it is replaced when the theme changes."""
+
+    __slots__ = (
+        "Version",
+        "StyleSheetName",
+        "_Items",
+        "_StyleSheets",
+        "_RibbonStyleSheet",
+    )
+
+    def __init__(self, Version: int, StyleSheetName: str):
+        self.Version = Version
+        self.StyleSheetName = StyleSheetName
+        self._Items = {}
+        self._StyleSheets = {}
+        self._RibbonStyleSheet = None
+
+    def Item(self, ControlName, ShowCustomIcon=False, IgnoreOverlay=False):
+        Key = (ControlName, ShowCustomIcon, IgnoreOverlay)
+        if Key not in self._Items:
+            self._Items[Key] = ResolveStyleItem(
+                ControlName, ShowCustomIcon, IgnoreOverlay, self.StyleSheetName
+            )
+        return self._Items[Key]
+
+    def StyleSheet(self, *args):
+        if args not in self._StyleSheets:
+            self._StyleSheets[args] = CreateStyleSheet(*args)
+        return self._StyleSheets[args]
+
+    def RibbonStyleSheet(self):
+        if self._RibbonStyleSheet is None:
+            self._RibbonStyleSheet = CreateRibbonStyleSheet()
+        return self._RibbonStyleSheet
+
+
+class ThemeObserver:
+    """Replaces the resolved theme when a parameter of the theme changes"""
+
+    def onChange(self, ParameterGroup, ParameterName):
+        if (
+            ParameterName in THEME_PARAMETERS_FREECAD
+            or ParameterName in THEME_PARAMETERS_RIBBON
+        ):
+            InvalidateTheme()
+        return
+
+
+def ConnectThemeObserver():
+    """Attaches the observer to the parameter groups. Only done once."""
+    if ThemeState["Observer"] is not None:
+        return
+    ThemeState["Observer"] = ThemeObserver()
+    try:
+        App.ParamGet("User parameter:BaseApp/Preferences/MainWindow").Attach(
+            ThemeState["Observer"]
+        )
+        Parameters_Ribbon.preferences.Attach(ThemeState["Observer"])
+    except Exception:
+        pass
+    return
+
+
+def ReturnTheme() -> ThemeSnapshot:
+    """Returns the resolved theme. A new one is created after the theme has changed."""
+    Snapshot = ThemeState["Snapshot"]
+    if Snapshot is None:
+        ConnectThemeObserver()
+        FreeCAD_preferences = App.ParamGet(
+            "User parameter:BaseApp/Preferences/MainWindow"
+        )
+        ThemeState["Version"] += 1
+        Snapshot = ThemeSnapshot(
+            ThemeState["Version"], FreeCAD_preferences.GetString("StyleSheet")
+        )
+        ThemeState["Snapshot"] = Snapshot
+    return Snapshot
+
+
+def ReturnThemeVersion() -> int:
+    """Returns the version of the resolved theme. It changes every time the theme changes."""
+    return ReturnTheme().Version
+
+
+def InvalidateTheme():
+    ThemeState["Snapshot"] = None
+    return
+
+
+# endregion
+
+
+# region - Ribbon button roles ------------------------------------------------------------------------------
+#
+# The custom buttons consist of an outer button with a command button, a label and an arrow button.
+# Instead of a stylesheet per widget, one stylesheet is set on the ribbon. It styles the widgets with
+# dynamic properties:
+#   ribbonRole:   "button", "command", "label" or "arrow"
+#   ribbonLayout: "large" (command above the label) or "small" (command left of the label)
+#   ribbonPart:   "first" or "second" for the two parts that are highlighted together,
+#                 "single" for a part that is highlighted alone
+#   ribbonHover:  "true" when the parts are highlighted
+# Changing a property only needs a polish of the widget; the stylesheet is not parsed again.
+
+
+def ReturnRibbonStyleSheet() -> str:
+    """Returns the stylesheet for the ribbon buttons of the resolved theme"""
+    return ReturnTheme().RibbonStyleSheet()
+
+
+def CreateRibbonStyleSheet() -> str:
+    BackgroundColor = ReturnStyleItem("Background_Color")
+    HoverColor = ReturnStyleItem("Background_Color_Hover")
+    FontColor = ReturnStyleItem("FontColor")
+    BorderColor = ReturnStyleItem("Border_Color")
+    if Parameters_Ribbon.CUSTOM_COLORS_ENABLED:
+        BorderColor = Parameters_Ribbon.COLOR_BORDERS
+    if Parameters_Ribbon.BORDER_TRANSPARANT:
+        BorderColor = HoverColor
+    if BackgroundColor is None or HoverColor is None or FontColor is None:
+        return ""
+
+    Parts = """*[ribbonRole="command"], *[ribbonRole="label"], *[ribbonRole="arrow"]"""
+    StyleSheet = (
+        """*[ribbonRole="button"], *[ribbonRole="button"]:hover {background-color: """
+        + BackgroundColor
+        + """;border: none;}"""
+        + Parts
+        + """ {margin: 0px;padding: 0px;spacing: 0px;color: """
+        + FontColor
+        + """;background-color: """
+        + BackgroundColor
+        + """;border: 0.5px solid """
+        + BackgroundColor
+        + """;border-radius: 2px;}"""
+        + """QToolButton[ribbonRole="command"]:hover {background-color: """
+        + HoverColor
+        + """;border: 0.5px solid """
+        + BorderColor
+        + """;}"""
+        + """QToolButton[ribbonRole="command"]::menu-arrow {
+            subcontrol-origin: padding;
+            subcontrol-position: center right;
+        }"""
+        + """QToolButton[ribbonRole="arrow"][ribbonLayout="large"]::menu-indicator {
+            subcontrol-origin: padding;
+            subcontrol-position: center top;
+        }"""
+        # The sides where two parts meet have no border
+        + """*[ribbonLayout="large"][ribbonPart="first"] {border-bottom: 0px;}"""
+        + """*[ribbonLayout="large"][ribbonPart="second"] {border-top: 0px;}"""
+        + """*[ribbonLayout="small"][ribbonPart="first"] {border-right: 0px;}"""
+        + """*[ribbonLayout="small"][ribbonPart="second"] {border-left: 0px;}"""
+        # The highlighted parts
+        + """*[ribbonHover="true"] {background-color: """
+        + HoverColor
+        + """;border: 0.5px solid """
+        + BorderColor
+        + """;}"""
+        + """*[ribbonHover="true"][ribbonLayout="large"][ribbonPart="first"] {
+            border-bottom: 0px;
+            border-top-left-radius: 2px;border-top-right-radius: 2px;
+            border-bottom-left-radius: 0px;border-bottom-right-radius: 0px;
+        }"""
+        + """*[ribbonHover="true"][ribbonLayout="large"][ribbonPart="second"] {
+            border-top: 0px;
+            border-top-left-radius: 0px;border-top-right-radius: 0px;
+            border-bottom-left-radius: 2px;border-bottom-right-radius: 2px;
+        }"""
+        + """*[ribbonHover="true"][ribbonLayout="small"][ribbonPart="first"] {
+            border-right: 0px;
+            border-top-left-radius: 2px;border-bottom-left-radius: 2px;
+            border-top-right-radius: 0px;border-bottom-right-radius: 0px;
+        }"""
+        + """*[ribbonHover="true"][ribbonLayout="small"][ribbonPart="second"] {
+            border-left: 0px;
+            border-top-left-radius: 0px;border-bottom-left-radius: 0px;
+            border-top-right-radius: 2px;border-bottom-right-radius: 2px;
+        }"""
+    )
+    return StyleSheet
+
+
+def SetRibbonRole(Widget, Role: str, Layout: str = "", Part: str = ""):
+    """Sets the properties that are used by the ribbon stylesheet"""
+    Widget.setProperty("ribbonRole", Role)
+    if Layout != "":
+        Widget.setProperty("ribbonLayout", Layout)
+    if Part != "":
+        Widget.setProperty("ribbonPart", Part)
+    return
+
+
+def SetRibbonHover(Widgets: list, Hover: bool):
+    """Highlights the widgets or removes the highlight. Only the changed widgets are polished again."""
+    Value = "false"
+    if Hover is True:
+        Value = "true"
+    for Widget in Widgets:
+        if Widget.property("ribbonHover") == Value:
+            continue
+        Widget.setProperty("ribbonHover", Value)
+        Widget.style().unpolish(Widget)
+        Widget.style().polish(Widget)
+    return
+
+
+# endregion
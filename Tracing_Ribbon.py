@@ -0,0 +1,214 @@
+# *************************************************************************
+# *                                                                       *
+# * Copyright (c) 2019-2024 Hakan Seven, Geolta, Paul Ebbers              *
+# *                                                                       *
+# * This program is free software; you can redistribute it and/or modify  *
+# * it under the terms of the GNU Lesser General Public License (LGPL)    *
+# * as published by the Free Software Foundation; either version 3 of     *
+# * the License, or (at your option) any later version.                   *
+# * for detail see the LICENCE text file.                                 *
+# *                                                                       *
+# * This program is distributed in the hope that it will be useful,       *
+# * but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# * GNU Library General Public License for more details.                  *
+# *                                                                       *
+# * You should have received a copy of the GNU Library General Public     *
+# * License along with this program; if not, write to the Free Software   *
+# * Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# * USA                                                                   *
+# *                                                                       *
+# *************************************************************************
+
+# Timing spans for the startup of the ribbon.
+#
+# Spans are only collected when "DebugMode" or "TraceStartup" is enabled in the preferences.
+# They can be exported as Chrome trace-event json (open it in chrome://tracing or https://ui.perfetto.dev)
+# and printed as a summary table in the report view.
+# The startup trace is exported when the ribbon is shown. After that, the trace of each tab that is build
+# is exported to a separate file. The events are cleared after each export.
+#
+# Usage:
+#   with Tracing_Ribbon.Span("Read json"):
+#       ...
+#
+#   span = Tracing_Ribbon.Begin("Build panel", Panel=Name)
+#   ...
+#   Tracing_Ribbon.End(span)
+#
+#   @Tracing_Ribbon.Traced("CreateMenus")
+#   def CreateMenus(self): ...
+
+import os
+import json
+import time
+import threading
+import functools
+
+TRACE_FILE = os.path.join(os.path.dirname(__file__), "RibbonStartupTrace.json")
+TRACE_FILE_PANELS = os.path.join(os.path.dirname(__file__), "RibbonPanelsTrace.json")
+
+# The maximum number of events that are kept until the next export. Later events are dropped.
+MAX_EVENTS = 20000
+
+# The collected trace events
+_Events = []
+# None until the preferences are read
+_Enabled = None
+
+
+def IsEnabled() -> bool:
+    global _Enabled
+
+    if _Enabled is None:
+        try:
+            import Parameters_Ribbon
+
+            _Enabled = (
+                Parameters_Ribbon.DEBUG_MODE is True
+                or Parameters_Ribbon.TRACE_STARTUP is True
+            )
+        except Exception:
+            _Enabled = False
+    return _Enabled
+
+
+class Span:
+    """A timing span. Use it as context manager, or call Begin() and End()."""
+
+    def __init__(self, Name: str, Category: str = "startup", **Args):
+        self.Name = Name
+        self.Category = Category
+        self.Args = Args
+        self.Start = None
+
+    def Begin(self):
+        if IsEnabled() is True:
+            self.Start = time.perf_counter()
+        return self
+
+    def End(self):
+        if self.Start is None:
+            return
+        Stop = time.perf_counter()
+        Event = {
+            "name": self.Name,
+            "cat": self.Category,
+            "ph": "X",
+            "ts": self.Start * 1e6,
+            "dur": (Stop - self.Start) * 1e6,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+        }
+        if len(self.Args) > 0:
+            Event["args"] = {key: str(value) for key, value in self.Args.items()}
+        if len(_Events) < MAX_EVENTS:
+            _Events.append(Event)
+        self.Start = None
+        return
+
+    def __enter__(self):
+        return self.Begin()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.End()
+        return False
+
+
+def Begin(Name: str, Category: str = "startup", **Args) -> Span:
+    """Starts a span and returns it. Stop it with End(span)."""
+    return Span(Name, Category, **Args).Begin()
+
+
+def End(span: Span):
+    """Stops a span started with Begin. None is ignored."""
+    if span is not None:
+        span.End()
+    return
+
+
+def Traced(Name: str = "", Category: str = "startup"):
+    """Decorator that records a span for each call of the function."""
+
+    def Decorator(Function):
+        SpanName = Name
+        if SpanName == "":
+            SpanName = Function.__qualname__
+
+        @functools.wraps(Function)
+        def Wrapper(*args, **kwargs):
+            if IsEnabled() is False:
+                return Function(*args, **kwargs)
+            with Span(SpanName, Category):
+                return Function(*args, **kwargs)
+
+        return Wrapper
+
+    return Decorator
+
+
+def ReturnEvents() -> list:
+    return list(_Events)
+
+
+def Clear():
+    _Events.clear()
+    return
+
+
+def WriteTrace(FileName: str = TRACE_FILE):
+    """Writes the spans as Chrome trace-event json"""
+    Data = {"traceEvents": ReturnEvents(), "displayTimeUnit": "ms"}
+    with open(FileName, "w") as outfile:
+        json.dump(Data, outfile, indent=1)
+    outfile.close()
+    return
+
+
+def ReturnSummary() -> list:
+    """Returns a list of [Name, Count, Total (ms), Max (ms)], sorted by the total time"""
+    Summary = {}
+    for Event in ReturnEvents():
+        Item = Summary.setdefault(Event["name"], [Event["name"], 0, 0.0, 0.0])
+        Duration = Event["dur"] / 1000
+        Item[1] = Item[1] + 1
+        Item[2] = Item[2] + Duration
+        if Duration > Item[3]:
+            Item[3] = Duration
+    return sorted(Summary.values(), key=lambda item: item[2], reverse=True)
+
+
+def PrintSummary(MaxRows: int = 40, Title: str = "startup trace"):
+    """Prints the summary as a table in the report view"""
+    import Standard_Functions_RIbbon as StandardFunctions
+
+    Lines = [
+        f"Ribbon UI: {Title}",
+        f"{'span':<60}{'count':>8}{'total (ms)':>14}{'max (ms)':>12}",
+    ]
+    for Name, Count, Total, Max in ReturnSummary()[:MaxRows]:
+        Lines.append(f"{Name[:59]:<60}{Count:>8}{Total:>14.1f}{Max:>12.1f}")
+    CacheStats = StandardFunctions.ReturnCommandInfoStats()
+    Lines.append(
+        f"command info cache: {CacheStats['hits']} hits, "
+        f"{CacheStats['misses']} misses, {CacheStats['size']} entries"
+    )
+    StandardFunctions.Print("\n".join(Lines))
+    return
+
+
+def Export(FileName: str = TRACE_FILE, Title: str = "startup trace"):
+    """Writes the trace file, prints the summary and clears the events. Does nothing when tracing is disabled."""
+    if IsEnabled() is False or len(_Events) == 0:
+        return
+    try:
+        WriteTrace(FileName)
+        PrintSummary(Title=Title)
+        import Standard_Functions_RIbbon as StandardFunctions
+
+        StandardFunctions.Print(f"Ribbon UI: {Title} written to {FileName}")
+    except Exception as e:
+        print(f"Ribbon UI: failed to write the {Title}: {e}")
+    # Start again with the next spans, so the events do not grow for as long as FreeCAD runs
+    Clear()
+    return
@@ -0,0 +1,172 @@
+# *************************************************************************
+# *                                                                       *
+# * Copyright (c) 2019-2024 Hakan Seven, Geolta, Paul Ebbers              *
+# *                                                                       *
+# * This program is free software; you can redistribute it and/or modify  *
+# * it under the terms of the GNU Lesser General Public License (LGPL)    *
+# * as published by the Free Software Foundation; either version 3 of     *
+# * the License, or (at your option) any later version.                   *
+# * for detail see the LICENCE text file.                                 *
+# *                                                                       *
+# * This program is distributed in the hope that it will be useful,       *
+# * but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# * GNU Library General Public License for more details.                  *
+# *                                                                       *
+# * You should have received a copy of the GNU Library General Public     *
+# * License along with this program; if not, write to the Free Software   *
+# * Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# * USA                                                                   *
+# *                                                                       *
+# *************************************************************************
+
+# Check for a new version of the ribbon without blocking FreeCAD.
+#
+# The latest version is read from the package.xml in the repository on a background thread.
+# The result is cached on disk. Within the TTL of the cache no request is made at all.
+# After the TTL a conditional request (ETag / If-Modified-Since) is made, so an unchanged file is not downloaded again.
+# Failed requests are cached as well, so a machine without internet access does not retry on every startup.
+
+import os
+import json
+import time
+import threading
+import xml.etree.ElementTree as ET
+
+from PySide.QtCore import QObject, Signal
+
+UPDATE_CACHE_FILE = os.path.join(os.path.dirname(__file__), "RibbonUpdateCheck.json")
+
+# The url of the package.xml with the latest version
+USER = "APEbbers"
+REPOSITORY = "FreeCAD-Ribbon"
+BRANCH = "main"
+FILE = "package.xml"
+
+# Timeouts in seconds for connecting and for reading the response
+CONNECT_TIMEOUT = 3
+READ_TIMEOUT = 5
+
+# Time in seconds before the cached result is checked again
+CACHE_TTL = 24 * 60 * 60
+
+
+def ReturnUrl(User=USER, Repository=REPOSITORY, Branch=BRANCH, File=FILE):
+    return f"https://raw.githubusercontent.com/{User}/{Repository}/{Branch}/{File}"
+
+
+def ReadCache(CacheFile: str = UPDATE_CACHE_FILE) -> dict:
+    Cache = {}
+    try:
+        with open(CacheFile, "r") as file:
+            Cache.update(json.load(file))
+        file.close()
+    except Exception:
+        pass
+    return Cache
+
+
+def WriteCache(Cache: dict, CacheFile: str = UPDATE_CACHE_FILE):
+    try:
+        TempFile = CacheFile + ".tmp"
+        with open(TempFile, "w") as outfile:
+            json.dump(Cache, outfile, indent=4)
+        outfile.close()
+        os.replace(TempFile, CacheFile)
+    except Exception:
+        pass
+    return
+
+
+def ReturnVersionFromXML(data, ElementName: str = "version"):
+    """Returns the value of an element from the package.xml data or None"""
+    root = ET.fromstring(data)
+    for child in root:
+        if str(child.tag).split("}")[-1] == ElementName:
+            return child.text
+    return None
+
+
+def ReturnLatestVersion(
+    Url: str = ReturnUrl(),
+    CacheFile: str = UPDATE_CACHE_FILE,
+    TTL: float = CACHE_TTL,
+    Timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+):
+    """
+    Returns the latest version from the repository, using the cache when possible.
+    This function blocks, so call it from a background thread.
+
+    Args:
+        Url (str, optional): The url of the package.xml. Defaults to the ribbon repository.
+        CacheFile (str, optional): The cache file. Defaults to UPDATE_CACHE_FILE.
+        TTL (float, optional): Time in seconds that the cached result is used without a request. Defaults to CACHE_TTL.
+        Timeout (tuple, optional): The connect and read timeout in seconds.
+
+    Returns:
+        str: The latest version or None if it is unknown.
+    """
+    import requests_local as requests
+
+    Cache = ReadCache(CacheFile)
+    if Cache.get("Url") != Url:
+        Cache = {"Url": Url}
+
+    # Use the cached result within the TTL
+    Now = time.time()
+    if Now - Cache.get("CheckedAt", 0) < TTL:
+        return Cache.get("Version")
+
+    # Ask only for a changed file
+    Headers = {}
+    if Cache.get("Version") is not None:
+        if Cache.get("ETag", "") != "":
+            Headers["If-None-Match"] = Cache["ETag"]
+        if Cache.get("LastModified", "") != "":
+            Headers["If-Modified-Since"] = Cache["LastModified"]
+
+    try:
+        response = requests.get(Url, headers=Headers, timeout=Timeout)
+        if response.status_code == 200:
+            Version = ReturnVersionFromXML(response.content)
+            if Version is not None:
+                Cache["Version"] = Version
+            Cache["ETag"] = response.headers.get("ETag", "")
+            Cache["LastModified"] = response.headers.get("Last-Modified", "")
+        # On 304 (not modified) or an error, the cached version stays valid
+    except Exception:
+        pass
+
+    # Also failed requests are cached, to prevent a timeout on every startup
+    Cache["CheckedAt"] = Now
+    WriteCache(Cache, CacheFile)
+    return Cache.get("Version")
+
+
+class UpdateChecker(QObject):
+    """Gets the latest version on a background thread. Emits Finished with the version ("" if unknown)."""
+
+    Finished = Signal(str)
+
+    def __init__(self, parent=None, Url: str = ReturnUrl()):
+        super().__init__(parent)
+        self.Url = Url
+        self.Thread = None
+
+    def start(self):
+        # A daemon thread does not keep FreeCAD open when the request is still running
+        self.Thread = threading.Thread(target=self.run, daemon=True)
+        self.Thread.start()
+        return
+
+    def run(self):
+        LatestVersion = None
+        try:
+            LatestVersion = ReturnLatestVersion(self.Url)
+        except Exception:
+            pass
+        if LatestVersion is None:
+            LatestVersion = ""
+        # The signal is delivered on the thread of the receiver, so the GUI can be updated safely
+        self.Finished.emit(LatestVersion)
+        return